@@ -10,38 +10,37 @@ from login import login_screen, get_allowed_tabs, admin_change_password
 import streamlit as st
 import pandas as pd
 import os
+import functools
 from datetime import datetime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
-FILE_PATH = r"D:\Sumit\PY\Tracker Software\master_config.xlsx"
+# Heavy UI libraries (st_aggrid, altair) are imported inside the tabs
+# that use them, so the login screen does not wait on them
+from ui_assets import PAGE_CSS, logo_base64
 
-from st_aggrid import AgGrid, GridOptionsBuilder, JsCode
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Table
-from reportlab.lib import utils
-from st_aggrid import JsCode
+# Named timing spans, summarised in the Admin Control Panel
+from profiling import span, timed, start_run, span_stats
 
-import base64
+# Every Sheets API call, attributed to the session and tab behind it
+import sheets_telemetry
+from sheets_telemetry import set_call_context, call_stats
 
-def get_image_base64(path):
-    with open(path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
+start_run()
+set_call_context(session="", tab="")
 
 # -------------------------------
 # GOOGLE SHEETS CONNECTION (GLOBAL)
 # -------------------------------
 
-import gspread
-from google.oauth2.service_account import Credentials
-import streamlit as st
-
 SPREADSHEET_ID = "18FfRWCMShQSlDaC7UG0N3H00VuN-UbU3rfMTSegcluU"
 
 @st.cache_resource
 def get_gsheet_connection():
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    from sheets_client import QuotaHTTPClient
+
     scope = [
         "https://www.googleapis.com/auth/spreadsheets",
         "https://www.googleapis.com/auth/drive"
@@ -52,28 +51,9 @@ def get_gsheet_connection():
         scopes=scope
     )
 
-    client = gspread.authorize(creds)
+    # Rate-limited, retrying client shared by every session
+    client = gspread.authorize(creds, http_client=QuotaHTTPClient)
     return client
-    
-    if "logged_in" not in st.session_state:
-        st.session_state.logged_in = False
-
-    if not st.session_state.logged_in:
-
-        st.markdown("""
-        <style>
-        .block-container {
-            max-width: 400px;
-            margin: auto;
-            padding-top: 120px;
-        }
-        header {visibility: hidden;}
-        footer {visibility: hidden;}
-        </style>
-        """, unsafe_allow_html=True)
-
-        login_screen(spreadsheet)
-        st.stop()
 
 @st.cache_resource
 def get_gsheet_objects():
@@ -82,98 +62,139 @@ def get_gsheet_objects():
     worksheets = {ws.title: ws for ws in spreadsheet.worksheets()}
     return spreadsheet, worksheets
 
-spreadsheet, worksheets = get_gsheet_objects()
+# -------------------------------
+# STORAGE BACKEND
+# -------------------------------
 
-@st.cache_data(ttl=60)
-def calculate_kpis(df_master):
+from storage import GoogleSheetsBackend, SQLBackend
 
-    df = df_master.copy()
+# "gsheets" (default), or "sqlite" / "duckdb" to run against a local store
+STORAGE_BACKEND = os.environ.get("TRACKER_STORAGE", "gsheets")
+STORAGE_PATH = os.environ.get("TRACKER_STORAGE_PATH", "tracker.db")
 
-    df["DSP $ (BC)"] = pd.to_numeric(df["DSP $ (BC)"], errors="coerce").fillna(0)
-    df["SSP $ (BC)"] = pd.to_numeric(df["SSP $ (BC)"], errors="coerce").fillna(0)
-    df["C DSP $"] = pd.to_numeric(df.get("C DSP $", 0), errors="coerce").fillna(0)
-    df["C SSP $"] = pd.to_numeric(df.get("C SSP $", 0), errors="coerce").fillna(0)
+@st.cache_resource
+def get_storage():
+    if STORAGE_BACKEND in ("sqlite", "duckdb"):
+        return SQLBackend(STORAGE_PATH, engine=STORAGE_BACKEND)
 
-    df["Net $ (BC)"] = df["DSP $ (BC)"] - df["SSP $ (BC)"]
-    df["C Net $"] = df["C DSP $"] - df["C SSP $"]
+    spreadsheet, worksheets = get_gsheet_objects()
+    return GoogleSheetsBackend(spreadsheet, worksheets)
 
-    total_dsp = df["DSP $ (BC)"].sum()
-    total_ssp = df["SSP $ (BC)"].sum()
-    total_net = df["Net $ (BC)"].sum()
+storage = get_storage()
 
-    total_c_dsp = df["C DSP $"].sum()
-    total_c_ssp = df["C SSP $"].sum()
-    total_c_net = df["C Net $"].sum()
+from metrics import (
+    kpi_columns,
+    kpi_totals,
+    calculate_outstanding_metrics,
+    calculate_collection_efficiency,
+    settled_months
+)
 
-    ivt = total_net - total_c_net
-    ivt_percent = (ivt / total_dsp * 100) if total_dsp != 0 else 0
-    c_profit_percent = (total_c_net / total_c_dsp * 100) if total_c_dsp != 0 else 0
+@st.cache_data(max_entries=64, show_spinner=False)
+@timed("calculate_kpis")
+def calculate_kpis(_df_master, version, filters):
+    # Keyed on (data version, filter selection) instead of hashing the
+    # frame; callers must pass the frame those two describe. Only the
+    # totals are cached, so a hit never unpickles a copy of the frame
+    return kpi_totals(_df_master)
 
-    return (
-        df,
-        total_dsp,
-        total_ssp,
-        total_net,
-        total_c_dsp,
-        total_c_ssp,
-        total_c_net,
-        ivt,
-        ivt_percent,
-        c_profit_percent
-    )
+# -------------------------------
+# LOCAL SNAPSHOTS OF SHEET TABS
+# -------------------------------
+
+import snapshot_store
+from sheet_schema import normalize_frame
+from sheet_diff import diff_cells, StaleSheetError
+from snapshot_store import (
+    values_to_frame,
+    load_snapshot_frame,
+    refresh_snapshot,
+    invalidate_snapshot,
+    prefetch_snapshots,
+    pull_snapshots,
+    snapshot_needs_pull,
+    load_timings
+)
+# Keep local copies of different backends apart
+if storage.name != "gsheets":
+    snapshot_store.SNAPSHOT_DIR = os.path.join(snapshot_store.SNAPSHOT_DIR, storage.name)
+
+# Seconds before a local copy is refreshed from storage
+SHEET_MAX_AGE = {
+    "Master Data": 300,
+    "Partner List": 60,
+    "Cost Centre": 120,
+    "DSP (Customers)": 120,
+    "SSP (Vendors)": 120
+}
+
+# Tabs refreshed with row-hash delta sync
+DELTA_SHEETS = {"Master Data", "DSP (Customers)", "SSP (Vendors)", "Cost Centre"}
+
+def sheet_fetcher(sheet_name):
+    return lambda: storage.read_values(sheet_name)
+
+def load_sheet_snapshot(sheet_name):
+    with span(f"load: {sheet_name}"):
+        return load_snapshot_frame(
+            sheet_name,
+            sheet_fetcher(sheet_name),
+            max_age=SHEET_MAX_AGE[sheet_name],
+            delta=sheet_name in DELTA_SHEETS
+        )
+
+def fetch_sheet_values(sheet_names):
+    # Google Sheets: one values:batchGet request for every requested tab
+    return storage.read_many(sheet_names)
+
+# -------------------------------
+# SHARED DATASET (ONE COPY PER PROCESS)
+# -------------------------------
+
+from shared_data import SharedDataset, edit_view
+
+@st.cache_resource
+def shared_dataset():
+    return SharedDataset()
+
+def shared_sheet(sheet_name, build=None, key=None):
+    # A sheet's normalized frame, built once per snapshot version and
+    # shared by every session. Callers get a copy-on-write view, so
+    # edits stay with them; a new snapshot version is picked up on the
+    # next call
+    build = build or (lambda df: normalize_frame(sheet_name, df))
+    raw = load_sheet_snapshot(sheet_name)
+    version = loaded_version(sheet_name, raw)
+
+    if version is None:
+        return build(raw)
+
+    return edit_view(shared_dataset().frame(key or sheet_name, version, lambda: build(raw)))
 
-@st.cache_data(ttl=300)
 def load_master_data_from_gsheet():
-    worksheet = worksheets["Master Data"]
-    data = worksheet.get_all_records()
-    return pd.DataFrame(data)
-    
-@st.cache_data(ttl=60)
+    return shared_sheet("Master Data")
+
 def load_partner_list_from_gsheet():
-    worksheet = spreadsheet.worksheet("Partner List")
-    data = worksheet.get_all_records()
-    return pd.DataFrame(data)
+    return shared_sheet("Partner List")
 
-# ADD THIS HERE
-@st.cache_data(ttl=120)
 def load_cost_centre():
-    worksheet = spreadsheet.worksheet("Cost Centre")
-    data = worksheet.get_all_records()
-    return pd.DataFrame(data)
+    return shared_sheet("Cost Centre")
 
 import numpy as np
 import re
-from datetime import datetime
 
 # ==========================================
 # FX RATE ENGINE (USD → INR)
 # ==========================================
 
-import requests
-import pandas as pd
-import streamlit as st
+import fx_store
+from cost_centre import cost_centre_table
 
-@st.cache_data(ttl=86400)
 def get_fx_rate(month_str):
-
-    import pandas as pd
-    import requests
-
+    # Month-end USD→INR rate from the local FX store; the first lookup in
+    # a financial year pulls that whole year in one request
     try:
-        dt = pd.to_datetime(month_str, format="%b-%Y")
-        last_day = (dt + pd.offsets.MonthEnd(0)).strftime("%Y-%m-%d")
-
-        url = f"https://api.frankfurter.app/{last_day}?from=USD&to=INR"
-
-        r = requests.get(url, timeout=10)
-
-        if r.status_code != 200:
-            return 0.0
-
-        data = r.json()
-
-        return round(data["rates"]["INR"], 4)
-
+        return fx_store.month_end_rate(month_str)
     except:
         return 0.0
 
@@ -211,21 +232,6 @@ def prepare_dataframe_for_gsheet(df: pd.DataFrame):
 # Utility Functions
 # -------------------------------
 
-def load_sheet(sheet_name: str) -> pd.DataFrame:
-    if not os.path.exists(FILE_PATH):
-        return pd.DataFrame()
-
-    try:
-        return pd.read_excel(FILE_PATH, sheet_name=sheet_name)
-    except:
-        return pd.DataFrame()
-
-
-def save_sheet(df: pd.DataFrame, sheet_name: str):
-    with pd.ExcelWriter(FILE_PATH, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-
 def format_usd(value):
     try:
         return f"${value:,.2f}"
@@ -249,420 +255,266 @@ def clean_for_gsheet(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
-def load_dsp_sheet():
-    worksheet = spreadsheet.worksheet("DSP (Customers)")
-    data = worksheet.get_all_records()
-    df = pd.DataFrame(data)
+def build_dsp_frame(raw):
+    df = normalize_frame("DSP (Customers)", raw)
 
     if df.empty:
         return df
 
-    # FIX: Ensure Month is datetime
-    df["Month"] = pd.to_datetime(df["Month"], errors="coerce")
-
-    df["Due Date"] = pd.to_datetime(df["Due Date"], errors="coerce", dayfirst=True)
-    df["Received Date"] = pd.to_datetime(df["Received Date"], errors="coerce", dayfirst=True)
-
-    df["Receivable $"] = pd.to_numeric(df["Receivable $"], errors="coerce").fillna(0)
-    df["Received Amount $"] = pd.to_numeric(df["Received Amount $"], errors="coerce").fillna(0)
-
     df["Outstanding $"] = df["Receivable $"] - df["Received Amount $"]
 
     return df
 
 
-def load_ssp_sheet():
-    worksheet = spreadsheet.worksheet("SSP (Vendors)")
-    data = worksheet.get_all_records()
-    df = pd.DataFrame(data)
+def build_ssp_frame(raw):
+    df = normalize_frame("SSP (Vendors)", raw)
 
     if df.empty:
         return df
-        
-    # FIX: Ensure Month is datetime
-    df["Month"] = pd.to_datetime(df["Month"], errors="coerce")
-
-    df["Due Date"] = pd.to_datetime(df["Due Date"], errors="coerce", dayfirst=True)
-    df["Payment Date"] = pd.to_datetime(df["Payment Date"], errors="coerce", dayfirst=True)
-
-    df["Payable $"] = pd.to_numeric(df["Payable $"], errors="coerce").fillna(0)
-    df["Paid Amount $"] = pd.to_numeric(df["Paid Amount $"], errors="coerce").fillna(0)
 
     df["Outstanding $"] = df["Payable $"] - df["Paid Amount $"]
 
     return df
 
-# ==========================================
-# CENTRAL DATA STORE (LOAD ONCE ONLY)
-# ==========================================
-
-def initialize_session_data():
-    if "data_initialized" not in st.session_state:
-
-        st.session_state.master_df = load_master_data_from_gsheet()
-        st.session_state.partner_df = load_partner_list_from_gsheet()
-        st.session_state.dsp_df = load_dsp_sheet()
-        st.session_state.ssp_df = load_ssp_sheet()
-
-        st.session_state.data_initialized = True
-
-initialize_session_data()
-
-# -------------------------------
-# MODAL STATE CONTROL
-# -------------------------------
-if "show_add_cost_modal" not in st.session_state:
-    st.session_state.show_add_cost_modal = False
-    
-# -------------------------------
-# Streamlit App Config
-# -------------------------------
-
-st.set_page_config(
-    page_title="PEAKADS LLP - Revenue Tracker",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
 
-st.markdown("""
-<style>
-
-/* REMOVE ALL STREAMLIT DEFAULT SPACING */
-html, body {
-    margin: 0 !important;
-    padding: 0 !important;
-}
-
-/* Remove top & bottom padding completely */
-.block-container {
-    padding-top: 0 !important;
-    padding-bottom: 0 !important;
-
-    /* Controlled left & right spacing */
-    padding-left: 15px !important;
-    padding-right: 15px !important;
-
-    margin: 0 !important;
-}
-
-/* Remove Streamlit header + footer */
-header { display: none !important; }
-footer { display: none !important; }
-
-/* Remove app container spacing */
-[data-testid="stAppViewContainer"] {
-    margin: 0 !important;
-    padding: 0 !important;
-}
+def load_dsp_sheet():
+    return shared_sheet("DSP (Customers)", build_dsp_frame)
 
-/* Remove vertical block spacing */
-[data-testid="stVerticalBlock"] {
-    gap: 0rem !important;
-}
 
-</style>
-""", unsafe_allow_html=True)
+def load_ssp_sheet():
+    return shared_sheet("SSP (Vendors)", build_ssp_frame)
 
-from datetime import date
 
-def generate_financial_years():
-    from datetime import date
+def load_grid_sheet(sheet_name):
+    # The DSP / SSP grids read the local snapshot instead of downloading
+    # the sheet on every rerun. Grid editors keep the sheet's own date
+    # strings; only Month is parsed
+    return shared_sheet(
+        sheet_name,
+        lambda df: normalize_frame(sheet_name, df, parse_dates=["Month"]),
+        key=f"{sheet_name} (grid)"
+    )
 
-    today = date.today()
-    current_year = today.year
-    current_month = today.month
+# ==========================================
+# DATA VERSIONS & PARTNER ENRICHMENT
+# ==========================================
 
-    # Determine current FY start year
-    if current_month >= 4:
-        current_fy_start = current_year
-    else:
-        current_fy_start = current_year - 1
+import uuid
+from enrichment import enrich_master
 
-    fy_list = []
+def loaded_version(sheet_name, df):
+    # Frames loaded from the same snapshot share one version across
+    # sessions, so they also share cached results
+    loaded_at = df.attrs.get("loaded_at")
+    return f"{sheet_name}@{loaded_at}" if loaded_at is not None else None
 
-    # Always include current FY
-    fy_list.append(
-        f"{current_fy_start}-{str(current_fy_start + 1)[-2:]}"
-    )
 
-    # If new FY has started (April onwards),
-    # add next FY only after it officially begins
-    if today >= date(current_fy_start + 1, 4, 1):
-        next_fy = current_fy_start + 1
-        fy_list.append(
-            f"{next_fy}-{str(next_fy + 1)[-2:]}"
-        )
+def set_session_frame(key, df, version=None):
+    # Every replacement gets a version token, used as a cache key in
+    # place of hashing the frame; local edits get a fresh one. Loaded
+    # frames share their data with every session: edit an edit_view()
+    st.session_state[key] = df
+    st.session_state.setdefault("data_versions", {})[key] = version or uuid.uuid4().hex
 
-    return fy_list
 
+def load_session_frame(key, sheet_name, loader):
+    df = loader()
+    set_session_frame(key, df, loaded_version(sheet_name, df))
 
-def get_fy_date_range(fy_string):
-    start_year = int(fy_string.split("-")[0])
-    start_date = pd.to_datetime(f"{start_year}-04-01")
-    end_date = pd.to_datetime(f"{start_year+1}-03-31")
-    return start_date, end_date
 
+def data_version(*keys):
+    versions = st.session_state.get("data_versions", {})
+    return tuple(versions.get(key) for key in keys)
 
-def get_quarter_range(fy_string, quarter):
-    start_year = int(fy_string.split("-")[0])
 
-    mapping = {
-        "Q1": (4, 6),
-        "Q2": (7, 9),
-        "Q3": (10, 12),
-        "Q4": (1, 3)
-    }
+@st.cache_resource(max_entries=16, show_spinner=False)
+@timed("enrich_master")
+def enrich_master_cached(_df_master, _df_partner, version):
+    return enrich_master(_df_master, _df_partner)
 
-    start_month, end_month = mapping[quarter]
 
-    if quarter == "Q4":
-        start = pd.Timestamp(start_year + 1, start_month, 1)
-        end = pd.Timestamp(start_year + 1, end_month, 1) + pd.offsets.MonthEnd(0)
-    else:
-        start = pd.Timestamp(start_year, start_month, 1)
-        end = pd.Timestamp(start_year, end_month, 1) + pd.offsets.MonthEnd(0)
+def enriched_master_df():
+    # Master Data joined with the Partner List once per data version;
+    # one frame shared by the Master Data, DSP and SSP tabs of every session
+    return edit_view(enrich_master_cached(
+        st.session_state.master_df,
+        st.session_state.partner_df,
+        data_version("master_df", "partner_df")
+    ))
 
-    return start, end
+# ==========================================
+# PARTNER x MONTH CUBE
+# ==========================================
 
-st.markdown("""
-<style>
+from cube import build_cube, slice_cube, rollup, totals
 
-/* KPI Background Container */
-.kpi-container {
-    background: linear-gradient(135deg, #87CEFA, #e8eef7);
-    padding: 25px;
-    border-radius: 12px;
-    margin-bottom: 20px;
-    box-shadow: 0px 4px 10px rgba(0,0,0,0.08);
-}
+@st.cache_resource(max_entries=16, show_spinner=False)
+@timed("pivot: partner x month cube")
+def master_cube_cached(_df_master, version):
+    return build_cube(_df_master)
 
-/* Make metrics inside look clean */
-div[data-testid="stMetric"] {
-    background-color: #00FFFF;
-    padding: 15px;
-    border-radius: 10px;
-    box-shadow: 0px 2px 6px rgba(0,0,0,0.05);
-}
 
-</style>
-""", unsafe_allow_html=True)
+def master_cube():
+    # Built once per Master Data version, sliced by every summary view
+    return master_cube_cached(st.session_state.master_df, data_version("master_df"))
 
-st.markdown("""
-<style>
+# ==========================================
+# FISCAL PERIOD FILTER
+# ==========================================
 
-/* ---------- TAB CONTAINER ---------- */
-div[data-testid="stTabs"] {
-    overflow-x: auto;
-    white-space: nowrap;
-}
+from period_filter import PeriodIndex, period_mask, apply_mask
 
-/* ---------- FORCE BOLD TAB TEXT ---------- */
-div[data-testid="stTabs"] button {
-    font-weight: 800 !important;
-    font-size: 17px !important;
-    letter-spacing: 0.3px;
-}
+@st.cache_resource(max_entries=32, show_spinner=False)
+def period_index_cached(_df, version, column):
+    return PeriodIndex(_df[column])
 
-/* Ensure inner text is bold */
-div[data-testid="stTabs"] button p {
-    font-weight: 800 !important;
-}
 
-/* ---------- TAB BUTTON ---------- */
-div[data-testid="stTabs"] button {
-    font-weight: 700 !important;
-    font-size: 16px !important;
-    padding: 10px 20px !important;
-    border-radius: 8px 8px 0px 0px !important;
-    margin-right: 4px;
-    background: linear-gradient(#26F7FD, #f0f0f0, #d6d6d6);
-    color: white !important;
-    border: 1px solid #c0c0c0 !important;
-    box-shadow: 3px 3px 6px #b0b0b0, 
-                -2px -2px 5px #ffffff;
-    transition: all 0.25s ease-in-out;
-    position: relative;
-}
+def session_period_mask(key, fy, quarter, month, column="Month"):
+    # Fiscal codes are built once per dataset version; each selection's
+    # mask is then memoized inside the shared index
+    df = st.session_state[key]
 
-/* ---------- HOVER EFFECT ---------- */
-div[data-testid="stTabs"] button:hover {
-    transform: translateY(-2px);
-    background: linear-gradient(145deg, #e6e6e6, #cccccc);
-}
+    if column not in df.columns:
+        return pd.Series(False, index=df.index)
 
-/* ---------- ACTIVE TAB ---------- */
-div[data-testid="stTabs"] button[aria-selected="true"] {
-    background: linear-gradient(145deg, #003366, #0059b3);
-    color: white !important;
-    box-shadow: inset 2px 2px 6px #002244,
-                inset -2px -2px 6px #0066cc;
-}
+    return period_index_cached(df, data_version(key), column).mask(fy, quarter, month)
 
-/* ---------- SUBTLE ANIMATED BOTTOM BORDER ---------- */
-div[data-testid="stTabs"] button::after {
-    content: "";
-    position: absolute;
-    left: 0;
-    bottom: -3px;
-    width: 0%;
-    height: 3px;
-    background-color: #ff4b4b;
-    transition: width 0.3s ease-in-out;
-}
+# ==========================================
+# SEARCH INDEX
+# ==========================================
 
-div[data-testid="stTabs"] button[aria-selected="true"]::after {
-    width: 100%;
-}
+from search_index import SearchIndex, scan_mask, search_totals
+from grid_window import PAGE_SIZES, page_count, clamp_page, sort_rows, page_rows, page_label
 
-/* ---------- RESPONSIVE MOBILE ---------- */
-@media (max-width: 768px) {
+@st.cache_resource(max_entries=16, show_spinner=False)
+def search_index_cached(_df, version):
+    return SearchIndex(_df)
 
-    div[data-testid="stTabs"] button {
-        font-size: 14px !important;
-        padding: 8px 14px !important;
-        margin-right: 2px;
-    }
 
-    div[data-testid="stTabs"] {
-        overflow-x: auto;
-        scrollbar-width: thin;
-    }
-}
+def search_mask(df, query, version=None):
+    # Rows of df matching every word of the query; indexes of versioned
+    # frames are reused across reruns and sessions. Unversioned frames
+    # are scanned: an index used once costs more than it saves
+    if version is None:
+        return scan_mask(df, query)
 
-</style>
-""", unsafe_allow_html=True)
+    return search_index_cached(df, version).mask(query)
 
-st.markdown("""
-<style>
-
-/* Target Streamlit Tabs */
-div[data-testid="stTabs"] button {
-    font-weight: 700 !important;
-    font-size: 16px !important;
-    padding: 10px 18px !important;
-    border-radius: 8px 8px 0px 0px !important;
-    background: linear-gradient(#188BC2, #2D5DA1);
-    border: 1px solid #c0c0c0 !important;
-    box-shadow: 3px 3px 6px #b0b0b0, 
-                -2px -2px 5px #ffffff;
-    transition: all 0.2s ease-in-out;
-}
+# ==========================================
+# MASTER DATA AUTOSAVE (WRITE-BEHIND)
+# ==========================================
 
-/* Hover effect */
-div[data-testid="stTabs"] button:hover {
-    background: linear-gradient(#9932CC, #9932CC, #9932CC);
-    transform: translateY(-2px);
-}
+import time
+from write_queue import WriteBehindQueue
 
-/* Active Tab */
-div[data-testid="stTabs"] button[aria-selected="true"] {
-    background: linear-gradient(#FF5E0E, #FF8F00, #FF8F00);
-    color: white !important;
-    box-shadow: inset 2px 2px 6px #FF5E0E,
-                inset -2px -2px 6px #FF8F00;
-}
+# Quiet window (seconds) before queued grid edits are written
+MASTER_AUTOSAVE_DELAY = float(os.environ.get("MASTER_AUTOSAVE_DELAY", "1.5"))
 
-</style>
-""", unsafe_allow_html=True)
+def session_key():
+    # Stable id for this browser session, used to route flush results
+    if "session_key" not in st.session_state:
+        st.session_state.session_key = uuid.uuid4().hex
+    return st.session_state.session_key
 
-st.markdown("""
-<style>
 
-/* ===== LOGOUT BUTTON STYLE ===== */
+def master_flushed(table):
+    invalidate_snapshot(table)
 
-/* Target the logout button container */
-div[data-testid="stHorizontalBlock"] div.stButton > button {
 
-    background-color: #d11a2a !important;   /* RED */
-    color: white !important;
-    font-weight: 1000 !important;
-    border-radius: 6px !important;
-    border: none !important;
-    box-shadow: 0 3px 8px rgba(0,0,0,0.25);
-}
+@st.cache_resource
+def get_master_write_queue():
+    return WriteBehindQueue(
+        storage,
+        "Master Data",
+        delay=MASTER_AUTOSAVE_DELAY,
+        derived=lambda row: {"C Net $": row["C DSP $"] - row["C SSP $"]},
+        on_flush=master_flushed
+    )
 
-/* Hover */
-div[data-testid="stHorizontalBlock"] div.stButton > button:hover {
+master_write_queue = get_master_write_queue()
 
-    background-color: #65d778 !important;   /* YELLOW */
-    color: black !important;
-}
+# ==========================================
+# CENTRAL DATA STORE (LOAD ONCE ONLY)
+# ==========================================
 
-</style>
-""", unsafe_allow_html=True)
+def initialize_session_data():
+    if "data_initialized" not in st.session_state:
 
-st.markdown("""
-<style>
+        # Pull every missing or expired tab in a single batch request;
+        # the loaders below then read the fresh local snapshots
+        try:
+            prefetch_snapshots(SHEET_MAX_AGE, fetch_sheet_values, DELTA_SHEETS)
+        except Exception:
+            # Batch not possible: pull the expired tabs concurrently on a
+            # bounded pool (any that still fail are retried by their loader)
+            pull_snapshots(
+                {
+                    name: sheet_fetcher(name)
+                    for name, max_age in SHEET_MAX_AGE.items()
+                    if snapshot_needs_pull(name, max_age)
+                },
+                DELTA_SHEETS
+            )
 
-/* ===== HEADER BANNER ===== */
-.header-banner {
-    background: linear-gradient(#475F94, #0076CE, #475F94);
+        load_session_frame("master_df", "Master Data", load_master_data_from_gsheet)
+        load_session_frame("partner_df", "Partner List", load_partner_list_from_gsheet)
+        load_session_frame("dsp_df", "DSP (Customers)", load_dsp_sheet)
+        load_session_frame("ssp_df", "SSP (Vendors)", load_ssp_sheet)
 
-    /* Controlled internal spacing */
-    padding: 18px 40px;   /* 18px top/bottom, 40px left/right */
+        # Per-sheet pull timings (mode, seconds) for the last bootstrap
+        st.session_state.sheet_load_timings = load_timings()
 
-    border-radius: 0px;   /* remove rounded corners for full-width look */
-    margin: 0px;          /* no outer margin */
+        st.session_state.data_initialized = True
 
-    box-shadow: 0 4px 10px rgba(0,0,0,0.08);
-}
+# -------------------------------
+# MODAL STATE CONTROL
+# -------------------------------
+if "show_add_cost_modal" not in st.session_state:
+    st.session_state.show_add_cost_modal = False
+    
+# -------------------------------
+# Streamlit App Config
+# -------------------------------
 
-/* Layout */
-.header-container {
-    display: flex;
-    align-items: center;
-    margin-bottom: 13px;
-    gap: 20px;
-}
+st.set_page_config(
+    page_title="PEAKADS LLP - Revenue Tracker",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
 
-/* Title */
-.header-title {
-    font-size: 48px;
-    font-weight: 800;
-    color: #FFFFFF;
-}
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
-/* Subtitle */
-.header-sub {
-    font-size: 30px;
-    font-weight: 800;
-    color: #FDFF00;
-    margin-left: 10px;
-}
+from datetime import date
 
-</style>
-""", unsafe_allow_html=True)
+def generate_financial_years():
+    from datetime import date
 
-# -------------------------------
-# DASHBOARD-STYLE COMPANY HEADER
-# -------------------------------
+    today = date.today()
+    current_year = today.year
+    current_month = today.month
 
-logo_path = "peakads_logo.png"
+    # Determine current FY start year
+    if current_month >= 4:
+        current_fy_start = current_year
+    else:
+        current_fy_start = current_year - 1
 
-st.markdown("""
-<style>
+    fy_list = []
 
-/* Company header row */
-.company-header {
-    display: flex;
-    align-items: center;
-    gap: 12px;
-    font-size: 60px;
-    font-weight: 700;
-    color: #2D5DA1;
-    margin-bottom: 5px;
-}
+    # Always include current FY
+    fy_list.append(
+        f"{current_fy_start}-{str(current_fy_start + 1)[-2:]}"
+    )
 
-/* Subtitle inline */
-.company-sub {
-    font-size: 40px;
-    font-weight: 600;
-    color: #FF5E0E;
-    margin-left: 5px;
-}
+    # If new FY has started (April onwards),
+    # add next FY only after it officially begins
+    if today >= date(current_fy_start + 1, 4, 1):
+        next_fy = current_fy_start + 1
+        fy_list.append(
+            f"{next_fy}-{str(next_fy + 1)[-2:]}"
+        )
 
-</style>
-""", unsafe_allow_html=True)
+    return fy_list
 
 # ---------------------------
 # SESSION INITIALIZATION
@@ -681,7 +533,7 @@ st.markdown(f"""
 <div class="header-banner">
 <div class="header-container">
 
-<img src="data:image/png;base64,{get_image_base64('peakads_logo.png')}" width="130">
+<img src="data:image/png;base64,{logo_base64()}" width="130">
 
 <div style="flex:1">
 <span class="header-title">PEAKADS LLP</span>
@@ -714,9 +566,13 @@ from login import login_screen, get_allowed_tabs
 # ---------------------------
 
 if not st.session_state.logged_in:
-    login_screen(spreadsheet)
+    login_screen(storage)
     st.stop()
 
+# Sheets are loaded once the user is in, not while the login screen shows
+set_call_context(session=session_key())
+initialize_session_data()
+
 allowed_tabs = get_allowed_tabs()
 
 tab_map = {
@@ -733,14 +589,36 @@ tab_map = {
 
 tab_titles = [tab_map[t] for t in allowed_tabs]
 
-# Tabs row
-tabs = st.tabs(tab_titles)
+# Tabs row; only the selected tab's body runs (see TAB DISPATCH)
+tabs = st.tabs(tab_titles, key="main_tab", on_change="rerun")
+
+
+def tab_view(name):
+    # Times a tab body and attributes its Sheets calls to the tab. A
+    # widget inside the tab reruns only this fragment, which counts as a
+    # rerun of its own for the call budget
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper():
+            ctx = get_script_run_ctx()
+
+            if ctx is not None and ctx.fragment_ids_this_run:
+                start_run(f"fragment: {name}")
+
+            set_call_context(session=session_key(), tab=name)
+
+            with span(f"tab: {name}"):
+                return fn()
+        return wrapper
+    return decorator
 
 # ====================================================
 # 1️⃣ PARTNER ONBOARDING FORM
 # ====================================================
 
-with tabs[5]:
+@st.fragment
+@tab_view("Partner Onboarding Form")
+def partner_onboarding_tab():
 
     st.header("📝Partner Onboarding Form")
     
@@ -858,18 +736,10 @@ with tabs[5]:
                 "Finance Email": finance_email
             }
 
-            df = load_sheet("Partner List")
-            new_row = pd.DataFrame([partner_data])
+            # Missing columns are added to the header automatically
+            storage.append_record("Partner List", partner_data)
 
-            if df.empty:
-                df = new_row
-            else:
-                for col in new_row.columns:
-                    if col not in df.columns:
-                        df[col] = ""
-                df = pd.concat([df, new_row], ignore_index=True)
-
-            save_sheet(df, "Partner List")
+            invalidate_snapshot("Partner List")
 
         st.success("Successfully Saved in Google Sheet")
 
@@ -878,7 +748,9 @@ with tabs[5]:
 # 2️⃣ MASTER DATA TAB
 # ====================================================
 
-with tabs[2]:
+@st.fragment
+@tab_view("Master Data")
+def master_data_tab():
 
     fy_list = generate_financial_years()
 
@@ -937,8 +809,8 @@ with tabs[2]:
         )
     
     if refresh_clicked:
-        load_master_data_from_gsheet.clear()
-        st.session_state.master_df = load_master_data_from_gsheet()
+        refresh_snapshot("Master Data", sheet_fetcher("Master Data"), delta=True)
+        load_session_frame("master_df", "Master Data", load_master_data_from_gsheet)
         st.rerun()
 
     # Disable month if quarter selected
@@ -947,90 +819,99 @@ with tabs[2]:
 
     # 🔹 Load Master Data from Google
     if "master_df" not in st.session_state:
-        st.session_state.master_df = load_master_data_from_gsheet()
-
-    df_master = st.session_state.master_df
-    
-    df_filtered = df_master.copy()
-
-    if selected_fy != "All":
-        fy_start, fy_end = get_fy_date_range(selected_fy)
+        load_session_frame("master_df", "Master Data", load_master_data_from_gsheet)
 
-        df_filtered["Month"] = pd.to_datetime(df_filtered["Month"], errors="coerce")
+    # Outcome of background autosaves since the last rerun
+    for result in master_write_queue.pop_results(session_key()):
+        if result["ok"]:
+            st.toast(f"Auto-saved ✅ ({result['rows']} rows)")
+        else:
+            st.error(f"Auto-save failed, retrying automatically: {result['error']}")
 
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= fy_start) &
-            (df_filtered["Month"] <= fy_end)
-        ]
+    # Edits still waiting for the sheet, e.g. while a retry backs off
+    queue_status = master_write_queue.status()
 
-    if selected_quarter != "All" and selected_fy != "All":
-        q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
+    if queue_status["failures"] and queue_status["pending_rows"]:
+        retry_in = max(0, round((queue_status["retry_at"] or time.time()) - time.time()))
+        st.warning(
+            f"⏳ {queue_status['pending_rows']} edited rows not saved yet "
+            f"({queue_status['failures']} failed attempts, next retry in {retry_in}s): "
+            f"{queue_status['last_error']}"
+        )
+    elif queue_status["pending_rows"]:
+        st.caption(f"⏳ Saving {queue_status['pending_rows']} edited rows…")
 
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= q_start) &
-            (df_filtered["Month"] <= q_end)
-        ]
+    df_master = enriched_master_df()
 
-    elif selected_month != "All":
-        selected_month_dt = pd.to_datetime(selected_month, format="%b-%Y", errors="coerce")
+    # Enriched rows keep Master Data's index, so its period masks apply
+    df_filtered = apply_mask(
+        df_master,
+        session_period_mask("master_df", selected_fy, selected_quarter, selected_month)
+    )
 
-        df_filtered = df_filtered[
-            df_filtered["Month"] == selected_month_dt
-        ]
-    
-    df_partner = st.session_state.partner_df.copy()
+    if search_text:
+        df_filtered = apply_mask(
+            df_filtered,
+            search_mask(df_master, search_text, data_version("master_df", "partner_df"))
+        )
 
     if df_master.empty:
         st.warning("No Master Data Found")
         st.stop()
 
-    # Convert Month to real datetime internally
-    # Ensure Month is datetime BEFORE sorting
-    df_filtered["Month"] = pd.to_datetime(
-        df_filtered["Month"],
-        errors="coerce"
-    )
-
-    df_master = df_filtered.sort_values("Month")
+    # -------- PAGING & SORT (SERVER-SIDE) --------
+    # Only the visible page goes to the browser; sorting happens here so
+    # it covers every filtered row, not just the page
 
-    # Convert to display format AFTER everything
-    df_master["Month"] = df_master["Month"].dt.strftime("%b-%Y")
-    
-    if not df_master.empty:
+    sort_options = list(df_filtered.columns)
 
-        df_master["Net $ (BC)"] = df_master["DSP $ (BC)"] - df_master["SSP $ (BC)"]
-
-        df_master["Month"] = pd.to_datetime(df_master["Month"])
-        df_master["Month"] = df_master["Month"].dt.strftime("%b-%Y")
-
-        for index, row in df_master.iterrows():
+    page_col1, page_col2, page_col3, page_col4 = st.columns([1.2, 1, 1, 1])
 
-            if df_partner.empty:
-                continue
+    with page_col1:
+        sort_by = st.selectbox(
+            "Sort by",
+            options=sort_options,
+            index=sort_options.index("Month") if "Month" in sort_options else 0,
+            key="master_sort_by"
+        )
 
-            if "Short Name using in Bidscube" not in df_partner.columns:
-                continue
+    with page_col2:
+        sort_order = st.selectbox(
+            "Order",
+            options=["Ascending", "Descending"],
+            index=0,
+            key="master_sort_order"
+        )
 
-            partner_match = df_partner[
-                df_partner["Short Name using in Bidscube"] == row["Partner Name"]
-            ]
+    with page_col3:
+        page_size = st.selectbox(
+            "Rows per page",
+            options=PAGE_SIZES,
+            index=PAGE_SIZES.index(100),
+            key="master_page_size"
+        )
 
-            if partner_match.empty:
-                continue
+    with page_col4:
+        st.session_state.master_page = clamp_page(
+            st.session_state.get("master_page", 1), len(df_filtered), page_size
+        )
+        page = st.number_input(
+            "Page",
+            min_value=1,
+            max_value=page_count(len(df_filtered), page_size),
+            step=1,
+            key="master_page"
+        )
 
-            country = partner_match.iloc[0].get("Country", "")
-            gstin = partner_match.iloc[0].get("GSTIN", "")
-            net_term = partner_match.iloc[0].get("Payment Terms", "")
+    # Month is already datetime (normalized at load), so it sorts by date
+    df_master = sort_rows(df_filtered, sort_by, ascending=(sort_order == "Ascending"))
 
-            if country == "India (IN)":
-                df_master.loc[index, "I/F"] = "Indian"
-                df_master.loc[index, "USD/INR"] = "INR"
-            else:
-                df_master.loc[index, "I/F"] = "Foreign"
-                df_master.loc[index, "USD/INR"] = "USD"
+    # Convert to display format AFTER everything
+    df_master["Month"] = df_master["Month"].dt.strftime("%b-%Y")
+    
+    if not df_master.empty:
 
-            df_master.loc[index, "GSTIN"] = gstin
-            df_master.loc[index, "NET Term"] = net_term
+        df_master["Net $ (BC)"] = df_master["DSP $ (BC)"] - df_master["SSP $ (BC)"]
 
         # Ensure required columns exist
         for col in ["C DSP $", "C SSP $", "C Net $", "Category (DSP/SSP)"]:
@@ -1053,9 +934,6 @@ with tabs[2]:
             "C Net $",
         ]
 
-        df_master["C DSP $"] = pd.to_numeric(df_master["C DSP $"], errors="coerce").fillna(0)
-        df_master["C SSP $"] = pd.to_numeric(df_master["C SSP $"], errors="coerce").fillna(0)
-
         month_comparator = JsCode("""
         function(date1, date2) {
             function parseMonth(str) {
@@ -1106,40 +984,20 @@ with tabs[2]:
         }
         """)
         
+        # Sheet row of each grid row; the grid is a filtered, sorted view
+        df_master["_sheet_row"] = df_master.index + 2
+
         gb = GridOptionsBuilder.from_dataframe(df_master)
         
         gb.configure_column(
             "Month",
             comparator=month_comparator
         )
-        
-        negative_style = JsCode("""
-        function(params) {
-            if (params.value < 0) {
-                return {
-                    color: 'red',
-                    fontWeight: 'bold'
-                };
-            }
-        }
-        """)
+
+        gb.configure_column("_sheet_row", hide=True)
         
         # Editable Table
-        numeric_cols = [
-            "DSP $ (BC)",
-            "SSP $ (BC)",
-            "Net $ (BC)",
-            "C DSP $",
-            "C SSP $",
-            "C Net $",
-        ]
-        
         editable_cols = ["C DSP $", "C SSP $"]
-        
-        # Ensure numeric conversion before grid
-        for col in numeric_cols:
-            if col in df_master.columns:
-                df_master[col] = pd.to_numeric(df_master[col], errors="coerce").fillna(0)
 
         # Apply uniform currency formatting to ALL numeric columns
         for col in numeric_cols:
@@ -1260,54 +1118,14 @@ with tabs[2]:
                 cellStyle=pinned_style
             )
         
+        # Sorting is server-side; a header sort would only order one page
         gb.configure_default_column(
             resizable=True,
-            sortable=True,
+            sortable=False,
             filter=False
         )
 
-        # Red negative styling
-        negative_style = JsCode("""
-        function(params) {
-            if (params.value < 0) {
-                return {color: 'red', fontWeight: 'bold'};
-            }
-        }
-        """)
-
-        # -------- REAL-TIME GRAND TOTAL (JS BASED) --------
-
-        grand_total_js = JsCode("""
-        function(api) {
-            let totals = {};
-            let numericCols = ["DSP $ (BC)", "SSP $ (BC)", "Net $ (BC)", "C DSP $", "C SSP $", "C Net $"];
-
-            numericCols.forEach(col => totals[col] = 0);
-
-            api.forEachNodeAfterFilter(function(node) {
-                numericCols.forEach(function(col) {
-                    let val = parseFloat(node.data[col]);
-                    if (!isNaN(val)) {
-                        totals[col] += val;
-                    }
-                });
-            });
-
-            let totalRow = { Month: "Grand Total" };
-            numericCols.forEach(col => totalRow[col] = totals[col]);
-
-            api.setPinnedBottomRowData([totalRow]);
-        }
-        """)
-        
         gridOptions = gb.build()
-        gridOptions["onFirstDataRendered"] = grand_total_js
-        gridOptions["onFilterChanged"] = grand_total_js
-        gridOptions["onModelUpdated"] = grand_total_js
-        gridOptions["onCellValueChanged"] = grand_total_js
-        
-        if search_text:
-            gridOptions["quickFilterText"] = search_text
 
         # Footer styling
         gridOptions["getRowStyle"] = JsCode("""
@@ -1371,18 +1189,8 @@ with tabs[2]:
 
         # -------- GRAND TOTAL (Search + Month Reactive) --------
 
-        filtered_df = df_master.copy()
-
-        if search_text:
-            search_lower = search_text.lower()
-
-            mask = filtered_df.apply(
-                lambda row: row.astype(str).str.lower().str.contains(search_lower).any(),
-                axis=1
-            )
-            filtered_df = filtered_df[mask]
-
-        grand_total_values = filtered_df.sum(numeric_only=True)
+        # Totals cover every filtered row, not only the page on screen
+        grand_total_values = search_totals(df_master, numeric_cols)
 
         grand_total_row = {col: "" for col in df_master.columns}
         grand_total_row["Month"] = "Grand Total"
@@ -1396,22 +1204,25 @@ with tabs[2]:
         from st_aggrid import GridUpdateMode
         
         grid_df = (
-            df_master
+            page_rows(df_master, page, page_size)
             .reset_index(drop=True)
             .loc[:, ~df_master.columns.duplicated()]
             .copy()
         )
 
-        grid_response = AgGrid(
-            grid_df,
-            gridOptions=gridOptions,
-            allow_unsafe_jscode=True,
-            update_mode=GridUpdateMode.VALUE_CHANGED,
-            data_return_mode="AS_INPUT",
-            fit_columns_on_grid_load=True,
-            height=550,
-            custom_css=custom_css
-        )
+        st.caption(page_label(page, len(df_master), page_size))
+
+        with span("aggrid: Master Data"):
+            grid_response = AgGrid(
+                grid_df,
+                gridOptions=gridOptions,
+                allow_unsafe_jscode=True,
+                update_mode=GridUpdateMode.VALUE_CHANGED,
+                data_return_mode="AS_INPUT",
+                fit_columns_on_grid_load=True,
+                height=550,
+                custom_css=custom_css
+            )
         
                 
         if grid_response["selected_rows"] is not None:
@@ -1430,39 +1241,38 @@ with tabs[2]:
             for col in editable_cols:
                 updated_df[col] = pd.to_numeric(updated_df[col], errors="coerce").fillna(0)
 
-            previous_df = st.session_state.master_df.reset_index(drop=True)
-
-            if not updated_df[editable_cols].equals(previous_df[editable_cols]):
-
-                worksheet = worksheets["Master Data"]
+            # Match grid rows to the session frame by sheet row, not position
+            updated_df.index = updated_df["_sheet_row"].astype(int) - 2
 
-                batch_requests = []
+            previous_df = st.session_state.master_df.loc[updated_df.index, editable_cols]
 
-                for idx in range(len(updated_df)):
+            changed = ~np.isclose(
+                previous_df.to_numpy(dtype=float),
+                updated_df[editable_cols].to_numpy(dtype=float)
+            ).all(axis=1)
 
-                    old_row = previous_df.iloc[idx]
-                    new_row = updated_df.iloc[idx]
+            if changed.any():
 
-                    if (
-                        float(old_row["C DSP $"]) != float(new_row["C DSP $"]) or
-                        float(old_row["C SSP $"]) != float(new_row["C SSP $"])
-                    ):
+                changes = updated_df.loc[changed, editable_cols]
 
-                        sheet_row_number = idx + 2
+                # Queue the edits; repeat edits to a row within the quiet
+                # window are merged into one background batch update
+                master_write_queue.submit(
+                    session_key(),
+                    {
+                        int(idx) + 2: {col: float(row[col]) for col in editable_cols}
+                        for idx, row in changes.iterrows()
+                    }
+                )
 
-                        batch_requests.append({
-                            "range": f"F{sheet_row_number}:H{sheet_row_number}",
-                            "values": [[
-                                float(new_row["C DSP $"]),
-                                float(new_row["C SSP $"]),
-                                float(new_row["C DSP $"]) - float(new_row["C SSP $"])
-                            ]]
-                        })
+                # Copy-on-write: only the edited columns are copied, the
+                # frame shared with other sessions stays as loaded
+                master = edit_view(st.session_state.master_df)
+                master.loc[changes.index, editable_cols] = changes
+                master.loc[changes.index, "C Net $"] = changes["C DSP $"] - changes["C SSP $"]
 
-                if batch_requests:
-                    worksheet.batch_update(batch_requests, value_input_option="USER_ENTERED")
-                    st.session_state.master_df = updated_df.copy()
-                    st.toast("Auto-saved ✅")
+                set_session_frame("master_df", master)
+                st.toast("Saving in background…")
                                        
         # RED negative styling
         def highlight_negative(val):
@@ -1482,9 +1292,6 @@ with tabs[2]:
 # MODERN KPI COMPONENT
 # ==========================================
 
-import altair as alt
-import pandas as pd
-
 def render_premium_kpi(title, value, trend_data=None, is_currency=True):
 
     numeric_value = float(value)
@@ -1562,65 +1369,13 @@ def render_premium_kpi(title, value, trend_data=None, is_currency=True):
 # CASH CONTROL ENGINE
 # ==========================================
 
-from datetime import datetime
-
-def calculate_outstanding_metrics(dsp_df, ssp_df):
-    today = pd.Timestamp.today()
-
-    # DSP
-    total_receivable = dsp_df["Receivable $"].sum()
-    total_received = dsp_df["Received Amount $"].sum()
-    total_outstanding_dsp = dsp_df["Outstanding $"].sum()
-    overdue_dsp = dsp_df[
-        (dsp_df["Outstanding $"] > 0) &
-        (dsp_df["Due Date"] < today)
-    ]["Outstanding $"].sum()
-
-    # SSP
-    total_payable = ssp_df["Payable $"].sum()
-    total_paid = ssp_df["Paid Amount $"].sum()
-    total_outstanding_ssp = ssp_df["Outstanding $"].sum()
-    overdue_ssp = ssp_df[
-        (ssp_df["Outstanding $"] > 0) &
-        (ssp_df["Due Date"] < today)
-    ]["Outstanding $"].sum()
-
-    return {
-        "total_receivable": total_receivable,
-        "total_received": total_received,
-        "total_outstanding_dsp": total_outstanding_dsp,
-        "overdue_dsp": overdue_dsp,
-        "total_payable": total_payable,
-        "total_paid": total_paid,
-        "total_outstanding_ssp": total_outstanding_ssp,
-        "overdue_ssp": overdue_ssp
-    }
-
-
-def calculate_collection_efficiency(dsp_df, ssp_df):
-
-    total_receivable = dsp_df["Receivable $"].sum()
-    total_received = dsp_df["Received Amount $"].sum()
-
-    total_payable = ssp_df["Payable $"].sum()
-    total_paid = ssp_df["Paid Amount $"].sum()
+# Outstanding and collection metrics: see metrics.py
 
-    collection_pct = (
-        (total_received / total_receivable) * 100
-        if total_receivable != 0 else 0
-    )
-
-    payment_pct = (
-        (total_paid / total_payable) * 100
-        if total_payable != 0 else 0
-    )
-
-    return {
-        "collection_pct": collection_pct,
-        "payment_pct": payment_pct
-    }
+@st.fragment
+@tab_view("Dashboard")
+def dashboard_tab():
 
-with tabs[0]:
+    import altair as alt
     
     st.markdown("""
     <style>
@@ -1691,45 +1446,17 @@ with tabs[0]:
     if selected_quarter != "All":
         selected_month = "All"
 
-    df_master = st.session_state.master_df.copy()    
+    df_master = edit_view(st.session_state.master_df)    
     
-    df_filtered = df_master.copy()
-
-    if selected_fy != "All":
-        fy_start, fy_end = get_fy_date_range(selected_fy)
-
-        df_filtered["Month"] = pd.to_datetime(df_filtered["Month"], errors="coerce")
-
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= fy_start) &
-            (df_filtered["Month"] <= fy_end)
-        ]
-
-    if selected_quarter != "All" and selected_fy != "All":
-        q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
-
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= q_start) &
-            (df_filtered["Month"] <= q_end)
-        ]
-
-    elif selected_month != "All":
-        selected_month_dt = pd.to_datetime(selected_month, format="%b-%Y", errors="coerce")
-
-        df_filtered = df_filtered[
-            df_filtered["Month"] == selected_month_dt
-        ]
+    df_filtered = apply_mask(
+        df_master,
+        session_period_mask("master_df", selected_fy, selected_quarter, selected_month)
+    )
     
     if df_master.empty:
         st.warning("No Master Data Available")
         st.stop()
 
-    # 🔹 Convert Month properly
-    df_filtered["Month"] = pd.to_datetime(
-        df_filtered["Month"],
-        errors="coerce"
-    )
-
     df_master = df_filtered.sort_values("Month")
     df_master["Month"] = df_master["Month"].dt.strftime("%b-%Y")
 
@@ -1746,7 +1473,6 @@ with tabs[0]:
 
     # 🔹 Calculate KPIs (ONLY ON FILTERED DATA)
     (
-        df_master,
         total_dsp,
         total_ssp,
         total_net,
@@ -1756,8 +1482,17 @@ with tabs[0]:
         ivt,
         ivt_percent,
         c_profit_percent
-    ) = calculate_kpis(df_master)
+    ) = calculate_kpis(
+        df_master,
+        data_version("master_df"),
+        (selected_fy, selected_quarter, selected_month)
+    )
 
+    # Net columns for the KPI sparklines
+    df_master = kpi_columns(df_master)
+
+    # Same selection as df_master, pre-aggregated by partner and month
+    cube_view = slice_cube(master_cube(), selected_fy, selected_quarter, selected_month)
     
     # 🔹 Subtabs
     subtabs = st.tabs([
@@ -1765,428 +1500,368 @@ with tabs[0]:
         "📈 Monthly Revenue Trend",
         "🏆 Top 10 Partners",
         "👥 Partner Onboarded"
-    ])
+    ], key="dashboard_subtab", on_change="rerun")
 
     with subtabs[0]:
+        if subtabs[0].open:
 
-        # ==========================================
-        # LOAD CASH DATA FOR DASHBOARD
-        # ==========================================
-
-        dsp_df = st.session_state.dsp_df.copy()
-        ssp_df = st.session_state.ssp_df.copy()
+            # ==========================================
+            # LOAD CASH DATA FOR DASHBOARD
+            # ==========================================
 
-        # Default fallback to prevent NameError
-        outstanding_metrics = {
-            "total_outstanding_dsp": 0,
-            "total_outstanding_ssp": 0,
-            "net_working_capital": 0
-        }
+            dsp_df = edit_view(st.session_state.dsp_df)
+            ssp_df = edit_view(st.session_state.ssp_df)
 
-        efficiency_metrics = {
-            "collection_pct": 0,
-            "payment_pct": 0
-        }
+            # Default fallback to prevent NameError
+            outstanding_metrics = {
+                "total_outstanding_dsp": 0,
+                "total_outstanding_ssp": 0,
+                "net_working_capital": 0
+            }
 
-        if not dsp_df.empty and not ssp_df.empty:
-            outstanding_metrics = calculate_outstanding_metrics(dsp_df, ssp_df)
-            efficiency_metrics = calculate_collection_efficiency(dsp_df, ssp_df)
-        
-        st.markdown("## 📊 Financial Overview")
-        st.divider()
+            efficiency_metrics = {
+                "collection_pct": 0,
+                "payment_pct": 0
+            }
 
-        # ===== ROW 1 =====
-        r1c1, r1c2, r1c3, r1c4, r1c5, r1c6 = st.columns(6)
+            if not dsp_df.empty and not ssp_df.empty:
+                outstanding_metrics = calculate_outstanding_metrics(dsp_df, ssp_df)
+                efficiency_metrics = calculate_collection_efficiency(dsp_df, ssp_df)
+            
+            st.markdown("## 📊 Financial Overview")
+            st.divider()
 
-        with r1c1:
-            render_premium_kpi("Revenue", total_dsp, df_master["C DSP $"].tolist())
+            # ===== ROW 1 =====
+            r1c1, r1c2, r1c3, r1c4, r1c5, r1c6 = st.columns(6)
 
-        with r1c2:
-            render_premium_kpi("Cost", total_ssp, df_master["C SSP $"].tolist())
+            with r1c1:
+                render_premium_kpi("Revenue", total_dsp, df_master["C DSP $"].tolist())
 
-        with r1c3:
-            render_premium_kpi("Gross Profit", total_c_net, df_master["C Net $"].tolist())
-            
-        with r1c4:
-            render_premium_kpi("Gross Profit %", c_profit_percent, is_currency=False)
-        
-        with r1c5:
-            render_premium_kpi("IVT $", ivt)
+            with r1c2:
+                render_premium_kpi("Cost", total_ssp, df_master["C SSP $"].tolist())
 
-        with r1c6:
-            render_premium_kpi("IVT %", ivt_percent, is_currency=False)
+            with r1c3:
+                render_premium_kpi("Gross Profit", total_c_net, df_master["C Net $"].tolist())
+                
+            with r1c4:
+                render_premium_kpi("Gross Profit %", c_profit_percent, is_currency=False)
             
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.divider()
+            with r1c5:
+                render_premium_kpi("IVT $", ivt)
 
-        # ----------------------------
-        # KPI Calculations
-        # ----------------------------
-        total_dsp = df_master["DSP $ (BC)"].sum()
-        total_ssp = df_master["SSP $ (BC)"].sum()
-        total_net = df_master["Net $ (BC)"].sum()
+            with r1c6:
+                render_premium_kpi("IVT %", ivt_percent, is_currency=False)
+                
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.divider()
 
-        total_c_dsp = df_master["C DSP $"].sum()
-        total_c_ssp = df_master["C SSP $"].sum()
+            # ----------------------------
+            # KPI Calculations
+            # ----------------------------
+            cube_totals = totals(cube_view)
 
-        ivt = total_net - total_c_net
-        ivt_percent = (ivt / total_dsp * 100) if total_dsp != 0 else 0
-        c_profit_percent = (total_c_net / total_c_dsp * 100) if total_c_dsp != 0 else 0
+            total_dsp = cube_totals["DSP $ (BC)"]
+            total_ssp = cube_totals["SSP $ (BC)"]
+            total_net = cube_totals["Net $ (BC)"]
 
-        k1, k2, k3 = st.columns(3)
-        k4, k5, k6 = st.columns(3)
-        k7, k8, k9 = st.columns(3)
-                
-        # ==========================================
-        # CASH CONTROL KPIs
-        # ==========================================
+            total_c_dsp = cube_totals["C DSP $"]
+            total_c_ssp = cube_totals["C SSP $"]
 
-        dsp_df = st.session_state.dsp_df.copy()
-        ssp_df = st.session_state.ssp_df.copy()
+            ivt = total_net - total_c_net
+            ivt_percent = (ivt / total_dsp * 100) if total_dsp != 0 else 0
+            c_profit_percent = (total_c_net / total_c_dsp * 100) if total_c_dsp != 0 else 0
 
-        if not dsp_df.empty and not ssp_df.empty:
+            k1, k2, k3 = st.columns(3)
+            k4, k5, k6 = st.columns(3)
+            k7, k8, k9 = st.columns(3)
+                    
+            # ==========================================
+            # CASH CONTROL KPIs
+            # ==========================================
 
-            outstanding_metrics = calculate_outstanding_metrics(dsp_df, ssp_df)
-            efficiency_metrics = calculate_collection_efficiency(dsp_df, ssp_df)
+            dsp_df = edit_view(st.session_state.dsp_df)
+            ssp_df = edit_view(st.session_state.ssp_df)
 
-            st.markdown("### 💰 Cash Control Overview")
-            st.divider()
+            if not dsp_df.empty and not ssp_df.empty:
 
-            c1, c2, c3, c4, c5, c6 = st.columns(6)
+                outstanding_metrics = calculate_outstanding_metrics(dsp_df, ssp_df)
+                efficiency_metrics = calculate_collection_efficiency(dsp_df, ssp_df)
 
-            with c1:
-                render_premium_kpi("Outstanding Receivable", outstanding_metrics["total_outstanding_dsp"])
+                st.markdown("### 💰 Cash Control Overview")
+                st.divider()
 
-            with c2:
-                render_premium_kpi("Overdue Receivable", outstanding_metrics["overdue_dsp"])
-                
-            with c3:
-                render_premium_kpi("Collection Efficiency %", efficiency_metrics["collection_pct"], is_currency=False)
-            
-            with c4:
-                render_premium_kpi("Outstanding Payable", outstanding_metrics["total_outstanding_ssp"])
+                c1, c2, c3, c4, c5, c6 = st.columns(6)
 
-            with c5:
-                render_premium_kpi("Overdue Payable", outstanding_metrics["overdue_ssp"])
+                with c1:
+                    render_premium_kpi("Outstanding Receivable", outstanding_metrics["total_outstanding_dsp"])
 
-            with c6:
-                render_premium_kpi("Payment Efficiency %", efficiency_metrics["payment_pct"], is_currency=False)
-                
-        st.divider()
+                with c2:
+                    render_premium_kpi("Overdue Receivable", outstanding_metrics["overdue_dsp"])
+                    
+                with c3:
+                    render_premium_kpi("Collection Efficiency %", efficiency_metrics["collection_pct"], is_currency=False)
                 
-    with subtabs[1]:    
-        
-        import altair as alt
-
-        st.markdown("### 📈Monthly Revenue Trend")
-        st.divider()
-
-        view_type = st.radio(
-            "View By",
-            ["Monthly", "Quarterly (FY)"],
-            horizontal=True,
-            key="revenue_view_toggle"
-        )
+                with c4:
+                    render_premium_kpi("Outstanding Payable", outstanding_metrics["total_outstanding_ssp"])
 
-        data = df_master.copy()
-        data["Month"] = pd.to_datetime(data["Month"], errors="coerce")
+                with c5:
+                    render_premium_kpi("Overdue Payable", outstanding_metrics["overdue_ssp"])
 
-        # ---------------- MONTHLY VIEW ----------------
-        if view_type == "Monthly":
+                with c6:
+                    render_premium_kpi("Payment Efficiency %", efficiency_metrics["payment_pct"], is_currency=False)
+                    
+            st.divider()
+                    
+    with subtabs[1]:
+        if subtabs[1].open:
+            
+            import altair as alt
 
-            data["MonthPeriod"] = data["Month"].dt.to_period("M")
+            st.markdown("### 📈Monthly Revenue Trend")
+            st.divider()
 
-            monthly = (
-                data.groupby("MonthPeriod", as_index=False)
-                .agg({"Net $ (BC)": "sum"})
+            view_type = st.radio(
+                "View By",
+                ["Monthly", "Quarterly (FY)"],
+                horizontal=True,
+                key="revenue_view_toggle"
             )
 
-            monthly["Date"] = monthly["MonthPeriod"].dt.to_timestamp()
-            monthly = monthly.sort_values("Date")
-            monthly["Label"] = monthly["Date"].dt.strftime("%b-%Y")
+            # ---------------- MONTHLY VIEW ----------------
+            if view_type == "Monthly":
 
-            chart = (
-                alt.Chart(monthly)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "Label:N",
-                        sort=list(monthly["Label"]),
-                        title="Month"
-                    ),
-                    y=alt.Y(
-                        "Net $ (BC):Q",
-                        title="Net Revenue ($)",
-                        axis=alt.Axis(format="$,.0f")
-                    ),
-                    tooltip=[
-                        alt.Tooltip("Label:N", title="Month"),
-                        alt.Tooltip("Net $ (BC):Q", format=",.2f")
-                    ]
-                )
-                .properties(height=400)
-            )
+                monthly = rollup(cube_view, "Month", ["Net $ (BC)"])
 
-            st.altair_chart(chart, use_container_width=True)
+                monthly["Date"] = monthly["Month"].dt.to_period("M").dt.to_timestamp()
+                monthly = (
+                    monthly
+                    .groupby("Date", as_index=False)["Net $ (BC)"].sum()
+                    .sort_values("Date")
+                )
+                monthly["Label"] = monthly["Date"].dt.strftime("%b-%Y")
+
+                chart = (
+                    alt.Chart(monthly)
+                    .mark_line(point=True)
+                    .encode(
+                        x=alt.X(
+                            "Label:N",
+                            sort=list(monthly["Label"]),
+                            title="Month"
+                        ),
+                        y=alt.Y(
+                            "Net $ (BC):Q",
+                            title="Net Revenue ($)",
+                            axis=alt.Axis(format="$,.0f")
+                        ),
+                        tooltip=[
+                            alt.Tooltip("Label:N", title="Month"),
+                            alt.Tooltip("Net $ (BC):Q", format=",.2f")
+                        ]
+                    )
+                    .properties(height=400)
+                )
 
+                st.altair_chart(chart, use_container_width=True)
 
-        # ---------------- QUARTERLY FY VIEW ----------------
-        else:
 
-            # FY calculation (April to March)
-            def get_fy_year(date):
-                return date.year if date.month >= 4 else date.year - 1
-
-            def get_fy_quarter(date):
-                if 4 <= date.month <= 6:
-                    return "Q1"
-                elif 7 <= date.month <= 9:
-                    return "Q2"
-                elif 10 <= date.month <= 12:
-                    return "Q3"
-                else:
-                    return "Q4"
+            # ---------------- QUARTERLY FY VIEW ----------------
+            else:
 
-            data["FY"] = data["Month"].apply(get_fy_year)
-            data["Quarter"] = data["Month"].apply(get_fy_quarter)
+                # FY quarter rollup (April to March), already in FY/quarter order
+                quarterly = rollup(cube_view, ["FY", "Quarter"], ["Net $ (BC)"])
+                quarterly["Quarter"] = quarterly["Quarter"].astype(str)
+
+                quarterly["Label"] = (
+                    "FY "
+                    + quarterly["FY"].astype(str)
+                    + "-"
+                    + (quarterly["FY"] + 1).astype(str).str[-2:]
+                    + " "
+                    + quarterly["Quarter"]
+                )
 
-            data["FY_Label"] = (
-                "FY "
-                + data["FY"].astype(str)
-                + "-"
-                + (data["FY"] + 1).astype(str).str[-2:]
-            )
+                chart = (
+                    alt.Chart(quarterly)
+                    .mark_bar()
+                    .encode(
+                        x=alt.X(
+                            "Label:N",
+                            sort=list(quarterly["Label"]),
+                            title="Quarter"
+                        ),
+                        y=alt.Y(
+                            "Net $ (BC):Q",
+                            title="Net Revenue ($)",
+                            axis=alt.Axis(format="$,.0f")
+                        ),
+                        tooltip=[
+                            alt.Tooltip("Label:N"),
+                            alt.Tooltip("Net $ (BC):Q", format=",.2f")
+                        ]
+                    )
+                    .properties(height=400)
+                )
 
-            data["Quarter_Label"] = data["FY_Label"] + " " + data["Quarter"]
+                st.altair_chart(chart, use_container_width=True)
 
-            quarterly = (
-                data.groupby(["FY", "Quarter"], as_index=False)
-                .agg({"Net $ (BC)": "sum"})
-            )
+    with subtabs[2]:
+        if subtabs[2].open:
+            import altair as alt
 
-            # Create proper sorting order
-            quarter_order = {"Q1": 1, "Q2": 2, "Q3": 3, "Q4": 4}
-            quarterly["QuarterOrder"] = quarterly["Quarter"].map(quarter_order)
+            # ---- TOP 10 PARTNERS ----
+            top10 = rollup(cube_view, "Partner Name", ["C Net $"])
 
-            quarterly = quarterly.sort_values(["FY", "QuarterOrder"])
+            # Sort highest to lowest
+            top10 = top10.sort_values("C Net $", ascending=False)
 
-            quarterly["Label"] = (
-                "FY "
-                + quarterly["FY"].astype(str)
-                + "-"
-                + (quarterly["FY"] + 1).astype(str).str[-2:]
-                + " "
-                + quarterly["Quarter"]
-            )
+            # Take top 10
+            top10 = top10.head(10)
 
+            # ---- ALTAIR BAR CHART ----
             chart = (
-                alt.Chart(quarterly)
+                alt.Chart(top10)
                 .mark_bar()
                 .encode(
                     x=alt.X(
-                        "Label:N",
-                        sort=list(quarterly["Label"]),
-                        title="Quarter"
-                    ),
-                    y=alt.Y(
-                        "Net $ (BC):Q",
+                        "C Net $:Q",
                         title="Net Revenue ($)",
                         axis=alt.Axis(format="$,.0f")
                     ),
+                    y=alt.Y(
+                        "Partner Name:N",
+                        sort='-x',   # 🔥 highest to lowest
+                        title="Partner"
+                    ),
                     tooltip=[
-                        alt.Tooltip("Label:N"),
-                        alt.Tooltip("Net $ (BC):Q", format=",.2f")
+                        "Partner Name",
+                        alt.Tooltip("C Net $:Q", format=",.2f")
                     ]
                 )
                 .properties(height=400)
             )
 
+            st.markdown("### 🏆Top 10 Partners")
+            st.divider()
             st.altair_chart(chart, use_container_width=True)
-
-    with subtabs[2]:    
-        import altair as alt
-
-        # ---- TOP 10 PARTNERS ----
-        top10 = (
-            df_master.groupby("Partner Name", as_index=False)
-            .agg({"C Net $": "sum"})
-        )
-
-        # Sort highest to lowest
-        top10 = top10.sort_values("C Net $", ascending=False)
-
-        # Take top 10
-        top10 = top10.head(10)
-
-        # ---- ALTAIR BAR CHART ----
-        chart = (
-            alt.Chart(top10)
-            .mark_bar()
-            .encode(
-                x=alt.X(
-                    "C Net $:Q",
-                    title="Net Revenue ($)",
-                    axis=alt.Axis(format="$,.0f")
-                ),
-                y=alt.Y(
-                    "Partner Name:N",
-                    sort='-x',   # 🔥 highest to lowest
-                    title="Partner"
-                ),
-                tooltip=[
-                    "Partner Name",
-                    alt.Tooltip("C Net $:Q", format=",.2f")
-                ]
-            )
-            .properties(height=400)
-        )
-
-        st.markdown("### 🏆Top 10 Partners")
-        st.divider()
-        st.altair_chart(chart, use_container_width=True)
-        
-                        
+            
+                            
     with subtabs[3]:
+        if subtabs[3].open:
 
-        st.markdown("### 👥 Partner Onboarded Overview")
-
-        df_partner = st.session_state.partner_df.copy()
-
-        if df_partner.empty:
-            st.warning("No Partner Data Found")
-            st.stop()
-
-        df_partner = df_partner.dropna(how="all")
+            st.markdown("### 👥 Partner Onboarded Overview")
 
-        if "Country" not in df_partner.columns:
-            st.warning("Country column missing")
-            st.stop()
-
-        # -----------------------------
-        # TOTAL COUNT (FULL WIDTH)
-        # -----------------------------
-        
-        total_partners = len(df_partner)
-
-        st.metric(
-            "Total Partners Onboarded",
-            total_partners
-        )
-
-        st.divider()
-        
-        import altair as alt
+            df_partner = edit_view(st.session_state.partner_df)
 
-        # Convert Agreement Start Date
-        df_partner["Agreement Start Date"] = pd.to_datetime(
-            df_partner["Agreement Start Date"],
-            errors="coerce"
-        )
-        
-        # Apply Dashboard Filters
+            if df_partner.empty:
+                st.warning("No Partner Data Found")
+                st.stop()
 
-        if selected_fy != "All":
-            fy_start, fy_end = get_fy_date_range(selected_fy)
+            df_partner = df_partner.dropna(how="all")
 
-            df_partner = df_partner[
-                (df_partner["Agreement Start Date"] >= fy_start) &
-                (df_partner["Agreement Start Date"] <= fy_end)
-            ]
+            if "Country" not in df_partner.columns:
+                st.warning("Country column missing")
+                st.stop()
 
-        if selected_quarter != "All" and selected_fy != "All":
-            q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
+            # -----------------------------
+            # TOTAL COUNT (FULL WIDTH)
+            # -----------------------------
+            
+            total_partners = len(df_partner)
 
-            df_partner = df_partner[
-                (df_partner["Agreement Start Date"] >= q_start) &
-                (df_partner["Agreement Start Date"] <= q_end)
-            ]
+            st.metric(
+                "Total Partners Onboarded",
+                total_partners
+            )
 
-        elif selected_month != "All":
-            selected_month_dt = pd.to_datetime(selected_month, format="%b-%Y")
+            st.divider()
+            
+            import altair as alt
+
+            # Apply Dashboard Filters
+
+            df_partner = apply_mask(
+                df_partner,
+                session_period_mask(
+                    "partner_df",
+                    selected_fy,
+                    selected_quarter,
+                    selected_month,
+                    column="Agreement Start Date"
+                )
+            )
 
-            df_partner = df_partner[
-                df_partner["Agreement Start Date"].dt.to_period("M")
-                == selected_month_dt.to_period("M")
-            ]
+            df_partner = df_partner.dropna(subset=["Agreement Start Date"])
 
-        df_partner = df_partner.dropna(subset=["Agreement Start Date"])
+            # Create Month column aligned to first day of month
+            df_partner["Month"] = df_partner["Agreement Start Date"].dt.to_period("M").dt.to_timestamp()
 
-        # Create Month column
-        # Convert Start Date
-        df_partner["Agreement Start Date"] = pd.to_datetime(
-            df_partner["Agreement Start Date"],
-            errors="coerce"
-        )
+            # Monthly counts
+            monthly_counts = (
+                df_partner.groupby("Month", as_index=False)
+                .size()
+                .rename(columns={"size": "Partner Count"})
+            )
 
-        df_partner = df_partner.dropna(subset=["Agreement Start Date"])
+            monthly_counts = monthly_counts.sort_values("Month")
+            monthly_counts = monthly_counts.sort_values("Month")
 
-        # Create Month column aligned to first day of month
-        df_partner["Month"] = df_partner["Agreement Start Date"].dt.to_period("M").dt.to_timestamp()
+            monthly_counts["Label"] = monthly_counts["Month"].dt.strftime("%b-%Y")
 
-        # Monthly counts
-        monthly_counts = (
-            df_partner.groupby("Month", as_index=False)
-            .size()
-            .rename(columns={"size": "Partner Count"})
-        )
+            st.markdown("### Total Partners Onboarded (Month-wise)")
 
-        monthly_counts = monthly_counts.sort_values("Month")
-        monthly_counts = monthly_counts.sort_values("Month")
-
-        monthly_counts["Label"] = monthly_counts["Month"].dt.strftime("%b-%Y")
-
-        st.markdown("### Total Partners Onboarded (Month-wise)")
-
-        chart = (
-            alt.Chart(monthly_counts)
-            .mark_bar()
-            .encode(
-                x=alt.X(
-                    "Label:N",
-                    sort=list(monthly_counts["Label"]),
-                    title="Month"
-                ),
-                y=alt.Y(
-                    "Partner Count:Q",
-                    title="Partners Onboarded"
-                ),
-                tooltip=[
-                    alt.Tooltip("Month:T", format="%b-%Y"),
-                    "Partner Count"
-                ]
+            chart = (
+                alt.Chart(monthly_counts)
+                .mark_bar()
+                .encode(
+                    x=alt.X(
+                        "Label:N",
+                        sort=list(monthly_counts["Label"]),
+                        title="Month"
+                    ),
+                    y=alt.Y(
+                        "Partner Count:Q",
+                        title="Partners Onboarded"
+                    ),
+                    tooltip=[
+                        alt.Tooltip("Month:T", format="%b-%Y"),
+                        "Partner Count"
+                    ]
+                )
+                .properties(height=250)
             )
-            .properties(height=250)
-        )
 
-        st.altair_chart(chart, use_container_width=True)
+            st.altair_chart(chart, use_container_width=True)
 
-        st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
 
-        # -----------------------------
-        # COUNTRY-WISE COUNT
-        # -----------------------------
-        country_counts = (
-            df_partner["Country"]
-            .fillna("Unknown")
-            .value_counts()
-            .reset_index()
-        )
+            # -----------------------------
+            # COUNTRY-WISE COUNT
+            # -----------------------------
+            country_counts = (
+                df_partner["Country"]
+                .fillna("Unknown")
+                .value_counts()
+                .reset_index()
+            )
 
-        country_counts.columns = ["Country Name", "Country Count"]
+            country_counts.columns = ["Country Name", "Country Count"]
 
-        # ---- SIDE BY SIDE TABLE + CHART ----
-        col1, col2 = st.columns([1, 2])
+            # ---- SIDE BY SIDE TABLE + CHART ----
+            col1, col2 = st.columns([1, 2])
 
-        with col1:
-            st.markdown("#### Country-wise Count")
-            st.dataframe(
-                country_counts.reset_index(drop=True),
-                use_container_width=True,
-                height=350,
-                hide_index=True
-            )
-        
-with tabs[1]:
+            with col1:
+                st.markdown("#### Country-wise Count")
+                st.dataframe(
+                    country_counts.reset_index(drop=True),
+                    use_container_width=True,
+                    height=350,
+                    hide_index=True
+                )
+            
+@st.fragment
+@tab_view("Summary")
+def summary_tab():
 
     st.header("📈 Summary")
 
@@ -2204,17 +1879,12 @@ with tabs[1]:
 
         st.subheader("Partner Summary - Monthwise")
 
-        df_master = st.session_state.master_df.copy()
+        df_master = edit_view(st.session_state.master_df)
 
         if df_master.empty:
             st.warning("No Master Data Found")
             st.stop()
 
-        # ---- Ensure correct types ----
-        df_master["Month"] = pd.to_datetime(df_master["Month"], errors="coerce")
-        df_master["C DSP $"] = pd.to_numeric(df_master["C DSP $"], errors="coerce").fillna(0)
-        df_master["C SSP $"] = pd.to_numeric(df_master["C SSP $"], errors="coerce").fillna(0)
-
         # ---- Partner Dropdown ----
         partner_list = sorted(df_master["Partner Name"].dropna().unique().tolist())
 
@@ -2254,10 +1924,8 @@ with tabs[1]:
 
         else:
 
-            # ---- Filter Partner ----
-            df_partner = df_master[
-                df_master["Partner Name"] == selected_partner
-            ].copy()
+            # ---- Filter Partner (one cube row per month) ----
+            df_partner = slice_cube(master_cube(), partner=selected_partner).copy()
             
             # -------------------------------------------------------
             # REMOVE MONTHS MARKED GREEN OR LIGHT YELLOW IN DSP/SSP
@@ -2267,55 +1935,11 @@ with tabs[1]:
             # EXCLUSION LOGIC (NO GOOGLE CALLS)
             # ----------------------------------------
 
-            dsp_df = st.session_state.dsp_df.copy()
-            ssp_df = st.session_state.ssp_df.copy()
-
-            excluded_dsp = set()
-            excluded_ssp = set()
-
-            # DSP exclusion
-            if not dsp_df.empty:
-                dsp_filtered = dsp_df[
-                    dsp_df["DSP Name"] == selected_partner
-                ].copy()
-
-                dsp_filtered["MonthStr"] = dsp_filtered["Month"].dt.strftime("%b-%Y")
-
-                green_dsp = dsp_filtered[
-                    dsp_filtered["Received Amount $"] == dsp_filtered["Receivable $"]
-                ]
-
-                yellow_dsp = dsp_filtered[
-                    (dsp_filtered["Received Amount $"] != 0) &
-                    (dsp_filtered["Received Amount $"] != dsp_filtered["Receivable $"])
-                ]
-
-                excluded_dsp = set(
-                    pd.concat([green_dsp, yellow_dsp])["MonthStr"]
-                )
-
-            # SSP exclusion
-            if not ssp_df.empty:
-                ssp_filtered = ssp_df[
-                    ssp_df["SSP Name"] == selected_partner
-                ].copy()
-
-                ssp_filtered["MonthStr"] = ssp_filtered["Month"].dt.strftime("%b-%Y")
-
-                green_ssp = ssp_filtered[
-                    ssp_filtered["Paid Amount $"] == ssp_filtered["Payable $"]
-                ]
-
-                yellow_ssp = ssp_filtered[
-                    (ssp_filtered["Paid Amount $"] != 0) &
-                    (ssp_filtered["Paid Amount $"] != ssp_filtered["Payable $"])
-                ]
-
-                excluded_ssp = set(
-                    pd.concat([green_ssp, yellow_ssp])["MonthStr"]
-                )
-
-            excluded_months = excluded_dsp.union(excluded_ssp)
+            excluded_months = settled_months(
+                st.session_state.dsp_df,
+                st.session_state.ssp_df,
+                selected_partner
+            )
 
             # Convert Month to string for comparison
             df_partner["MonthStr"] = df_partner["Month"].dt.strftime("%b-%Y")
@@ -2332,21 +1956,11 @@ with tabs[1]:
             else:
                 # 🔥 BUILD SUMMARY ONLY HERE
 
-                required_cols = ["C DSP $", "C SSP $"]
-                for col in required_cols:
-                    if col not in df_partner.columns:
-                        df_partner[col] = 0.0
-
-                df_partner["C DSP $"] = pd.to_numeric(df_partner["C DSP $"], errors="coerce").fillna(0)
-                df_partner["C SSP $"] = pd.to_numeric(df_partner["C SSP $"], errors="coerce").fillna(0)
-
                 df_summary = (
-                    df_partner
-                    .groupby("Month", as_index=False)
-                    .agg({
-                        "C DSP $": "sum",
-                        "C SSP $": "sum"
-                    })
+                    df_partner[["Month", "C DSP $", "C SSP $"]]
+                    .dropna(subset=["Month"])
+                    .sort_values("Month")
+                    .reset_index(drop=True)
                 )
 
                 df_summary["Offset $ USD"] = df_summary["C DSP $"] - df_summary["C SSP $"]
@@ -2488,15 +2102,16 @@ with tabs[1]:
                 }
             }
 
-            AgGrid(
-                df_summary,
-                gridOptions=gridOptions,
-                allow_unsafe_jscode=True,
-                fit_columns_on_grid_load=True,
-                height=300,
-                custom_css=custom_css,
-                update_mode=GridUpdateMode.NO_UPDATE
-            )
+            with span("aggrid: Summary"):
+                AgGrid(
+                    df_summary,
+                    gridOptions=gridOptions,
+                    allow_unsafe_jscode=True,
+                    fit_columns_on_grid_load=True,
+                    height=300,
+                    custom_css=custom_css,
+                    update_mode=GridUpdateMode.NO_UPDATE
+                )
 
     # ======================================================
     # 🟨 PART 2
@@ -2509,7 +2124,7 @@ with tabs[1]:
 
         st.subheader("Profit and Loss Account")
 
-        df_master = st.session_state.master_df.copy()
+        df_master = edit_view(st.session_state.master_df)
         df_cost = load_cost_centre()
 
         if df_master.empty:
@@ -2569,100 +2184,51 @@ with tabs[1]:
         # FILTER MASTER DATA
         # -------------------------------------------------
 
-        df_master["Month"] = pd.to_datetime(df_master["Month"], errors="coerce")
-
-        df = df_master.copy()
-
-        fy_start_date, fy_end_date = get_fy_date_range(selected_fy)
-
-        df = df[
-            (df["Month"] >= fy_start_date) &
-            (df["Month"] <= fy_end_date)
-        ]
-
-        # Quarter filter
-        if selected_quarter != "All":
-            q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
-
-            df = df[
-                (df["Month"] >= q_start) &
-                (df["Month"] <= q_end)
-            ]
-
-        # Month filter overrides quarter
-        if selected_month != "All":
-
-            selected_month_dt = pd.to_datetime(
-                selected_month,
-                format="%b-%Y",
-                errors="coerce"
-            )
-
-            df = df[
-                df["Month"] == selected_month_dt
-            ]
+        # FY, then quarter, then month, on the partner x month cube
+        df = slice_cube(master_cube(), selected_fy, selected_quarter, selected_month).copy()
 
         # -------------------------------------------------
-        # FX RATE
+        # REVENUE
+        # C Net $ * FX of its own month
         # -------------------------------------------------
 
-        if selected_month != "All":
-
-            fx_rate = get_fx_rate(selected_month)
-
-        else:
-
-            months_active = (
-                df["Month"]
-                .dt.strftime("%b-%Y")
-                .unique()
-                .tolist()
-            )
-
-            fx_values = []
-
-            for m in months_active:
+        df["C Net INR"], df["FX Rate"] = fx_store.to_inr(df["C Net $"], df["Month"])
 
-                fx = get_fx_rate(m)
+        # Months with no rate are NaN: left out of the INR totals (and
+        # listed below) rather than counted as ₹0
+        rated = df["FX Rate"].notna()
 
-                if fx > 0:
-                    fx_values.append(fx)
-
-            fx_rate = sum(fx_values) / len(fx_values) if fx_values else 0
-
-        # -------------------------------------------------
-        # REVENUE
-        # C Net $ * FX
-        # -------------------------------------------------
+        revenue_usd = df["C Net $"].sum()
 
-        df["C Net $"] = pd.to_numeric(df["C Net $"], errors="coerce").fillna(0)
+        revenue_inr = df["C Net INR"].sum()
 
-        revenue_usd = df["C Net $"].sum()
+        # Effective (revenue-weighted) rate across the months that have one
+        rated_usd = df.loc[rated, "C Net $"].sum()
 
-        revenue_inr = revenue_usd * fx_rate
+        if rated_usd != 0:
+            fx_rate = revenue_inr / rated_usd
+        elif selected_month != "All":
+            fx_rate = get_fx_rate(selected_month)
+        else:
+            fx_rate = 0
 
         # -------------------------------------------------
         # COST CENTRE
         # -------------------------------------------------
 
         df_cost = load_cost_centre()
-        df_cost.columns = df_cost.columns.str.strip()
-
-        # Convert numeric
-        df_cost["Amount USD"] = pd.to_numeric(df_cost["Amount USD"], errors="coerce").fillna(0)
-        df_cost["Amount INR"] = pd.to_numeric(df_cost["Amount INR"], errors="coerce").fillna(0)
-        df_cost["FX Rate"] = pd.to_numeric(df_cost["FX Rate"], errors="coerce").fillna(0)
-
-        # Convert USD → INR if needed
-        df_cost["Amount Final INR"] = df_cost["Amount INR"]
 
+        # Convert USD → INR if needed (entry's own rate, else month-end)
         usd_mask = df_cost["Currency"] == "USD"
 
-        df_cost.loc[usd_mask, "Amount Final INR"] = (
-            df_cost.loc[usd_mask, "Amount USD"] *
-            df_cost.loc[usd_mask, "FX Rate"]
+        usd_inr, _ = fx_store.to_inr(
+            df_cost["Amount USD"],
+            df_cost["Month"],
+            rates=df_cost["FX Rate"]
         )
 
+        df_cost["Amount Final INR"] = df_cost["Amount INR"].where(~usd_mask, usd_inr)
+
         # FY filter
         df_cost_filtered = df_cost[df_cost["Financial Year"] == selected_fy]
 
@@ -2689,7 +2255,28 @@ with tabs[1]:
             ]
 
         st.divider()
-        
+
+        # Months in view converted without a USD/INR rate
+        no_rate_months = pd.to_datetime(
+            pd.concat([
+                df.loc[~rated & df["C Net $"].ne(0), "Month"].dt.strftime("%b-%Y"),
+                df_cost_filtered.loc[
+                    df_cost_filtered["Currency"].eq("USD")
+                    & df_cost_filtered["Amount Final INR"].isna(),
+                    "Month"
+                ]
+            ]).drop_duplicates(),
+            format="%b-%Y",
+            errors="coerce"
+        ).dropna().sort_values()
+
+        if len(no_rate_months):
+            st.warning(
+                "⚠️ No USD/INR rate for "
+                + ", ".join(no_rate_months.dt.strftime("%b-%Y"))
+                + ". Their USD revenue and costs are left out of the INR figures below."
+            )
+
         # Direct cost
         direct_cost = df_cost_filtered.loc[
             df_cost_filtered["Category"] == "Direct",
@@ -2924,7 +2511,9 @@ with tabs[1]:
 # 4️⃣ DSP (CUSTOMERS) TAB  (100% SSP CLONE)
 # ====================================================
 
-with tabs[3]:
+@st.fragment
+@tab_view("DSP (Customers)")
+def dsp_customers_tab():
 
     fy_list = generate_financial_years()
 
@@ -2983,7 +2572,9 @@ with tabs[3]:
         )
         
     if refresh:
-        st.rerun()   
+        # Pull the sheet now; a stale snapshot would be served otherwise
+        refresh_snapshot("DSP (Customers)", sheet_fetcher("DSP (Customers)"), delta=True)
+        st.rerun()
 
     # Disable month if quarter selected
     if selected_quarter != "All":
@@ -2993,89 +2584,22 @@ with tabs[3]:
     # LOAD MASTER DATA
     # ----------------------------------------
 
-    df_master = st.session_state.master_df.copy()
-    df_partner = st.session_state.partner_df.copy()
-    
-    # 🔹 FILTER DSP CATEGORY ONLY
-    df_master["C Net $"] = pd.to_numeric(
-        df_master["C Net $"],
-        errors="coerce"
-    ).fillna(0)
-    
-    df_dsp = df_master[
-        df_master["C Net $"] > 0
-    ].copy()
-    
-    # ----------------------------------------
-    # REBUILD USD/INR FROM PARTNER LIST
-    # ----------------------------------------
-
-    df_partner = st.session_state.partner_df.copy()
-
-    if not df_partner.empty:
-
-        for index, row in df_master.iterrows():
-
-            partner_match = df_partner[
-                df_partner["Short Name using in Bidscube"] == row["Partner Name"]
-            ]
-
-            if partner_match.empty:
-                continue
-
-            country = partner_match.iloc[0].get("Country", "")
-            net_term = partner_match.iloc[0].get("Payment Terms", "")
-
-            if country == "India (IN)":
-                df_master.loc[index, "USD/INR"] = "INR"
-            else:
-                df_master.loc[index, "USD/INR"] = "USD"
-                
-            # NET TERM (IMPORTANT FIX)
-            df_master.loc[index, "NET Term"] = net_term
-
+    # USD/INR and NET Term rebuilt from the Partner List
+    df_master = enriched_master_df()
+    
+    # 🔹 FILTER DSP CATEGORY ONLY
+    df_dsp = df_master[
+        df_master["C Net $"] > 0
+    ].copy()
+
     if df_master.empty:
         st.warning("No Master Data Found")
         st.stop()
 
-    df_filtered = df_dsp.copy()
-
-    df_filtered["Month"] = pd.to_datetime(
-        df_filtered["Month"],
-        errors="coerce"
+    df_filtered = apply_mask(
+        df_dsp,
+        session_period_mask("master_df", selected_fy, selected_quarter, selected_month)
     )
-    
-    if selected_fy != "All":
-        fy_start, fy_end = get_fy_date_range(selected_fy)
-
-        df_filtered["Month"] = pd.to_datetime(
-            df_filtered["Month"],
-            errors="coerce"
-        )
-
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= fy_start) &
-            (df_filtered["Month"] <= fy_end)
-        ]
-
-    if selected_quarter != "All" and selected_fy != "All":
-        q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
-
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= q_start) &
-            (df_filtered["Month"] <= q_end)
-        ]
-
-    elif selected_month != "All":
-        selected_month_dt = pd.to_datetime(
-            selected_month,
-            format="%b-%Y",
-            errors="coerce"
-        )
-
-        df_filtered = df_filtered[
-            df_filtered["Month"] == selected_month_dt
-        ]
 
     if df_dsp.empty:
         st.warning("No DSP Customers Found")
@@ -3105,45 +2629,30 @@ with tabs[3]:
 
     sheet_name = "DSP (Customers)"
 
-    worksheet = spreadsheet.worksheet(sheet_name)
-    sheet_data = worksheet.get_all_records()
-    df_sheet = pd.DataFrame(sheet_data)
+    # Served from the local snapshot, which a save invalidates; shared,
+    # so it is only filtered here, never edited in place
+    df_sheet = load_grid_sheet(sheet_name)
 
     if not df_sheet.empty:
 
-        df_sheet["Month"] = pd.to_datetime(
-            df_sheet["Month"],
-            errors="coerce"
-        )
-
         # Apply SAME filters to sheet data
-        df_dsp_final = df_sheet.copy()
-
-        if selected_fy != "All":
-            fy_start, fy_end = get_fy_date_range(selected_fy)
-            df_dsp_final = df_dsp_final[
-                (df_dsp_final["Month"] >= fy_start) &
-                (df_dsp_final["Month"] <= fy_end)
-            ]
+        df_dsp_final = apply_mask(
+            df_sheet,
+            period_mask(df_sheet["Month"], selected_fy, selected_quarter, selected_month)
+        ).copy()
 
-        if selected_quarter != "All" and selected_fy != "All":
-            q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
-            df_dsp_final = df_dsp_final[
-                (df_dsp_final["Month"] >= q_start) &
-                (df_dsp_final["Month"] <= q_end)
-            ]
+        df_dsp_final["Month"] = df_dsp_final["Month"].dt.strftime("%b-%Y")
 
-        elif selected_month != "All":
-            selected_month_dt = pd.to_datetime(
-                selected_month,
-                format="%b-%Y",
-                errors="coerce"
+        # Search narrows the rows sent to the grid; saves match rows by
+        # sheet row, so rows left out are kept as they are. The index
+        # covers the whole sheet and is built once per snapshot
+        if search_text:
+            df_dsp_final = apply_mask(
+                df_dsp_final,
+                search_mask(df_sheet, search_text, loaded_version(sheet_name, df_sheet))
             )
-            df_dsp_final = df_dsp_final[
-                df_dsp_final["Month"] == selected_month_dt
-            ]
 
-        df_dsp_final["Month"] = df_dsp_final["Month"].dt.strftime("%b-%Y")
+        df_dsp_final["_sheet_row"] = df_dsp_final.index + 2
 
     else:
         dsp_rows = []
@@ -3157,7 +2666,7 @@ with tabs[3]:
 				"DSP Name": row["Partner Name"],
 				"Receivable $": receivable,
 				"USD/INR": row.get("USD/INR", ""),
-				"Due Date": calculate_due_date(row["Month"], net_term),
+				"Due Date": calculate_due_date(row["Month"], row.get("NET Term", "")),
 				"Received Date": "",
 				"Received Amount $": 0.0,
 				"Received In": "",
@@ -3189,6 +2698,19 @@ with tabs[3]:
     }
     """)
 
+    month_comparator = JsCode("""
+    function(date1, date2) {
+        function parseMonth(str) {
+            if (!str) return new Date(0);
+            const [mon, year] = str.split("-");
+            return new Date(mon + " 1, " + year);
+        }
+        const d1 = parseMonth(date1);
+        const d2 = parseMonth(date2);
+        return d1 - d2;
+    }
+    """)
+
     gb = GridOptionsBuilder.from_dataframe(df_dsp_final)
     
     gb.configure_column(
@@ -3197,6 +2719,9 @@ with tabs[3]:
     )
     for col in df_dsp_final.columns:
         gb.configure_column(col, flex=1)
+
+    if "_sheet_row" in df_dsp_final.columns:
+        gb.configure_column("_sheet_row", hide=True)
     
     
     from st_aggrid import JsCode   # make sure this import exists
@@ -3468,9 +2993,6 @@ with tabs[3]:
     }
     """)
 
-    if search_text:
-        gridOptions["quickFilterText"] = search_text
-
     custom_css = {
         ".ag-header": {
             "background-color": "#003366 !important",
@@ -3490,18 +3012,19 @@ with tabs[3]:
 
     df_grid = df_grid.where(pd.notnull(df_grid), None)
 
-    grid_response = AgGrid(
-        df_grid,
-        gridOptions=gridOptions,
-        allow_unsafe_jscode=True,
-        update_mode=GridUpdateMode.MODEL_CHANGED,
-        data_return_mode="AS_INPUT",
-        fit_columns_on_grid_load=False,
-        reload_data=True,
-        height=550,
-        width="100%",
-        custom_css=custom_css
-    )
+    with span("aggrid: DSP (Customers)"):
+        grid_response = AgGrid(
+            df_grid,
+            gridOptions=gridOptions,
+            allow_unsafe_jscode=True,
+            update_mode=GridUpdateMode.MODEL_CHANGED,
+            data_return_mode="AS_INPUT",
+            fit_columns_on_grid_load=False,
+            reload_data=True,
+            height=550,
+            width="100%",
+            custom_css=custom_css
+        )
 
     # ----------------------------------------
     # MANUAL SAVE BUTTON (FINAL STABLE)
@@ -3530,7 +3053,7 @@ with tabs[3]:
                 updated_df["Received Amount $"], errors="coerce"
             ).fillna(0)
 
-            # ---- SAFE DATE HANDLING (GOOGLE SAFE FORMAT) ----
+            # ---- SAFE DATE HANDLING (DD/MM/YYYY, AS THE SHEET KEEPS IT) ----
             if "Received Date" in updated_df.columns:
 
                 def normalize_date(x):
@@ -3544,16 +3067,20 @@ with tabs[3]:
                             year = x.get("year")
                             month = x.get("month")
                             day = x.get("date") or x.get("day")
-                            return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+                            return f"{int(day):02d}/{int(month):02d}/{int(year):04d}"
                         except:
                             return ""
 
-                    # Case 2: string/ISO
+                    # Case 2: DD/MM/YYYY from the editor, or ISO
                     try:
-                        dt = pd.to_datetime(x, errors="coerce")
+                        dt = pd.to_datetime(
+                            x,
+                            errors="coerce",
+                            dayfirst=not re.match(r"\d{4}-", str(x))
+                        )
                         if pd.isna(dt):
                             return ""
-                        return dt.strftime("%Y-%m-%d")   # 🔥 ISO FORMAT
+                        return dt.strftime("%d/%m/%Y")   # the sheet's own format
                     except:
                         return ""
 
@@ -3573,17 +3100,35 @@ with tabs[3]:
                 updated_df["Receivable $"] - updated_df["Received Amount $"]
             )
 
-            # ---- SAVE FULL SHEET ----
-            worksheet.clear()
+            # ---- SAVE CHANGED CELLS ONLY ----
+            if df_sheet.empty:
+                # Nothing to diff against yet: write the generated table
+                storage.replace_table(
+                    sheet_name,
+                    updated_df.columns.tolist(),
+                    updated_df.values.tolist()
+                )
+            else:
+                try:
+                    changed_cells, new_rows = diff_cells(
+                        sheet_name,
+                        df_sheet,
+                        updated_df,
+                        keys=["Month", "DSP Name"],
+                        row_column="_sheet_row"
+                    )
+                except StaleSheetError as e:
+                    invalidate_snapshot(sheet_name)
+                    st.error(f"Not saved: {e}")
+                    st.stop()
 
-            worksheet.update(
-                [updated_df.columns.tolist()] +
-                updated_df.values.tolist(),
-                value_input_option="USER_ENTERED"
-            )
-            
-            load_master_data_from_gsheet.clear()
-            load_partner_list_from_gsheet.clear()
+                # One batch_update with the changed cells as coalesced ranges
+                storage.update_cells(sheet_name, changed_cells)
+
+                for row in new_rows:
+                    storage.append_row(sheet_name, row)
+
+            invalidate_snapshot("DSP (Customers)")
             st.rerun()
 
         st.success("DSP (Customers) saved successfully ✅")
@@ -3593,7 +3138,9 @@ with tabs[3]:
 # 5️⃣ SSP (VENDORS) TAB
 # ====================================================
 
-with tabs[4]:
+@st.fragment
+@tab_view("SSP (Vendors)")
+def ssp_vendors_tab():
 
     fy_list = generate_financial_years()
 
@@ -3652,6 +3199,8 @@ with tabs[4]:
         )
         
     if refresh:
+        # Pull the sheet now; a stale snapshot would be served otherwise
+        refresh_snapshot("SSP (Vendors)", sheet_fetcher("SSP (Vendors)"), delta=True)
         st.rerun()
 
     # Disable month if quarter selected
@@ -3662,85 +3211,23 @@ with tabs[4]:
     # LOAD MASTER DATA
     # ----------------------------------------
 
-    df_master = st.session_state.master_df.copy()
-    
     # ----------------------------------------
     # REBUILD USD/INR FROM PARTNER LIST
     # ----------------------------------------
 
-    df_partner = st.session_state.partner_df.copy()
-
-    if not df_partner.empty:
-
-        for index, row in df_master.iterrows():
-
-            partner_match = df_partner[
-                df_partner["Short Name using in Bidscube"] == row["Partner Name"]
-            ]
-
-            if partner_match.empty:
-                continue
-
-            country = partner_match.iloc[0].get("Country", "")
-            net_term = partner_match.iloc[0].get("Payment Terms", "")
-
-            if country == "India (IN)":
-                df_master.loc[index, "USD/INR"] = "INR"
-            else:
-                df_master.loc[index, "USD/INR"] = "USD"
-                
-            # NET TERM (IMPORTANT FIX)
-            df_master.loc[index, "NET Term"] = net_term
+    df_master = enriched_master_df()
 
     if df_master.empty:
         st.warning("No Master Data Found")
         st.stop()
 
-    # Ensure numeric
-    df_master["C Net $"] = pd.to_numeric(df_master["C Net $"], errors="coerce").fillna(0)
-
     # 🔹 FILTER SSP CATEGORY ONLY
-    df_master["C Net $"] = pd.to_numeric(df_master["C Net $"], errors="coerce").fillna(0)
     df_ssp = df_master[df_master["C Net $"] < 0].copy()
     
-    df_filtered = df_ssp.copy()
-
-    df_filtered["Month"] = pd.to_datetime(
-        df_filtered["Month"],
-        errors="coerce"
+    df_filtered = apply_mask(
+        df_ssp,
+        session_period_mask("master_df", selected_fy, selected_quarter, selected_month)
     )
-    
-    if selected_fy != "All":
-        fy_start, fy_end = get_fy_date_range(selected_fy)
-
-        df_filtered["Month"] = pd.to_datetime(
-            df_filtered["Month"],
-            errors="coerce"
-        )
-
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= fy_start) &
-            (df_filtered["Month"] <= fy_end)
-        ]
-
-    if selected_quarter != "All" and selected_fy != "All":
-        q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
-
-        df_filtered = df_filtered[
-            (df_filtered["Month"] >= q_start) &
-            (df_filtered["Month"] <= q_end)
-        ]
-
-    elif selected_month != "All":
-        selected_month_dt = pd.to_datetime(
-            selected_month,
-            format="%b-%Y",
-            errors="coerce"
-        )
-
-        df_filtered = df_filtered[
-            df_filtered["Month"] == selected_month_dt
-        ]
 
     if df_ssp.empty:
         st.warning("No SSP Vendors Found")
@@ -3770,45 +3257,30 @@ with tabs[4]:
 
     sheet_name = "SSP (Vendors)"
 
-    worksheet = spreadsheet.worksheet(sheet_name)
-    sheet_data = worksheet.get_all_records()
-    df_sheet = pd.DataFrame(sheet_data)
+    # Served from the local snapshot, which a save invalidates; shared,
+    # so it is only filtered here, never edited in place
+    df_sheet = load_grid_sheet(sheet_name)
 
     if not df_sheet.empty:
 
-        df_sheet["Month"] = pd.to_datetime(
-            df_sheet["Month"],
-            errors="coerce"
-        )
-
         # Apply SAME filters to sheet data
-        df_ssp_final = df_sheet.copy()
-
-        if selected_fy != "All":
-            fy_start, fy_end = get_fy_date_range(selected_fy)
-            df_ssp_final = df_ssp_final[
-                (df_ssp_final["Month"] >= fy_start) &
-                (df_ssp_final["Month"] <= fy_end)
-            ]
+        df_ssp_final = apply_mask(
+            df_sheet,
+            period_mask(df_sheet["Month"], selected_fy, selected_quarter, selected_month)
+        ).copy()
 
-        if selected_quarter != "All" and selected_fy != "All":
-            q_start, q_end = get_quarter_range(selected_fy, selected_quarter)
-            df_ssp_final = df_ssp_final[
-                (df_ssp_final["Month"] >= q_start) &
-                (df_ssp_final["Month"] <= q_end)
-            ]
+        df_ssp_final["Month"] = df_ssp_final["Month"].dt.strftime("%b-%Y")
 
-        elif selected_month != "All":
-            selected_month_dt = pd.to_datetime(
-                selected_month,
-                format="%b-%Y",
-                errors="coerce"
+        # Search narrows the rows sent to the grid; saves match rows by
+        # sheet row, so rows left out are kept as they are. The index
+        # covers the whole sheet and is built once per snapshot
+        if search_text:
+            df_ssp_final = apply_mask(
+                df_ssp_final,
+                search_mask(df_sheet, search_text, loaded_version(sheet_name, df_sheet))
             )
-            df_ssp_final = df_ssp_final[
-                df_ssp_final["Month"] == selected_month_dt
-            ]
 
-        df_ssp_final["Month"] = df_ssp_final["Month"].dt.strftime("%b-%Y")
+        df_ssp_final["_sheet_row"] = df_ssp_final.index + 2
 
     else:
         ssp_rows = []
@@ -3818,7 +3290,7 @@ with tabs[4]:
             payable = abs(float(row["C Net $"]))
 
             ssp_rows.append({
-                "Month": row["Month"],
+                "Month": row["Month"].strftime("%b-%Y"),
                 "SSP Name": row["Partner Name"],
                 "Payable $": payable,
                 "USD/INR": row.get("USD/INR", ""),
@@ -3854,6 +3326,19 @@ with tabs[4]:
     }
     """)
 
+    month_comparator = JsCode("""
+    function(date1, date2) {
+        function parseMonth(str) {
+            if (!str) return new Date(0);
+            const [mon, year] = str.split("-");
+            return new Date(mon + " 1, " + year);
+        }
+        const d1 = parseMonth(date1);
+        const d2 = parseMonth(date2);
+        return d1 - d2;
+    }
+    """)
+
     gb = GridOptionsBuilder.from_dataframe(df_ssp_final)
     gb.configure_column(
         "Month",
@@ -3862,6 +3347,9 @@ with tabs[4]:
 
     for col in df_ssp_final.columns:
         gb.configure_column(col, flex=1)
+
+    if "_sheet_row" in df_ssp_final.columns:
+        gb.configure_column("_sheet_row", hide=True)
         
     from st_aggrid import JsCode   # make sure this import exists
 
@@ -4131,9 +3619,6 @@ with tabs[4]:
     }
     """)
 
-    if search_text:
-        gridOptions["quickFilterText"] = search_text
-
     custom_css = {
         ".ag-header": {
             "background-color": "#003366 !important",
@@ -4153,18 +3638,19 @@ with tabs[4]:
 
     df_grid = df_grid.where(pd.notnull(df_grid), None)
 
-    grid_response = AgGrid(
-        df_grid,
-        gridOptions=gridOptions,
-        allow_unsafe_jscode=True,
-        update_mode=GridUpdateMode.MODEL_CHANGED,
-        data_return_mode="AS_INPUT",
-        fit_columns_on_grid_load=False,
-        reload_data=True,
-        height=550,
-        width="100%",
-        custom_css=custom_css
-    )
+    with span("aggrid: SSP (Vendors)"):
+        grid_response = AgGrid(
+            df_grid,
+            gridOptions=gridOptions,
+            allow_unsafe_jscode=True,
+            update_mode=GridUpdateMode.MODEL_CHANGED,
+            data_return_mode="AS_INPUT",
+            fit_columns_on_grid_load=False,
+            reload_data=True,
+            height=550,
+            width="100%",
+            custom_css=custom_css
+        )
 
     # ----------------------------------------
     # MANUAL SAVE BUTTON (FINAL STABLE)
@@ -4193,7 +3679,7 @@ with tabs[4]:
                 updated_df["Paid Amount $"], errors="coerce"
             ).fillna(0)
 
-            # ---- SAFE DATE HANDLING (GOOGLE SAFE FORMAT) ----
+            # ---- SAFE DATE HANDLING (DD/MM/YYYY, AS THE SHEET KEEPS IT) ----
             if "Payment Date" in updated_df.columns:
 
                 def normalize_date(x):
@@ -4207,16 +3693,20 @@ with tabs[4]:
                             year = x.get("year")
                             month = x.get("month")
                             day = x.get("date") or x.get("day")
-                            return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+                            return f"{int(day):02d}/{int(month):02d}/{int(year):04d}"
                         except:
                             return ""
 
-                    # Case 2: string/ISO
+                    # Case 2: DD/MM/YYYY from the editor, or ISO
                     try:
-                        dt = pd.to_datetime(x, errors="coerce")
+                        dt = pd.to_datetime(
+                            x,
+                            errors="coerce",
+                            dayfirst=not re.match(r"\d{4}-", str(x))
+                        )
                         if pd.isna(dt):
                             return ""
-                        return dt.strftime("%Y-%m-%d")   # 🔥 ISO FORMAT
+                        return dt.strftime("%d/%m/%Y")   # the sheet's own format
                     except:
                         return ""
 
@@ -4236,17 +3726,35 @@ with tabs[4]:
                 updated_df["Payable $"] - updated_df["Paid Amount $"]
             )
 
-            # ---- SAVE FULL SHEET ----
-            worksheet.clear()
+            # ---- SAVE CHANGED CELLS ONLY ----
+            if df_sheet.empty:
+                # Nothing to diff against yet: write the generated table
+                storage.replace_table(
+                    sheet_name,
+                    updated_df.columns.tolist(),
+                    updated_df.values.tolist()
+                )
+            else:
+                try:
+                    changed_cells, new_rows = diff_cells(
+                        sheet_name,
+                        df_sheet,
+                        updated_df,
+                        keys=["Month", "SSP Name"],
+                        row_column="_sheet_row"
+                    )
+                except StaleSheetError as e:
+                    invalidate_snapshot(sheet_name)
+                    st.error(f"Not saved: {e}")
+                    st.stop()
+
+                # One batch_update with the changed cells as coalesced ranges
+                storage.update_cells(sheet_name, changed_cells)
 
-            worksheet.update(
-                [updated_df.columns.tolist()] +
-                updated_df.values.tolist(),
-                value_input_option="USER_ENTERED"
-            )
-            
-            load_master_data_from_gsheet.clear()
-            load_partner_list_from_gsheet.clear()
+                for row in new_rows:
+                    storage.append_row(sheet_name, row)
+
+            invalidate_snapshot("SSP (Vendors)")
             st.rerun()
 
         st.success("SSP (Vendors) saved successfully ✅")
@@ -4256,7 +3764,13 @@ with tabs[4]:
 # 7️⃣ LIST OF PARTNERS TAB
 # ====================================================
 
-with tabs[6]:
+@st.fragment
+@tab_view("List of Partners")
+def list_of_partners_tab():
+
+    from st_aggrid import GridOptionsBuilder, JsCode
+
+    df_partner = edit_view(st.session_state.partner_df)
 
     # -----------------------------
     # FILTER REQUIRED COLUMNS
@@ -4280,12 +3794,6 @@ with tabs[6]:
 
     df_partner = df_partner[required_columns]
     
-    df_partner["Agreement Start Date"] = pd.to_datetime(
-        df_partner["Agreement Start Date"],
-        errors="coerce",
-        dayfirst=True
-    )
-    
     df_partner["Agreement Start Date"] = df_partner["Agreement Start Date"].dt.strftime("%d-%b-%Y")
     
     # -----------------------------
@@ -4336,6 +3844,13 @@ with tabs[6]:
 
     if refresh_clicked:
         st.rerun()
+
+    if search_text:
+        # Display rows keep the session frame's index
+        df_display = apply_mask(
+            df_display,
+            search_mask(st.session_state.partner_df, search_text, data_version("partner_df"))
+        )
         
     st.divider()
 
@@ -4357,9 +3872,6 @@ with tabs[6]:
     
     gridOptions = gb.build()
 
-    if search_text:
-        gridOptions["quickFilterText"] = search_text
-
     custom_css = {
         ".ag-root-wrapper": {
             "overflow": "auto"
@@ -4379,19 +3891,24 @@ with tabs[6]:
         }
     }
 
-    AgGrid(
-        df_display,
-        gridOptions=gridOptions,
-        allow_unsafe_jscode=True,
-        height=500,
-        custom_css=custom_css
-    )
+    with span("aggrid: List of Partners"):
+        AgGrid(
+            df_display,
+            gridOptions=gridOptions,
+            allow_unsafe_jscode=True,
+            height=500,
+            custom_css=custom_css
+        )
     
 # ====================================================
 # 💰 DIRECT & INDIRECT COST TAB - FINAL STABLE
 # ====================================================
 
-with tabs[7]:
+@st.fragment
+@tab_view("Costs Centre")
+def costs_centre_tab():
+
+    fy_list = generate_financial_years()
 
     col1, col2, col3 = st.columns([1.2, 1.2, 1])
 
@@ -4467,9 +3984,9 @@ with tabs[7]:
                 # COST NAME
                 # -------------------------
 
-                worksheet = spreadsheet.worksheet("Cost Centre")
-
-                existing_data = worksheet.get_all_records()
+                existing_data = values_to_frame(
+                    storage.read_values("Cost Centre")
+                ).to_dict("records")
 
                 cost_names = sorted(
                     list(set([r["Cost Name"] for r in existing_data if r["Cost Name"]]))
@@ -4672,10 +4189,8 @@ with tabs[7]:
 
                 if st.button("Save Cost"):
 
-                    worksheet = spreadsheet.worksheet("Cost Centre")
-                    
-                    existing = pd.DataFrame(
-                        worksheet.get_all_records()
+                    existing = values_to_frame(
+                        storage.read_values("Cost Centre")
                     )
 
                     duplicate = existing[
@@ -4714,14 +4229,14 @@ with tabs[7]:
                         amount_inr
                     ]
 
-                    first_row = worksheet.row_values(1)
+                    first_row = storage.header("Cost Centre")
 
-                    if first_row != headers:
-                        worksheet.update("A1:I1", [headers])
+                    if first_row[:len(headers)] != headers:
+                        storage.set_header("Cost Centre", headers + first_row[len(headers):])
 
-                    worksheet.append_row(row, value_input_option="USER_ENTERED")
+                    storage.append_row("Cost Centre", row)
                     
-                    load_cost_centre.clear()
+                    invalidate_snapshot("Cost Centre")
 
                     st.success("Cost Saved Successfully")
 
@@ -4749,8 +4264,6 @@ with tabs[7]:
 
     st.divider()
 
-    fy_list = generate_financial_years()
-
     df_cost = load_cost_centre()
 
     if df_cost.empty:
@@ -4778,183 +4291,9 @@ with tabs[7]:
 
     start_year = int(selected_fy.split("-")[0])
 
-    months = pd.date_range(
-        start=f"{start_year}-04-01",
-        end=f"{start_year+1}-03-31",
-        freq="MS"
-    )
-
-    month_cols = [m.strftime("%b-%Y") for m in months]
-
-    # --------------------------------
-    # CREATE PARTICULARS
-    # --------------------------------
-
-    df_cost["Particulars"] = df_cost["Cost Name"] + " - " + df_cost["Sub Cost"]
-
-    # =====================================================
-    # DIRECT COST
-    # =====================================================
-
-    direct_df = df_cost[df_cost["Category"] == "Direct"]
-
-    direct_usd = direct_df[direct_df["Currency"] == "USD"]
-
-    usd_pivot = (
-        direct_usd
-        .pivot_table(
-            index="Particulars",
-            columns="Month",
-            values="Amount USD",
-            aggfunc="sum",
-            fill_value=0
-        )
-    )
-
-    usd_pivot = usd_pivot.reindex(columns=month_cols, fill_value=0)
-    usd_pivot.insert(0, "Currency", "USD")
-    usd_pivot.reset_index(inplace=True)
-
-    total_usd = usd_pivot[month_cols].sum()
-
-    fx_rate = (
-        direct_usd
-        .pivot_table(
-            index="Month",
-            values="FX Rate",
-            aggfunc="mean"
-        )
-    )
-
-    fx_rate = fx_rate.reindex(month_cols, fill_value=0)["FX Rate"]
-
-    direct_inr_from_usd = total_usd * fx_rate
-
-    direct_inr = direct_df[direct_df["Currency"] == "INR"]
-
-    inr_pivot = (
-        direct_inr
-        .pivot_table(
-            index="Particulars",
-            columns="Month",
-            values="Amount INR",
-            aggfunc="sum",
-            fill_value=0
-        )
-    )
-
-    inr_pivot = inr_pivot.reindex(columns=month_cols, fill_value=0)
-    inr_pivot.insert(0, "Currency", "INR")
-    inr_pivot.reset_index(inplace=True)
-
-    direct_inr_total = inr_pivot[month_cols].sum()
-
-    total_direct_inr = direct_inr_total + direct_inr_from_usd
-
-    # =====================================================
-    # INDIRECT COST
-    # =====================================================
-
-    indirect_df = df_cost[df_cost["Category"] == "Indirect"]
-
-    indirect_pivot = (
-        indirect_df
-        .pivot_table(
-            index="Particulars",
-            columns="Month",
-            values="Amount INR",
-            aggfunc="sum",
-            fill_value=0
-        )
-    )
-
-    indirect_pivot = indirect_pivot.reindex(columns=month_cols, fill_value=0)
-    indirect_pivot.insert(0, "Currency", "INR")
-    indirect_pivot.reset_index(inplace=True)
-
-    indirect_pivot.rename(columns={"Sub Cost": "Particulars"}, inplace=True)
-
-    total_indirect = indirect_pivot[month_cols].sum()
-
-    # =====================================================
-    # BUILD TABLE ROWS
-    # =====================================================
-
-    rows = []
-
-    # DIRECT GROUP
-    rows.append({"Particulars": "Direct Cost", "Currency": ""})
-
-    rows += usd_pivot.to_dict("records")
-
-    rows.append({
-        "Particulars": "Total USD",
-        "Currency": "USD",
-        **total_usd.to_dict()
-    })
-
-    rows.append({
-        "Particulars": "FX Rate",
-        "Currency": "",
-        **fx_rate.to_dict()
-    })
-
-    rows.append({
-        "Particulars": "Direct Cost INR",
-        "Currency": "INR",
-        **direct_inr_from_usd.to_dict()
-    })
-
-    rows += inr_pivot.to_dict("records")
-
-    rows.append({
-        "Particulars": "Total Direct Cost INR",
-        "Currency": "INR",
-        **total_direct_inr.to_dict()
-    })
-
-    # INDIRECT GROUP
-    rows.append({"Particulars": "Indirect Cost", "Currency": ""})
-
-    rows += indirect_pivot.to_dict("records")
-
-    rows.append({
-        "Particulars": "Total Indirect Cost INR",
-        "Currency": "INR",
-        **total_indirect.to_dict()
-    })
-
-    df_table = pd.DataFrame(rows)
-
-    df_table["Annual/FY Total"] = df_table[month_cols].sum(axis=1)
-    
-    # --------------------------------
-    # REMOVE ANNUAL TOTAL FOR HEADER ROWS
-    # --------------------------------
-
-    rows_without_total = [
-        "Direct Cost",
-        "Indirect Cost",
-        "FX Rate"
-    ]
-
-    df_table.loc[
-        df_table["Particulars"].isin(rows_without_total),
-        "Annual/FY Total"
-    ] = ""
-
-    df_table = df_table[["Particulars", "Currency"] + month_cols + ["Annual/FY Total"]]
-
-    # =====================================================
-    # ADD GROUP COLUMN
-    # =====================================================
-
-    df_table["Group"] = ""
-
-    df_table.loc[df_table["Particulars"].str.contains("Direct Cost"), "Group"] = "Direct Cost"
-    df_table.loc[df_table["Particulars"].str.contains("Indirect Cost"), "Group"] = "Indirect Cost"
-
-    df_table["Group"] = df_table["Group"].replace("", method="ffill")
+    # Direct / Indirect pivots, totals and FX row (see cost_centre.py)
+    with span("pivot: cost centre"):
+        df_table, month_cols = cost_centre_table(df_cost, start_year)
 
     # =====================================================
     # AGGRID
@@ -5032,29 +4371,125 @@ with tabs[7]:
         }
     }
 
-    AgGrid(
-        df_table,
-        gridOptions=gridOptions,
-        allow_unsafe_jscode=True,
-        height=600,
-        fit_columns_on_grid_load=True,
-        custom_css=custom_css,
-        key=f"cost_centre_grid_{st.session_state.cost_table_refresh}"
-    )
+    with span("aggrid: Costs Centre"):
+        AgGrid(
+            df_table,
+            gridOptions=gridOptions,
+            allow_unsafe_jscode=True,
+            height=600,
+            fit_columns_on_grid_load=True,
+            custom_css=custom_css,
+            key=f"cost_centre_grid_{st.session_state.cost_table_refresh}"
+        )
     
 # ====================================================
 # ADMIN CONTROL PANEL
 # ====================================================
 
-if "Admin Control" in allowed_tabs:
+@st.fragment
+@tab_view("Admin Control")
+def admin_control_tab():
+
+    st.header("⚙️ Admin Control Panel")
+
+    st.divider()
+    
+    # ADMIN SETTINGS
+    if st.session_state.role == "Admin":
+        with st.expander("🔑 Admin Password Control"):
+            admin_change_password()
+
+    # PERFORMANCE (spans from every session of this server process)
+    with st.expander("⏱️ Performance"):
+        last_runs = st.number_input(
+            "Last N reruns",
+            min_value=1,
+            max_value=1000,
+            value=50,
+            step=10,
+            key="perf_last_runs"
+        )
+
+        stats = span_stats(int(last_runs))
 
-    with tabs[-1]:
+        if stats.empty:
+            st.info("No spans recorded yet")
+        else:
+            st.caption("Slowest spans first (by p95)")
+            st.dataframe(stats, use_container_width=True, hide_index=True)
+
+        timings = st.session_state.get("sheet_load_timings", {})
 
-        st.header("⚙️ Admin Control Panel")
+        if timings:
+            st.caption("Sheet pulls at this session's start")
+            st.dataframe(
+                pd.DataFrame.from_dict(timings, orient="index")
+                .rename_axis("Sheet")
+                .reset_index()[["Sheet", "mode", "seconds"]],
+                use_container_width=True,
+                hide_index=True
+            )
 
         st.divider()
-        
-        # ADMIN SETTINGS
-        if st.session_state.role == "Admin":
-            with st.expander("🔑 Admin Password Control"):
-                admin_change_password()
\ No newline at end of file
+        st.markdown("**Shared dataset**")
+
+        shared = shared_dataset().memory()
+
+        if shared.empty:
+            st.info("No shared frames loaded yet")
+        else:
+            st.caption(
+                f"One copy per process, shared by every session: {shared['MB'].sum():,.2f} MB"
+            )
+            st.dataframe(shared, use_container_width=True, hide_index=True)
+
+        st.divider()
+        st.markdown("**Sheets API calls**")
+
+        call_groups = {
+            "Worksheet & method": ("worksheet", "method"),
+            "Session & tab": ("session", "tab"),
+            "Tab & method": ("tab", "method")
+        }
+
+        group_by = st.radio(
+            "Group by",
+            list(call_groups),
+            horizontal=True,
+            key="perf_calls_group"
+        )
+
+        calls = call_stats(call_groups[group_by])
+
+        if calls.empty:
+            st.info("No Sheets API calls recorded yet")
+        else:
+            budget = sheets_telemetry.CALLS_PER_RERUN
+            st.caption(
+                "Busiest first. Budget: "
+                + (f"{budget} remote calls per rerun (SHEETS_CALLS_PER_RERUN)" if budget else "off")
+            )
+            st.dataframe(calls, use_container_width=True, hide_index=True)
+
+# ====================================================
+# TAB DISPATCH
+# ====================================================
+
+# Each tab is a fragment: hidden tabs do no work, and widgets inside a
+# tab rerun that tab only
+TAB_VIEWS = {
+    "Dashboard": dashboard_tab,
+    "Summary": summary_tab,
+    "Master Data": master_data_tab,
+    "DSP (Customers)": dsp_customers_tab,
+    "SSP (Vendors)": ssp_vendors_tab,
+    "Partner Onboarding Form": partner_onboarding_tab,
+    "List of Partners": list_of_partners_tab,
+    "Costs Centre": costs_centre_tab,
+    "Admin Control": admin_control_tab
+}
+
+for tab_name, tab in zip(allowed_tabs, tabs):
+    if tab.open:
+        with tab:
+            TAB_VIEWS[tab_name]()
@@ -0,0 +1,7 @@
+"""
+Benchmarks
+Description:
+Timing scripts for the tracker, run from the repository root with
+``python -m benchmarks.<name>``. They need no Google credentials: the
+app runs against a throwaway local SQL store.
+"""
@@ -0,0 +1,130 @@
+"""
+Compute Benchmark
+Description:
+Times the tracker's compute hot paths on synthetic data (see
+benchmarks/data.py) at growing row counts, to show where each one stops
+scaling before the real sheets get there.
+
+    python -m benchmarks.compute                          # 1k, 10k, 100k
+    python -m benchmarks.compute --sizes 1k,100k,1m --only search
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import tempfile
+import time
+
+# Scratch FX store, set before fx_store is imported
+os.environ.setdefault(
+    "FX_STORE_PATH", os.path.join(tempfile.mkdtemp(prefix="fx-bench-"), "fx.sqlite")
+)
+
+from benchmarks.data import make_dataset, seed_fx_rates
+from cost_centre import cost_centre_table
+from enrichment import enrich_master
+from metrics import (
+    kpi_totals,
+    calculate_outstanding_metrics,
+    calculate_collection_efficiency,
+    settled_months
+)
+from search_index import SearchIndex, scan_mask
+
+# ===============================
+# CASES
+# ===============================
+
+def _cost_centre(data):
+    # The tab filters one FY, then builds the statement
+    fy = data["cost"]["Financial Year"].iloc[0]
+    df_cost = data["cost"][data["cost"]["Financial Year"] == fy]
+    return cost_centre_table(df_cost, int(fy.split("-")[0]))
+
+
+_query_ids = itertools.count()
+
+
+def _search_query(data):
+    # A new query each call: repeats are answered from the index's memo
+    return data["search"].mask(f"partner {next(_query_ids) % 10_000:04d} apr")
+
+
+def _summary_exclusion(data):
+    partner = data["master"]["Partner Name"].iloc[-1]
+    return settled_months(data["dsp"], data["ssp"], partner)
+
+
+CASES = {
+    "calculate_kpis": lambda d: kpi_totals(d["master"]),
+    "enrichment": lambda d: enrich_master(d["master"], d["partners"]),
+    "outstanding_metrics": lambda d: calculate_outstanding_metrics(d["dsp"], d["ssp"]),
+    "collection_efficiency": lambda d: calculate_collection_efficiency(d["dsp"], d["ssp"]),
+    "cost_centre_pivots": _cost_centre,
+    "summary_exclusion": _summary_exclusion,
+    "search_index_build": lambda d: SearchIndex(d["master"]),
+    "search_query": _search_query,
+    "search_scan": lambda d: scan_mask(d["master"], "partner 0042 apr")
+}
+
+# ===============================
+# RUNNER
+# ===============================
+
+def parse_size(text):
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1])
+    return int(float(text[:-1]) * scale) if scale else int(text)
+
+
+def time_case(fn, data, repeat):
+    fn(data)   # warm-up (imports, FX lookups, caches)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(data)
+        samples.append(time.perf_counter() - start)
+
+    return min(samples), statistics.median(samples)
+
+
+def run(sizes, names, repeat):
+    seed_fx_rates()
+
+    results = []
+
+    for rows in sizes:
+        data = make_dataset(rows)
+
+        if "search_query" in names:
+            data["search"] = SearchIndex(data["master"])
+
+        for name in names:
+            best, median = time_case(CASES[name], data, repeat)
+            results.append((name, rows, best, median))
+            print(f"{name:<24}{rows:>10,}{best * 1000:>12.2f} ms{median * 1000:>12.2f} ms", flush=True)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1k,10k,100k", help="row counts, e.g. 1k,10k,1m")
+    parser.add_argument("--only", help="comma-separated case names")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}; choose from {', '.join(CASES)}")
+
+    print(f"{'case':<24}{'rows':>10}{'min':>15}{'median':>15}")
+    run([parse_size(s) for s in args.sizes.split(",")], names, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Synthetic Data
+Description:
+Realistic Master Data, Partner List, DSP, SSP and Cost Centre frames of
+any size, typed exactly as the app's loaders return them. Partners get
+a fixed set of months (``MONTHS``), so row counts grow by adding
+partners, as the real sheets do.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sheet_schema import normalize_frame
+
+# Three completed financial years (Apr-2022 .. Mar-2025): their FX
+# rates never need a refresh, so benchmarks stay offline
+FIRST_MONTH = "2022-04-01"
+MONTHS = 36
+
+COUNTRIES = ["India (IN)", "United States (US)", "Singapore (SG)", "Germany (DE)", "Israel (IL)"]
+PAYMENT_TERMS = ["NET 15", "NET 30", "NET 45", "NET 60"]
+
+
+def _rng(seed):
+    return np.random.default_rng(seed)
+
+
+def _months():
+    return pd.date_range(FIRST_MONTH, periods=MONTHS, freq="MS")
+
+
+def partner_names(n_partners):
+    return [f"Partner {i:05d}" for i in range(n_partners)]
+
+
+def _partners_for(rows):
+    return max(1, -(-rows // MONTHS))
+
+
+def _partner_month_grid(rows):
+    # First ``rows`` (partner, month) pairs, partner-major like the sheet
+    names = np.array(partner_names(_partners_for(rows)), dtype=object)
+    months = _months()
+
+    partner = np.repeat(names, MONTHS)[:rows]
+    month = np.tile(months.to_numpy(), len(names))[:rows]
+
+    return partner, month
+
+# ===============================
+# SHEETS
+# ===============================
+
+def make_partner_list(n_partners, seed=0):
+    rng = _rng(seed)
+    names = partner_names(n_partners)
+    country = rng.choice(COUNTRIES, n_partners, p=[0.4, 0.3, 0.1, 0.1, 0.1])
+
+    df = pd.DataFrame({
+        "Agreement Start Date": pd.to_datetime(FIRST_MONTH)
+        + pd.to_timedelta(rng.integers(0, MONTHS * 30, n_partners), unit="D"),
+        "Legal Entity Name": [f"{name} Media Pvt Ltd" for name in names],
+        "Short Name using in Bidscube": names,
+        "Country": country,
+        "Foreign / Indian Entity": np.where(country == "India (IN)", "Indian", "Foreign"),
+        "GSTIN": np.where(
+            country == "India (IN)",
+            [f"27AAAC{i:05d}Z1" for i in range(n_partners)],
+            ""
+        ),
+        "Payment Terms": rng.choice(PAYMENT_TERMS, n_partners),
+        "Contact Person": [f"Contact {i}" for i in range(n_partners)],
+        "Contact No.": [f"+91 98{i:08d}" for i in range(n_partners)],
+        "Email 1": [f"ops{i}@partner{i}.example" for i in range(n_partners)],
+        "Finance Contact": [f"Finance {i}" for i in range(n_partners)],
+        "Finance Email": [f"finance{i}@partner{i}.example" for i in range(n_partners)]
+    })
+
+    return normalize_frame("Partner List", df)
+
+
+def make_master(rows, seed=0):
+    rng = _rng(seed)
+    partner, month = _partner_month_grid(rows)
+
+    dsp = rng.gamma(2.0, 2500.0, rows).round(2)
+    ssp = (dsp * rng.uniform(0.55, 0.95, rows)).round(2)
+
+    # Confirmed figures: most rows confirmed, IVT shaves a few percent
+    confirmed = rng.random(rows) < 0.85
+    c_dsp = np.where(confirmed, (dsp * rng.uniform(0.9, 1.0, rows)).round(2), 0.0)
+    c_ssp = np.where(confirmed, (ssp * rng.uniform(0.9, 1.0, rows)).round(2), 0.0)
+
+    df = pd.DataFrame({
+        "Month": month,
+        "Partner Name": partner,
+        "DSP $ (BC)": dsp,
+        "SSP $ (BC)": ssp,
+        "Net $ (BC)": dsp - ssp,
+        "C DSP $": c_dsp,
+        "C SSP $": c_ssp,
+        "C Net $": c_dsp - c_ssp,
+        "I/F": "",
+        "USD/INR": "",
+        "GSTIN": "",
+        "NET Term": "",
+        "Category (DSP/SSP)": np.where(c_dsp - c_ssp >= 0, "DSP", "SSP")
+    })
+
+    return normalize_frame("Master Data", df)
+
+
+def _cash_sheet(rows, seed, sheet_name, name_col, due_col, paid_col, date_col, account_col):
+    rng = _rng(seed)
+    partner, month = _partner_month_grid(rows)
+
+    due = rng.gamma(2.0, 2000.0, rows).round(2)
+
+    # Settled (green), part paid (light yellow) and open rows
+    status = rng.choice(3, rows, p=[0.5, 0.2, 0.3])
+    paid = np.select(
+        [status == 0, status == 1],
+        [due, (due * rng.uniform(0.2, 0.9, rows)).round(2)],
+        0.0
+    )
+
+    month_end = pd.DatetimeIndex(month) + pd.offsets.MonthEnd(0)
+    due_date = month_end + pd.to_timedelta(rng.choice([15, 30, 45, 60], rows), unit="D")
+    paid_date = due_date + pd.to_timedelta(rng.integers(-10, 20, rows), unit="D")
+
+    df = pd.DataFrame({
+        "Month": month,
+        name_col: partner,
+        due_col: due,
+        "USD/INR": rng.choice(["USD", "INR"], rows, p=[0.7, 0.3]),
+        "Due Date": due_date.strftime("%d/%m/%Y"),
+        date_col: np.where(status < 2, paid_date.strftime("%d/%m/%Y"), ""),
+        paid_col: paid,
+        account_col: np.where(status < 2, "HDFC Current A/c", ""),
+        "Shortage": (due - paid).round(2),
+        "Reason": ""
+    })
+
+    df = normalize_frame(sheet_name, df)
+
+    # As load_dsp_sheet / load_ssp_sheet add it
+    df["Outstanding $"] = df[due_col] - df[paid_col]
+
+    return df
+
+
+def make_dsp(rows, seed=1):
+    return _cash_sheet(
+        rows, seed, "DSP (Customers)", "DSP Name",
+        "Receivable $", "Received Amount $", "Received Date", "Received In"
+    )
+
+
+def make_ssp(rows, seed=2):
+    return _cash_sheet(
+        rows, seed, "SSP (Vendors)", "SSP Name",
+        "Payable $", "Paid Amount $", "Payment Date", "Paid From"
+    )
+
+
+def make_cost_centre(rows, seed=3):
+    rng = _rng(seed)
+    months = _months()[rng.integers(0, MONTHS, rows)]
+
+    category = rng.choice(["Direct", "Indirect"], rows, p=[0.6, 0.4])
+    currency = np.where(
+        category == "Direct",
+        rng.choice(["USD", "INR"], rows, p=[0.7, 0.3]),
+        "INR"
+    )
+
+    fx_rate = rng.uniform(80.0, 86.0, rows).round(4)
+    amount = rng.gamma(2.0, 800.0, rows).round(2)
+
+    # One USD entry in ten has no recorded rate and uses the month-end rate
+    usd = currency == "USD"
+    fx_rate = np.where(usd & (rng.random(rows) < 0.1), 0.0, np.where(usd, fx_rate, 0.0))
+
+    fy_start = months.year - (months.month < 4)
+
+    df = pd.DataFrame({
+        "Category": category,
+        "Cost Name": rng.choice(["Servers", "Data", "Tools", "Salaries", "Rent", "Legal"], rows),
+        "Sub Cost": rng.choice(["AWS", "GCP", "Vendor A", "Vendor B", "Misc"], rows),
+        "Financial Year": [f"{y}-{str(y + 1)[-2:]}" for y in fy_start],
+        "Month": months.strftime("%b-%Y"),
+        "Currency": currency,
+        "Amount USD": np.where(usd, amount, 0.0),
+        "FX Rate": fx_rate,
+        "Amount INR": np.where(usd, 0.0, (amount * 80).round(2))
+    })
+
+    return normalize_frame("Cost Centre", df)
+
+
+def make_dataset(rows, seed=0):
+    """Every sheet at ``rows`` rows (the Partner List scales with them)."""
+    return {
+        "master": make_master(rows, seed),
+        "partners": make_partner_list(_partners_for(rows), seed),
+        "dsp": make_dsp(rows, seed + 1),
+        "ssp": make_ssp(rows, seed + 2),
+        "cost": make_cost_centre(rows, seed + 3)
+    }
+
+# ===============================
+# FX RATES
+# ===============================
+
+def seed_fx_rates(pair="USD/INR", seed=4):
+    # Daily rates for the generated years, stored as if pulled after each
+    # year ended; point FX_STORE_PATH at a scratch file first
+    import fx_store
+
+    rng = _rng(seed)
+    first = _months()[0]
+
+    for fy in range(first.year, first.year + MONTHS // 12):
+        days = pd.date_range(f"{fy}-04-01", f"{fy + 1}-03-31", freq="B")
+        rates = 82.0 + rng.normal(0, 0.15, len(days)).cumsum()
+        fx_store._store(pair, fy, dict(zip(days.strftime("%Y-%m-%d"), rates.round(4))))
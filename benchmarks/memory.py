@@ -0,0 +1,67 @@
+"""
+Memory Benchmark
+Description:
+Memory of every synthetic frame (see benchmarks/data.py) with plain
+string columns and with the compact dtypes the schema declares, plus
+the partner x month cube build on both, at growing row counts.
+
+    python -m benchmarks.memory                    # 10k, 100k
+    python -m benchmarks.memory --sizes 100k,1m
+"""
+
+import argparse
+import time
+
+from benchmarks.compute import parse_size
+from benchmarks.data import make_dataset
+from cube import build_cube
+from shared_data import frame_mb
+
+
+def plain(df):
+    # The frame as it was before compaction: categories back to strings
+    categorical = df.select_dtypes("category").columns
+    return df.astype({col: str for col in categorical})
+
+
+def time_cube(df, repeat):
+    samples = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_cube(df)
+        samples.append(time.perf_counter() - start)
+
+    return min(samples)
+
+
+def run(sizes, repeat):
+    print(f"{'frame':<16}{'rows':>10}{'before':>12}{'after':>12}{'saved':>8}")
+
+    for rows in sizes:
+        data = make_dataset(rows)
+
+        for name, df in data.items():
+            before, after = frame_mb(plain(df)), frame_mb(df)
+            print(
+                f"{name:<16}{rows:>10,}{before:>9.2f} MB{after:>9.2f} MB"
+                f"{1 - after / before:>8.0%}",
+                flush=True
+            )
+
+        master = data["master"]
+        before, after = time_cube(plain(master), repeat), time_cube(master, repeat)
+        print(f"{'cube build':<16}{rows:>10,}{before * 1000:>9.2f} ms{after * 1000:>9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10k,100k", help="row counts, e.g. 10k,1m")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run([parse_size(s) for s in args.sizes.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Startup Benchmark
+Description:
+Cold-start time to the login screen. Each sample is a fresh Python
+process that imports Streamlit and runs app.py once (as a logged-out
+visitor) with Streamlit's AppTest harness, so import costs are counted.
+
+    python -m benchmarks.startup                 # current tree
+    python -m benchmarks.startup --rev HEAD~1    # also a git revision
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _child(app_path):
+    start = time.perf_counter()
+
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+
+    at = AppTest.from_file(app_path, default_timeout=120).run()
+
+    finished = time.perf_counter()
+
+    print(json.dumps({
+        "import_streamlit": imported - start,
+        "login_screen": finished - start,
+        "ok": not at.exception and any(w.label == "Password" for w in at.text_input)
+    }))
+
+
+def _sample(app_path, workdir):
+    env = dict(
+        os.environ,
+        TRACKER_STORAGE="sqlite",
+        TRACKER_STORAGE_PATH=os.path.join(workdir, "startup.db"),
+        FX_STORE_PATH=os.path.join(workdir, "fx.sqlite")
+    )
+
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", app_path],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _export(rev, target):
+    # Plain copy of a revision's tree, e.g. the commit before a change
+    archive = subprocess.run(
+        ["git", "archive", rev], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+    return os.path.join(target, "app.py")
+
+
+def bench(app_path, runs):
+    with tempfile.TemporaryDirectory() as workdir:
+        samples = [_sample(app_path, workdir) for _ in range(runs)]
+
+    if not all(s["ok"] for s in samples):
+        raise RuntimeError(f"{app_path} did not reach the login screen")
+
+    login = [s["login_screen"] for s in samples]
+
+    return {
+        "median_s": round(statistics.median(login), 3),
+        "min_s": round(min(login), 3),
+        "import_streamlit_s": round(statistics.median(s["import_streamlit"] for s in samples), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rev", help="also time this git revision")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return
+
+    results = {}
+
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tree:
+            results[args.rev] = bench(_export(args.rev, tree), args.runs)
+
+    results["working tree"] = bench(os.path.join(ROOT, "app.py"), args.runs)
+
+    for name, result in results.items():
+        print(
+            f"{name:>14}: login screen {result['median_s']:.3f}s median "
+            f"({result['min_s']:.3f}s min, streamlit import {result['import_streamlit_s']:.3f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Cost Centre Table
+Description:
+Builds the Cost Centre statement for one financial year: Direct cost
+pivots (USD converted to INR per entry, and INR), Indirect cost pivot,
+group totals and the FX row, as one frame ready for the grid.
+"""
+
+import numpy as np
+import pandas as pd
+
+import fx_store
+
+# Group headers and the FX row carry no annual total
+ROWS_WITHOUT_TOTAL = [
+    "Direct Cost",
+    "Indirect Cost",
+    "FX Rate"
+]
+
+
+def fy_month_columns(start_year):
+    months = pd.date_range(
+        start=f"{start_year}-04-01",
+        end=f"{start_year+1}-03-31",
+        freq="MS"
+    )
+    return [m.strftime("%b-%Y") for m in months]
+
+
+def _pivot(df, values, month_cols, currency):
+    pivot = (
+        df
+        .pivot_table(
+            index="Particulars",
+            columns="Month",
+            values=values,
+            aggfunc="sum",
+            fill_value=0
+        )
+    )
+
+    pivot = pivot.reindex(columns=month_cols, fill_value=0)
+    pivot.insert(0, "Currency", currency)
+    pivot.reset_index(inplace=True)
+
+    return pivot
+
+
+def cost_centre_table(df_cost, start_year):
+    """Statement rows of ``df_cost`` (one FY's entries): (table, month columns)."""
+    month_cols = fy_month_columns(start_year)
+
+    df_cost = df_cost.copy()
+    df_cost["Particulars"] = df_cost["Cost Name"] + " - " + df_cost["Sub Cost"]
+
+    # =====================================================
+    # DIRECT COST
+    # =====================================================
+
+    direct_df = df_cost[df_cost["Category"] == "Direct"]
+
+    direct_usd = direct_df[direct_df["Currency"] == "USD"]
+
+    usd_pivot = _pivot(direct_usd, "Amount USD", month_cols, "USD")
+
+    total_usd = usd_pivot[month_cols].sum()
+
+    # Each entry at its own rate, then summed per month
+    direct_usd = direct_usd.assign(
+        **{"Amount Final INR": fx_store.to_inr(
+            direct_usd["Amount USD"],
+            direct_usd["Month"],
+            rates=direct_usd["FX Rate"]
+        )[0]}
+    )
+
+    direct_inr_from_usd = (
+        direct_usd
+        .groupby("Month")["Amount Final INR"]
+        .sum()
+        .reindex(month_cols, fill_value=0)
+    )
+
+    # Effective rate shown per month (INR / USD)
+    fx_rate = (direct_inr_from_usd / total_usd.replace(0, np.nan)).fillna(0)
+
+    direct_inr = direct_df[direct_df["Currency"] == "INR"]
+
+    inr_pivot = _pivot(direct_inr, "Amount INR", month_cols, "INR")
+
+    direct_inr_total = inr_pivot[month_cols].sum()
+
+    total_direct_inr = direct_inr_total + direct_inr_from_usd
+
+    # =====================================================
+    # INDIRECT COST
+    # =====================================================
+
+    indirect_df = df_cost[df_cost["Category"] == "Indirect"]
+
+    indirect_pivot = _pivot(indirect_df, "Amount INR", month_cols, "INR")
+
+    total_indirect = indirect_pivot[month_cols].sum()
+
+    # =====================================================
+    # BUILD TABLE ROWS
+    # =====================================================
+
+    rows = []
+
+    # DIRECT GROUP
+    rows.append({"Particulars": "Direct Cost", "Currency": ""})
+
+    rows += usd_pivot.to_dict("records")
+
+    rows.append({
+        "Particulars": "Total USD",
+        "Currency": "USD",
+        **total_usd.to_dict()
+    })
+
+    rows.append({
+        "Particulars": "FX Rate",
+        "Currency": "",
+        **fx_rate.to_dict()
+    })
+
+    rows.append({
+        "Particulars": "Direct Cost INR",
+        "Currency": "INR",
+        **direct_inr_from_usd.to_dict()
+    })
+
+    rows += inr_pivot.to_dict("records")
+
+    rows.append({
+        "Particulars": "Total Direct Cost INR",
+        "Currency": "INR",
+        **total_direct_inr.to_dict()
+    })
+
+    # INDIRECT GROUP
+    rows.append({"Particulars": "Indirect Cost", "Currency": ""})
+
+    rows += indirect_pivot.to_dict("records")
+
+    rows.append({
+        "Particulars": "Total Indirect Cost INR",
+        "Currency": "INR",
+        **total_indirect.to_dict()
+    })
+
+    df_table = pd.DataFrame(rows)
+
+    df_table["Annual/FY Total"] = df_table[month_cols].sum(axis=1).astype(object)
+
+    df_table.loc[
+        df_table["Particulars"].isin(ROWS_WITHOUT_TOTAL),
+        "Annual/FY Total"
+    ] = ""
+
+    df_table = df_table[["Particulars", "Currency"] + month_cols + ["Annual/FY Total"]]
+
+    # =====================================================
+    # ADD GROUP COLUMN
+    # =====================================================
+
+    group = pd.Series(np.nan, index=df_table.index, dtype=object)
+
+    group[df_table["Particulars"].str.contains("Direct Cost")] = "Direct Cost"
+    group[df_table["Particulars"].str.contains("Indirect Cost")] = "Indirect Cost"
+
+    df_table["Group"] = group.ffill().fillna("")
+
+    return df_table, month_cols
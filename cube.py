@@ -0,0 +1,74 @@
+"""
+Partner x Month Cube
+Description:
+Master Data pre-aggregated to one row per partner and month, with every
+money metric summed and the fiscal year / quarter of the month attached.
+Dashboard, Summary and P&L views slice and roll up this cube instead of
+grouping the raw rows on every rerun.
+"""
+
+import pandas as pd
+
+from period_filter import fiscal_codes, fy_start_year
+
+METRICS = [
+    "DSP $ (BC)",
+    "SSP $ (BC)",
+    "Net $ (BC)",
+    "C DSP $",
+    "C SSP $",
+    "C Net $"
+]
+
+
+def build_cube(df_master):
+    if df_master.empty:
+        return pd.DataFrame(columns=["Partner Name", "Month", "FY", "Quarter"] + METRICS)
+
+    data = df_master.reindex(columns=["Partner Name", "Month"] + METRICS)
+    data[METRICS] = data[METRICS].fillna(0)
+
+    # Same derived columns the views have always shown
+    data["Net $ (BC)"] = data["DSP $ (BC)"] - data["SSP $ (BC)"]
+    data["C Net $"] = data["C DSP $"] - data["C SSP $"]
+
+    cube = (
+        data
+        .groupby(["Partner Name", "Month"], as_index=False, dropna=False, observed=True)[METRICS]
+        .sum()
+    )
+
+    cube["FY"], cube["Quarter"] = fiscal_codes(cube["Month"])
+
+    return cube
+
+
+def slice_cube(cube, fy="All", quarter="All", month="All", partner=None):
+    """Rows of the cube for the usual filter values ("2025-26", "Q1", "Apr-2025").
+
+    A quarter only applies together with a financial year, as in the filters.
+    """
+    mask = pd.Series(True, index=cube.index)
+
+    if fy != "All":
+        mask &= cube["FY"] == fy_start_year(fy)
+
+        if quarter != "All":
+            mask &= cube["Quarter"] == quarter
+
+    if month != "All":
+        mask &= cube["Month"] == pd.to_datetime(month, format="%b-%Y", errors="coerce")
+
+    if partner is not None:
+        mask &= cube["Partner Name"] == partner
+
+    return cube[mask.fillna(False).astype(bool)]
+
+
+def rollup(cube, by, metrics=METRICS):
+    # e.g. by="Month" (trend), ["FY", "Quarter"] (quarters), "Partner Name"
+    return cube.groupby(by, as_index=False, observed=True)[list(metrics)].sum()
+
+
+def totals(cube):
+    return cube[METRICS].sum()
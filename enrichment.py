@@ -0,0 +1,69 @@
+"""
+Partner Enrichment
+Description:
+Fills the partner-derived Master Data columns (I/F, USD/INR, GSTIN,
+NET Term) from the Partner List with one hash join on the Bidscube short
+name, instead of scanning the partner list once per master row.
+"""
+
+import numpy as np
+import pandas as pd
+
+PARTNER_KEY = "Short Name using in Bidscube"
+
+# Master Data columns filled from the Partner List
+ENRICHED_COLUMNS = ["I/F", "USD/INR", "GSTIN", "NET Term"]
+
+# Partner List column -> value used when a partner has no such column
+PARTNER_FIELDS = {
+    "Country": "",
+    "GSTIN": "",
+    "Payment Terms": ""
+}
+
+
+def enrich_master(df_master, df_partner):
+    """Return a copy of ``df_master`` with partner columns filled in.
+
+    Rows whose Partner Name is not in the partner list keep their own
+    values. When a short name is listed twice the first entry wins.
+    """
+    df = df_master.copy()
+
+    if df.empty or df_partner.empty or PARTNER_KEY not in df_partner.columns:
+        return df
+
+    lookup = (
+        df_partner
+        .drop_duplicates(PARTNER_KEY, keep="first")
+        .set_index(PARTNER_KEY)
+        .reindex(columns=list(PARTNER_FIELDS))
+    )
+
+    for col, default in PARTNER_FIELDS.items():
+        lookup[col] = lookup[col].fillna(default)
+
+    matches = lookup.reindex(df["Partner Name"])
+    matched = df["Partner Name"].isin(lookup.index).to_numpy()
+
+    if not matched.any():
+        return df
+
+    matches = matches[matched]
+    indian = (matches["Country"] == "India (IN)").to_numpy()
+
+    # Partner values need not be among a categorical column's categories
+    categorical = [
+        col for col in ENRICHED_COLUMNS
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+    ]
+    df[categorical] = df[categorical].astype(str)
+
+    df.loc[matched, "I/F"] = np.where(indian, "Indian", "Foreign")
+    df.loc[matched, "USD/INR"] = np.where(indian, "INR", "USD")
+    df.loc[matched, "GSTIN"] = matches["GSTIN"].to_numpy()
+    df.loc[matched, "NET Term"] = matches["Payment Terms"].to_numpy()
+
+    df[categorical] = df[categorical].astype("category")
+
+    return df
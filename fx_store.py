@@ -0,0 +1,276 @@
+"""
+FX Rate Store
+Description:
+Daily FX rates kept in a local SQLite table keyed by (pair, date). A
+missing month pulls its whole financial year (April - March) with one
+range request, so later lookups for that year, and offline runs, never
+touch the network. Month lookups are served from an in-memory index.
+"""
+
+import bisect
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+FX_PATH = os.environ.get(
+    "FX_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fx_rates.sqlite")
+)
+
+FX_API = "https://api.frankfurter.app"
+
+# Months that have not ended yet are re-pulled after this many seconds
+OPEN_MONTH_TTL = 86400
+
+# After a failed pull (offline, API down) wait this long before retrying
+RETRY_AFTER = 300
+
+# Furthest a lookup falls back to an earlier rate: a long weekend plus a
+# holiday. Past that the rate is unknown (0.0), so the gap shows up
+MAX_LOOKBACK_DAYS = 5
+
+_lock = threading.RLock()
+_conn = None
+_dates = {}      # pair -> sorted ISO dates
+_rates = {}      # pair -> {ISO date: rate}
+_months = {}     # (pair, "Apr-2025") -> month-end rate
+_pulled = {}     # (pair, FY start year) -> time of the last range pull
+_failed = {}     # (pair, FY start year) -> time of the last failed pull
+
+# ===============================
+# LOCAL TABLE
+# ===============================
+
+def _db():
+    global _conn
+
+    if _conn is None:
+        _conn = sqlite3.connect(FX_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS fx_rates "
+            "(pair TEXT, date TEXT, rate REAL, PRIMARY KEY (pair, date))"
+        )
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS fx_pulls "
+            "(pair TEXT, fy INTEGER, pulled_at REAL, PRIMARY KEY (pair, fy))"
+        )
+        _conn.commit()
+
+        for pair, day, rate in _conn.execute("SELECT pair, date, rate FROM fx_rates"):
+            _rates.setdefault(pair, {})[day] = rate
+
+        for pair, fy, pulled_at in _conn.execute("SELECT pair, fy, pulled_at FROM fx_pulls"):
+            _pulled[(pair, fy)] = pulled_at
+
+        for pair, rates in _rates.items():
+            _dates[pair] = sorted(rates)
+
+    return _conn
+
+
+def _store(pair, fy, rates):
+    with _lock:
+        conn = _db()
+        conn.executemany(
+            "INSERT OR REPLACE INTO fx_rates VALUES (?, ?, ?)",
+            [(pair, day, rate) for day, rate in rates.items()]
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO fx_pulls VALUES (?, ?, ?)",
+            (pair, fy, time.time())
+        )
+        conn.commit()
+
+        _rates.setdefault(pair, {}).update(rates)
+        _dates[pair] = sorted(_rates[pair])
+        _pulled[(pair, fy)] = time.time()
+
+        # Month-end rates of this year may have moved
+        for key in [k for k in _months if k[0] == pair]:
+            del _months[key]
+
+# ===============================
+# RANGE PULL
+# ===============================
+
+def fy_start_year(day):
+    return day.year if day.month >= 4 else day.year - 1
+
+
+def prefetch_fy(fy, pair="USD/INR"):
+    """Pull every daily rate of the FY starting April ``fy`` in one request.
+
+    Returns the number of days stored; 0 when offline (the local table is
+    then used as is).
+    """
+    base, quote = pair.split("/")
+
+    start = date(fy, 4, 1)
+    end = min(date(fy + 1, 3, 31), date.today())
+
+    if start > end:
+        return 0
+
+    try:
+        import requests
+
+        r = requests.get(
+            f"{FX_API}/{start.isoformat()}..{end.isoformat()}",
+            params={"from": base, "to": quote},
+            timeout=10
+        )
+
+        r.raise_for_status()
+
+        rates = {
+            day: round(values[quote], 4)
+            for day, values in r.json().get("rates", {}).items()
+            if quote in values
+        }
+    except Exception:
+        with _lock:
+            _failed[(pair, fy)] = time.time()
+        return 0
+
+    _store(pair, fy, rates)
+    return len(rates)
+
+
+def _needs_pull(pair, fy):
+    with _lock:
+        _db()
+        pulled_at = _pulled.get((pair, fy))
+        failed_at = _failed.get((pair, fy), 0)
+
+    if time.time() - failed_at < RETRY_AFTER:
+        return False
+
+    if pulled_at is None:
+        return True
+
+    # A finished FY pulled after it ended is complete
+    if date.fromtimestamp(pulled_at) > date(fy + 1, 3, 31):
+        return False
+
+    return time.time() - pulled_at > OPEN_MONTH_TTL
+
+
+def prefetch_months(month_strs, pair="USD/INR"):
+    # One range request per financial year the months fall in
+    years = set()
+
+    for month_str in month_strs:
+        dt = pd.to_datetime(month_str, format="%b-%Y", errors="coerce")
+        if not pd.isna(dt):
+            years.add(fy_start_year(dt))
+
+    for fy in sorted(years):
+        if _needs_pull(pair, fy):
+            prefetch_fy(fy, pair)
+
+# ===============================
+# LOOKUPS
+# ===============================
+
+def rate_on(day, pair="USD/INR"):
+    # Last published rate on or before ``day`` (weekends and holidays
+    # fall back to the previous business day, as the API does); 0.0 when
+    # the nearest one is more than MAX_LOOKBACK_DAYS older. A future day
+    # (the end of an open month) uses the latest rate up to today
+    day = min(day, date.today())
+
+    with _lock:
+        _db()
+        dates = _dates.get(pair, [])
+        i = bisect.bisect_right(dates, day.isoformat())
+
+        if i == 0:
+            return 0.0
+
+        found = dates[i - 1]
+
+        if (day - date.fromisoformat(found)).days > MAX_LOOKBACK_DAYS:
+            return 0.0
+
+        return _rates[pair][found]
+
+
+def month_end_rate(month_str, pair="USD/INR"):
+    """Rate on the last day of ``month_str`` ("Apr-2025"); 0.0 if unknown."""
+    key = (pair, month_str)
+
+    with _lock:
+        if key in _months:
+            return _months[key]
+
+    dt = pd.to_datetime(month_str, format="%b-%Y", errors="coerce")
+
+    if pd.isna(dt):
+        return 0.0
+
+    if _needs_pull(pair, fy_start_year(dt)):
+        prefetch_fy(fy_start_year(dt), pair)
+
+    last_day = (dt + pd.offsets.MonthEnd(0)).date()
+    rate = rate_on(last_day, pair)
+
+    # Open months keep moving; only memoize months that are over
+    if rate and last_day < date.today():
+        with _lock:
+            _months[key] = rate
+
+    return rate
+
+
+def month_rate_table(month_strs, pair="USD/INR"):
+    # {"Apr-2025": rate} for a set of months, pulled in bulk first
+    months = list(dict.fromkeys(month_strs))
+    prefetch_months(months, pair)
+    return {m: month_end_rate(m, pair) for m in months}
+
+# ===============================
+# VECTOR CONVERSION
+# ===============================
+
+def month_rates(months, pair="USD/INR"):
+    """Month-end rate for every row of ``months`` (datetimes or "Apr-2025").
+
+    Rates are looked up once per distinct month and spread back to the
+    rows by position, so the cost does not grow with the row count.
+    Months without a known rate (see ``MAX_LOOKBACK_DAYS``) get NaN.
+    """
+    codes, uniques = pd.factorize(months)
+
+    if pd.api.types.is_datetime64_any_dtype(uniques):
+        labels = pd.DatetimeIndex(uniques).strftime("%b-%Y")
+    else:
+        labels = pd.Index(uniques).astype(str)
+
+    table = month_rate_table(labels, pair)
+
+    # Trailing NaN is picked by code -1 (missing month)
+    rates = np.array([table[label] for label in labels] + [np.nan], dtype=float)
+    rates[rates <= 0] = np.nan
+
+    return pd.Series(rates[codes], index=months.index)
+
+
+def to_inr(amounts, months, rates=None, pair="USD/INR"):
+    """Convert ``amounts`` at each row's own month rate: (INR, rate used).
+
+    ``rates`` holds rates already recorded on the rows (e.g. the Cost
+    Centre "FX Rate"); blank or zero entries fall back to the month-end rate.
+    Rows with no rate either way are NaN, never converted at 0.
+    """
+    used = month_rates(months, pair)
+
+    if rates is not None:
+        recorded = pd.to_numeric(rates, errors="coerce").fillna(0)
+        used = used.where(recorded <= 0, recorded)
+
+    return amounts * used, used
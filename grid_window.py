@@ -0,0 +1,43 @@
+"""
+Grid Window
+Description:
+Server-side paging for large AgGrid tables. The full filtered frame
+stays on the server: it is sorted here, totals are taken over all of it,
+and only the rows of the visible page are sent to the browser.
+"""
+
+import math
+
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def page_count(n_rows, page_size):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def clamp_page(page, n_rows, page_size):
+    # Filters can shrink the result below the page the user was on
+    return min(max(1, int(page)), page_count(n_rows, page_size))
+
+
+def sort_rows(df, by=None, ascending=True):
+    # Stable sort, so rows keep their sheet order within equal values
+    if by is None or by not in df.columns:
+        return df
+
+    return df.sort_values(by, ascending=ascending, kind="stable", na_position="last")
+
+
+def page_rows(df, page, page_size):
+    start = (clamp_page(page, len(df), page_size) - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+
+def page_label(page, n_rows, page_size):
+    if not n_rows:
+        return "No rows"
+
+    start = (clamp_page(page, n_rows, page_size) - 1) * page_size
+    end = min(start + page_size, n_rows)
+
+    return f"Rows {start + 1:,}–{end:,} of {n_rows:,}"
@@ -58,15 +58,12 @@ ROLE_ACCESS = {
 # LOGIN LOG FUNCTION
 # ===============================
 
-def log_login(spreadsheet, username):
+def log_login(storage, username):
 
-    try:
-        worksheet = spreadsheet.worksheet("Login Logs")
-    except:
-        worksheet = spreadsheet.add_worksheet("Login Logs", rows=1000, cols=10)
-        worksheet.append_row(["Timestamp", "Username"])
+    if not storage.header("Login Logs"):
+        storage.set_header("Login Logs", ["Timestamp", "Username"])
 
-    worksheet.append_row([
+    storage.append_row("Login Logs", [
         datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         username
     ])
@@ -75,7 +72,7 @@ def log_login(spreadsheet, username):
 # LOGIN SCREEN
 # ===============================
 
-def login_screen(spreadsheet):
+def login_screen(storage):
 
     st.markdown("""
     <style>
@@ -144,7 +141,7 @@ def login_screen(spreadsheet):
                 st.session_state.user = username
                 st.session_state.role = DEFAULT_USERS[username]["role"]
 
-                log_login(spreadsheet, username)
+                log_login(storage, username)
 
                 st.rerun()
 
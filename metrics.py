@@ -0,0 +1,141 @@
+"""
+Metrics
+Description:
+Dashboard and Summary calculations on typed frames. They take plain
+DataFrames and need no Streamlit, so the app (behind its caches) and
+the benchmarks run the same code.
+"""
+
+import pandas as pd
+
+# ===============================
+# KPIs
+# ===============================
+
+def kpi_columns(df_master):
+    # df_master plus the net columns the KPIs and their sparklines use
+    df = df_master.copy()
+
+    # Money columns arrive typed from normalize_frame(); only fill gaps
+    for col in ["C DSP $", "C SSP $"]:
+        if col not in df.columns:
+            df[col] = 0.0
+
+    df["Net $ (BC)"] = df["DSP $ (BC)"] - df["SSP $ (BC)"]
+    df["C Net $"] = df["C DSP $"] - df["C SSP $"]
+
+    return df
+
+
+def kpi_totals(df_master):
+    # Scalars only, so a cache of them stays small
+    df = kpi_columns(df_master)
+
+    total_dsp = df["DSP $ (BC)"].sum()
+    total_ssp = df["SSP $ (BC)"].sum()
+    total_net = df["Net $ (BC)"].sum()
+
+    total_c_dsp = df["C DSP $"].sum()
+    total_c_ssp = df["C SSP $"].sum()
+    total_c_net = df["C Net $"].sum()
+
+    ivt = total_net - total_c_net
+    ivt_percent = (ivt / total_dsp * 100) if total_dsp != 0 else 0
+    c_profit_percent = (total_c_net / total_c_dsp * 100) if total_c_dsp != 0 else 0
+
+    return (
+        total_dsp,
+        total_ssp,
+        total_net,
+        total_c_dsp,
+        total_c_ssp,
+        total_c_net,
+        ivt,
+        ivt_percent,
+        c_profit_percent
+    )
+
+# ===============================
+# CASH CONTROL
+# ===============================
+
+def calculate_outstanding_metrics(dsp_df, ssp_df):
+    today = pd.Timestamp.today()
+
+    # DSP
+    total_receivable = dsp_df["Receivable $"].sum()
+    total_received = dsp_df["Received Amount $"].sum()
+    total_outstanding_dsp = dsp_df["Outstanding $"].sum()
+    overdue_dsp = dsp_df[
+        (dsp_df["Outstanding $"] > 0) &
+        (dsp_df["Due Date"] < today)
+    ]["Outstanding $"].sum()
+
+    # SSP
+    total_payable = ssp_df["Payable $"].sum()
+    total_paid = ssp_df["Paid Amount $"].sum()
+    total_outstanding_ssp = ssp_df["Outstanding $"].sum()
+    overdue_ssp = ssp_df[
+        (ssp_df["Outstanding $"] > 0) &
+        (ssp_df["Due Date"] < today)
+    ]["Outstanding $"].sum()
+
+    return {
+        "total_receivable": total_receivable,
+        "total_received": total_received,
+        "total_outstanding_dsp": total_outstanding_dsp,
+        "overdue_dsp": overdue_dsp,
+        "total_payable": total_payable,
+        "total_paid": total_paid,
+        "total_outstanding_ssp": total_outstanding_ssp,
+        "overdue_ssp": overdue_ssp
+    }
+
+
+def calculate_collection_efficiency(dsp_df, ssp_df):
+
+    total_receivable = dsp_df["Receivable $"].sum()
+    total_received = dsp_df["Received Amount $"].sum()
+
+    total_payable = ssp_df["Payable $"].sum()
+    total_paid = ssp_df["Paid Amount $"].sum()
+
+    collection_pct = (
+        (total_received / total_receivable) * 100
+        if total_receivable != 0 else 0
+    )
+
+    payment_pct = (
+        (total_paid / total_payable) * 100
+        if total_payable != 0 else 0
+    )
+
+    return {
+        "collection_pct": collection_pct,
+        "payment_pct": payment_pct
+    }
+
+# ===============================
+# SUMMARY EXCLUSION
+# ===============================
+
+def _settled(df, name_col, partner, paid_col, due_col):
+    # Green (fully settled) and light yellow (part paid) rows of a partner
+    if df.empty:
+        return set()
+
+    rows = df[df[name_col] == partner]
+    paid, due = rows[paid_col], rows[due_col]
+
+    settled = (paid == due) | ((paid != 0) & (paid != due))
+
+    return set(rows.loc[settled, "Month"].dt.strftime("%b-%Y"))
+
+
+def settled_months(dsp_df, ssp_df, partner):
+    """Months ("Apr-2025") the Partner Summary leaves out for ``partner``:
+    those marked green or light yellow in the DSP or SSP sheet."""
+    return (
+        _settled(dsp_df, "DSP Name", partner, "Received Amount $", "Receivable $") |
+        _settled(ssp_df, "SSP Name", partner, "Paid Amount $", "Payable $")
+    )
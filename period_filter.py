@@ -0,0 +1,100 @@
+"""
+Fiscal Period Filter
+Description:
+One implementation of the FY / Quarter / Month filter used across tabs.
+Each row's fiscal year, quarter and month are computed once per dataset
+as integer codes; a selection is then a few integer comparisons, and the
+resulting mask is memoized per (fy, quarter, month).
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+QUARTERS = ["Q1", "Q2", "Q3", "Q4"]   # Q1 = Apr-Jun
+
+
+def fy_start_year(fy_label):
+    # "2025-26" -> 2025
+    return int(fy_label.split("-")[0])
+
+
+def fiscal_codes(months):
+    # April-March year: FY start year and quarter label per row
+    months = pd.to_datetime(months)
+
+    fy = (months.dt.year - (months.dt.month < 4)).astype("Int64")
+    quarter_no = (months.dt.month - 4) % 12 // 3
+
+    quarter = pd.Series(
+        pd.Categorical.from_codes(quarter_no.fillna(-1).astype(int), QUARTERS),
+        index=months.index
+    )
+
+    return fy, quarter
+
+
+class PeriodIndex:
+    """Fiscal codes of one date column; rows without a date match nothing."""
+
+    def __init__(self, dates):
+        dates = pd.to_datetime(pd.Series(dates), errors="coerce")
+
+        valid = dates.notna().to_numpy()
+        year = dates.dt.year.fillna(0).astype(int).to_numpy()
+        month = dates.dt.month.fillna(0).astype(int).to_numpy()
+
+        self.index = dates.index
+        self.fy = np.where(valid, year - (month < 4), -1)
+        self.quarter = np.where(valid, (month - 4) % 12 // 3, -1)
+        self.month = np.where(valid, year * 12 + month - 1, -1)
+
+        self._masks = {}
+        self._lock = threading.Lock()
+
+    def mask(self, fy="All", quarter="All", month="All"):
+        """Boolean Series over the indexed rows for a filter selection.
+
+        A quarter only applies together with a financial year.
+        """
+        key = (fy, quarter, month)
+
+        with self._lock:
+            cached = self._masks.get(key)
+
+        if cached is not None:
+            return cached
+
+        selected = np.ones(len(self.index), dtype=bool)
+
+        if fy != "All":
+            selected &= self.fy == fy_start_year(fy)
+
+            if quarter != "All":
+                selected &= self.quarter == QUARTERS.index(quarter)
+
+        if month != "All":
+            month_dt = pd.to_datetime(month, format="%b-%Y", errors="coerce")
+
+            if pd.isna(month_dt):
+                selected[:] = False
+            else:
+                selected &= self.month == month_dt.year * 12 + month_dt.month - 1
+
+        result = pd.Series(selected, index=self.index)
+
+        with self._lock:
+            self._masks[key] = result
+
+        return result
+
+
+def period_mask(dates, fy="All", quarter="All", month="All"):
+    # Uncached, for frames without a data version
+    return PeriodIndex(dates).mask(fy, quarter, month)
+
+
+def apply_mask(df, mask):
+    # Rows of df (the indexed frame or any subset of it) that are selected
+    return df[mask.reindex(df.index, fill_value=False).to_numpy()]
@@ -0,0 +1,110 @@
+"""
+Profiling Spans
+Description:
+Lightweight timing of named spans (tab bodies, loaders, KPI and pivot
+builds, grid renders, Sheets API calls). Durations stay in process
+memory, tagged with the rerun that produced them, and are summarised
+as p50 / p95 per span for the Admin Control Panel.
+"""
+
+import functools
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Span samples kept per process; older ones fall off
+MAX_SAMPLES = 20000
+
+_lock = threading.Lock()
+_samples = deque(maxlen=MAX_SAMPLES)   # (run id, span name, seconds)
+_runs = itertools.count(1)
+_local = threading.local()            # current rerun of this script thread
+
+# ===============================
+# RECORDING
+# ===============================
+
+def start_run(label=""):
+    # Called once at the top of every script run; spans recorded on this
+    # thread are attributed to it until the next call
+    _local.run = (next(_runs), label)
+    return _local.run[0]
+
+
+def current_run():
+    return getattr(_local, "run", (0, ""))
+
+
+def record(name, seconds):
+    run_id, _ = current_run()
+
+    with _lock:
+        _samples.append((run_id, name, seconds))
+
+
+@contextmanager
+def span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator form of ``span``."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# ===============================
+# SUMMARY
+# ===============================
+
+def span_stats(last_runs=50):
+    """Per-span timings over the last ``last_runs`` reruns, slowest first.
+
+    Columns: Span, Calls, Total ms, p50 ms, p95 ms, Max ms.
+    """
+    with _lock:
+        samples = list(_samples)
+
+    columns = ["Span", "Calls", "Total ms", "p50 ms", "p95 ms", "Max ms"]
+
+    if not samples:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.DataFrame(samples, columns=["run", "Span", "seconds"])
+
+    recent = np.sort(df["run"].unique())[-last_runs:]
+    df = df[df["run"].isin(recent)]
+
+    ms = df.assign(ms=df["seconds"] * 1000).groupby("Span")["ms"]
+
+    stats = pd.DataFrame({
+        "Calls": ms.size(),
+        "Total ms": ms.sum(),
+        "p50 ms": ms.median(),
+        "p95 ms": ms.quantile(0.95),
+        "Max ms": ms.max()
+    }).round(2)
+
+    return (
+        stats
+        .sort_values("p95 ms", ascending=False)
+        .reset_index()[columns]
+    )
+
+
+def clear():
+    with _lock:
+        _samples.clear()
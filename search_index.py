@@ -0,0 +1,199 @@
+"""
+Search Index
+Description:
+Inverted token index over the text of a frame's cells, for the
+"🔍 Search" boxes. Each query word matches rows having a token that
+contains it, anywhere ("artner" finds "Partner"); every word must match.
+Words are looked up in the index's vocabulary of distinct tokens and
+answered from their postings instead of scanning every row's string
+form. Cells are split into tokens on anything but letters and digits,
+so a word never matches across a space or punctuation.
+"""
+
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+# Queries remembered per index; typing produces many short-lived ones
+MAX_CACHED_QUERIES = 256
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower())
+
+
+def _cell_texts(values):
+    # Text a user would search for: dates as shown in the grids
+    values = pd.Series(values)
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return (
+            values.dt.strftime("%b-%Y") + " " + values.dt.strftime("%d/%m/%Y")
+        ).fillna("")
+
+    if pd.api.types.is_float_dtype(values):
+        # 1200.0 -> "1200", 12.5 -> "12.5"
+        return values.map(lambda v: "" if pd.isna(v) else f"{v:.15g}")
+
+    return values.fillna("").astype(str)
+
+
+class SearchIndex:
+
+    def __init__(self, df, columns=None):
+        self.index = df.index
+        columns = list(columns) if columns is not None else list(df.columns)
+
+        pairs = []
+        vocabulary = {}
+
+        for col in columns:
+            if col not in df.columns:
+                continue
+
+            # Tokenize each distinct cell value once, then spread to rows
+            codes, uniques = pd.factorize(df[col])
+
+            code_tokens = (
+                _cell_texts(uniques)
+                .astype(object)
+                .str.lower()
+                .str.findall(_TOKEN)
+                .explode()
+                .dropna()
+            )
+
+            if code_tokens.empty:
+                continue
+
+            # Token strings -> ids shared by all columns, so the heavy
+            # work below is on integers
+            token_ids = np.array(
+                [vocabulary.setdefault(t, len(vocabulary)) for t in code_tokens.to_numpy()]
+            )
+
+            tokens = pd.DataFrame({
+                "code": code_tokens.index.to_numpy(),
+                "token": token_ids
+            })
+            rows = pd.DataFrame({"code": codes, "row": np.arange(len(codes))})
+
+            pairs.append(rows.merge(tokens, on="code")[["token", "row"]].to_numpy())
+
+        self.tokens, self.postings = [], []
+
+        if pairs:
+            # One int64 key per (token, row): a flat sort and de-duplication
+            n_rows = max(len(self.index), 1)
+            keys = np.unique(np.concatenate([p[:, 0] * n_rows + p[:, 1] for p in pairs]))
+            pairs = np.column_stack([keys // n_rows, keys % n_rows])
+
+            token_ids, starts = np.unique(pairs[:, 0], return_index=True)
+            ends = np.append(starts[1:], len(pairs))
+
+            words = np.empty(len(vocabulary), dtype=object)
+            for word, token_id in vocabulary.items():
+                words[token_id] = word
+
+            by_word = sorted(zip(words[token_ids], starts, ends))
+
+            self.tokens = [word for word, _, _ in by_word]
+            self.postings = [pairs[s:e, 1] for _, s, e in by_word]
+
+        self._vocabulary = pd.Series(self.tokens, dtype=object)
+
+        self._queries = {}
+        self._lock = threading.Lock()
+
+    def _word_rows(self, word):
+        # Rows with any token containing word; the vocabulary is far
+        # smaller than the frame, so this scan is cheap
+        selected = np.zeros(len(self.index), dtype=bool)
+
+        if len(self._vocabulary):
+            hits = np.flatnonzero(self._vocabulary.str.contains(word, regex=False).to_numpy())
+
+            if len(hits):
+                selected[np.concatenate([self.postings[i] for i in hits])] = True
+
+        return selected
+
+    def positions(self, query):
+        """Row positions matching every word of ``query`` (all rows if empty)."""
+        words = tokenize(query)
+
+        if not words:
+            return np.arange(len(self.index))
+
+        key = " ".join(sorted(set(words)))
+
+        with self._lock:
+            cached = self._queries.get(key)
+
+        if cached is not None:
+            return cached
+
+        selected = None
+        for word in sorted(set(words), key=len, reverse=True):
+            matched = self._word_rows(word)
+            selected = matched if selected is None else selected & matched
+
+            if not selected.any():
+                break
+
+        rows = np.flatnonzero(selected)
+
+        with self._lock:
+            if len(self._queries) >= MAX_CACHED_QUERIES:
+                self._queries.clear()
+            self._queries[key] = rows
+
+        return rows
+
+    def mask(self, query):
+        selected = np.zeros(len(self.index), dtype=bool)
+        selected[self.positions(query)] = True
+        return pd.Series(selected, index=self.index)
+
+
+def scan_mask(df, query, columns=None):
+    """Same matches as ``SearchIndex(df).mask(query)``, by scanning.
+
+    For frames searched once, where building an index costs more than
+    the scan it saves.
+    """
+    words = tokenize(query)
+    columns = [col for col in (columns if columns is not None else df.columns) if col in df.columns]
+    selected = np.ones(len(df), dtype=bool)
+
+    if not words:
+        return pd.Series(selected, index=df.index)
+
+    # Cell text as the index tokenizes it, with a space between tokens
+    # and columns so a word cannot match across them. Each distinct
+    # value is tokenized once
+    text = np.full(len(df), "", dtype=object)
+
+    for col in columns:
+        codes, uniques = pd.factorize(df[col])
+        tokens = (
+            _cell_texts(uniques).astype(object).str.lower()
+            .str.findall(_TOKEN).str.join(" ").to_numpy(dtype=object)
+        )
+        text = text + " " + np.append(tokens, "")[codes]
+
+    text = pd.Series(text, dtype=object)
+
+    for word in set(words):
+        selected &= text.str.contains(word, regex=False).to_numpy()
+
+    return pd.Series(selected, index=df.index)
+
+
+def search_totals(df, columns):
+    # Server-side totals of the rows a search returned
+    return {col: float(df[col].sum()) if col in df.columns else 0.0 for col in columns}
@@ -0,0 +1,90 @@
+"""
+Shared Dataset
+Description:
+One read-only copy of every loaded sheet per process, shared by all
+sessions instead of a copy in each session's state. Frames are kept by
+data version and built once per version. Pandas 3 copy-on-write makes
+``edit_view`` cheap: an edit copies only the columns it touches, never
+the shared frame.
+"""
+
+import threading
+
+import pandas as pd
+
+
+def edit_view(df):
+    # A new frame object over the same data; mutate this, not the shared one
+    return df.copy(deep=False)
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+class SharedDataset:
+    """Frames by (key, version), built once and shared read-only.
+
+    Only the newest ``keep_versions`` of a key stay registered; sessions
+    still on an older version keep their own reference to it.
+    """
+
+    def __init__(self, keep_versions=2):
+        self.keep_versions = keep_versions
+        self._lock = threading.Lock()
+        self._frames = {}       # key -> {version: DataFrame}, oldest first
+        self._building = {}     # (key, version) -> lock held by its builder
+
+    def _get(self, key, version):
+        with self._lock:
+            return self._frames.get(key, {}).get(version)
+
+    def frame(self, key, version, build):
+        frame = self._get(key, version)
+
+        if frame is not None:
+            return frame
+
+        with self._lock:
+            building = self._building.setdefault((key, version), threading.Lock())
+
+        # Sessions asking for the same new version wait for one build
+        with building:
+            frame = self._get(key, version)
+
+            if frame is None:
+                frame = build()
+
+                with self._lock:
+                    versions = self._frames.setdefault(key, {})
+                    versions[version] = frame
+
+                    while len(versions) > self.keep_versions:
+                        versions.pop(next(iter(versions)))
+
+                    self._building.pop((key, version), None)
+
+        return frame
+
+    def memory(self):
+        # Columns: Frame, Version, Rows, Columns, MB
+        with self._lock:
+            frames = [
+                (key, version, df)
+                for key, versions in self._frames.items()
+                for version, df in versions.items()
+            ]
+
+        return pd.DataFrame(
+            [
+                {
+                    "Frame": key,
+                    "Version": str(version),
+                    "Rows": len(df),
+                    "Columns": len(df.columns),
+                    "MB": round(frame_mb(df), 2)
+                }
+                for key, version, df in frames
+            ],
+            columns=["Frame", "Version", "Rows", "Columns", "MB"]
+        )
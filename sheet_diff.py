@@ -0,0 +1,159 @@
+"""
+Sheet Diff
+Description:
+Compares an edited grid with the sheet it was loaded from, matching rows
+by the sheet row each grid row came from (or by key columns), and
+returns only the cells that changed. Values are compared after schema
+normalization, so "1,200" and 1200.0 or "05/04/2025" and "2025-04-05"
+count as the same value. Dates are written back in the sheet's own
+format ("Apr-2025", "05/04/2025"), never as ISO.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sheet_schema import SCHEMAS, normalize_frame
+
+
+class StaleSheetError(ValueError):
+    """The grid no longer lines up with the sheet it was loaded from."""
+
+
+def _write_values(series, raw, date_format=None):
+    # Typed values -> what the save paths send. Dates keep the grid's own
+    # string; typed ones are formatted like the sheet. Blanks become ""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        text = series.dt.strftime(date_format or "%d/%m/%Y").fillna("")
+
+        if raw is not None:
+            given = raw.map(lambda v: v.strip() if isinstance(v, str) else "")
+            text = given.where(given.ne("") & series.notna().to_numpy(), text)
+
+        return text.tolist()
+
+    if pd.api.types.is_numeric_dtype(series):
+        return [float(v) for v in series.fillna(0)]
+
+    return series.fillna("").astype(str).tolist()
+
+
+def _same(old, new):
+    if pd.api.types.is_numeric_dtype(old) and pd.api.types.is_numeric_dtype(new):
+        return np.isclose(old.to_numpy(dtype=float), new.to_numpy(dtype=float))
+
+    if pd.api.types.is_datetime64_any_dtype(old) and pd.api.types.is_datetime64_any_dtype(new):
+        old_values = old.to_numpy(dtype="datetime64[s]")
+        new_values = new.to_numpy(dtype="datetime64[s]")
+        return (old_values == new_values) | (np.isnat(old_values) & np.isnat(new_values))
+
+    return (
+        old.fillna("").astype(str).str.strip().to_numpy() ==
+        new.fillna("").astype(str).str.strip().to_numpy()
+    )
+
+
+def _pairs_by_row(old, new, keys, row_numbers):
+    # Grid rows carry the sheet row they were loaded from; their keys
+    # must still be on that row, or the sheet moved under the grid
+    positions = pd.to_numeric(row_numbers, errors="coerce").to_numpy() - 2
+    known = ~np.isnan(positions)
+
+    if (positions[known] < 0).any() or (positions[known] >= len(old)).any():
+        raise StaleSheetError("Rows were removed from the sheet since it was loaded")
+
+    new_pos = np.flatnonzero(known)
+    old_pos = positions[known].astype(int)
+
+    if len(np.unique(old_pos)) != len(old_pos):
+        raise StaleSheetError("Two grid rows point at the same sheet row")
+
+    for key in keys:
+        if not _same(
+            old[key].iloc[old_pos].reset_index(drop=True),
+            new[key].iloc[new_pos].reset_index(drop=True)
+        ).all():
+            raise StaleSheetError("The sheet changed since it was loaded; reload and try again")
+
+    return old_pos, new_pos, np.flatnonzero(~known)
+
+
+def _pairs_by_key(old, new, keys):
+    # Only unambiguous keys can be matched: with repeats, a row hidden by
+    # a filter or search would shift its twins onto the wrong sheet row
+    for name, frame in (("sheet", old), ("grid", new)):
+        if frame.duplicated(keys).any():
+            raise StaleSheetError(f"Repeated {' + '.join(keys)} in the {name}; rows cannot be matched")
+
+    pairs = new[keys].assign(_new=np.arange(len(new))).merge(
+        old[keys].assign(_old=np.arange(len(old))),
+        on=keys,
+        how="left"
+    )
+    matched = pairs.dropna(subset=["_old"])
+
+    return (
+        matched["_old"].to_numpy(dtype=int),
+        matched["_new"].to_numpy(dtype=int),
+        pairs.loc[pairs["_old"].isna(), "_new"].to_numpy(dtype=int)
+    )
+
+
+def diff_cells(sheet_name, original, updated, keys, row_column=None):
+    """Return (cells, new_rows) that turn ``original`` into ``updated``.
+
+    ``original`` is the sheet as loaded (row i is sheet row i + 2) and
+    ``updated`` the edited rows, which may be any subset of it. Rows are
+    matched on their sheet row number in ``row_column`` when the grid
+    carries one (blank for rows not yet in the sheet), otherwise on
+    ``keys``, which must then be unique. Unmatched rows are returned in
+    ``new_rows``, laid out in the sheet's column order.
+    Raises StaleSheetError when rows cannot be matched safely.
+    cells: [(sheet row number, column name, value)], for storage.update_cells.
+    """
+    raw = updated.reset_index(drop=True)
+    old = normalize_frame(sheet_name, original.reset_index(drop=True))
+    new = normalize_frame(sheet_name, raw)
+
+    if row_column is not None and row_column in new.columns:
+        old_pos, new_pos, added = _pairs_by_row(old, new, keys, new[row_column])
+    else:
+        old_pos, new_pos, added = _pairs_by_key(old, new, keys)
+
+    dates = SCHEMAS.get(sheet_name, {}).get("dates", {})
+
+    def write_values(col, positions):
+        return _write_values(
+            new[col].iloc[positions],
+            raw[col].iloc[positions] if col in raw.columns else None,
+            dates.get(col, {}).get("write")
+        )
+
+    columns = [col for col in old.columns if col in new.columns and col not in keys]
+    cells = []
+
+    for col in columns:
+        old_col = old[col].iloc[old_pos].reset_index(drop=True)
+        new_col = new[col].iloc[new_pos].reset_index(drop=True)
+
+        changed = np.flatnonzero(~_same(old_col, new_col))
+
+        if not len(changed):
+            continue
+
+        values = write_values(col, new_pos[changed])
+
+        cells += [
+            (int(old_pos[i]) + 2, col, value)
+            for i, value in zip(changed, values)
+        ]
+
+    new_rows = []
+
+    if len(added):
+        layout = {
+            col: write_values(col, added) if col in new.columns else [""] * len(added)
+            for col in old.columns
+        }
+        new_rows = [list(row) for row in zip(*layout.values())]
+
+    return sorted(cells), new_rows
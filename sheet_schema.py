@@ -0,0 +1,196 @@
+"""
+Sheet Schemas
+Description:
+Declared column types for every worksheet the tracker reads. Frames are
+normalized once when a sheet is loaded, so tabs work on typed columns
+instead of re-running pd.to_numeric / pd.to_datetime on every rerun.
+Text columns that repeat a few values on every row are kept as
+categoricals, which roughly halves the Master Data frame in memory.
+"""
+
+import pandas as pd
+
+# ===============================
+# SCHEMAS
+# ===============================
+
+# dates: column -> parse options (format=None lets pandas infer it);
+#        "write" is the sheet's own format, used when saving a date back
+# money: numeric columns, blanks and junk become 0.0
+# numbers: other numeric columns, same handling as money
+# text: string columns, blanks become ""
+# categories: text columns with few distinct values, stored as category
+
+SCHEMAS = {
+    "Master Data": {
+        "dates": {
+            "Month": {"format": None}
+        },
+        "money": [
+            "DSP $ (BC)",
+            "SSP $ (BC)",
+            "Net $ (BC)",
+            "C DSP $",
+            "C SSP $",
+            "C Net $"
+        ],
+        "text": [
+            "Partner Name",
+            "I/F",
+            "USD/INR",
+            "GSTIN",
+            "NET Term",
+            "Category (DSP/SSP)"
+        ],
+        "categories": [
+            "Partner Name",
+            "I/F",
+            "USD/INR",
+            "GSTIN",
+            "NET Term",
+            "Category (DSP/SSP)"
+        ]
+    },
+
+    "Partner List": {
+        "dates": {
+            "Agreement Start Date": {"dayfirst": True}
+        },
+        "text": [
+            "Legal Entity Name",
+            "Short Name using in Bidscube",
+            "Country",
+            "Foreign / Indian Entity",
+            "GSTIN",
+            "Payment Terms",
+            "Contact Person",
+            "Contact No.",
+            "Email 1",
+            "Finance Contact",
+            "Finance Email"
+        ]
+    },
+
+    "DSP (Customers)": {
+        "dates": {
+            "Month": {"format": None, "write": "%b-%Y"},
+            "Due Date": {"dayfirst": True, "write": "%d/%m/%Y"},
+            "Received Date": {"dayfirst": True, "write": "%d/%m/%Y"}
+        },
+        "money": [
+            "Receivable $",
+            "Received Amount $",
+            "Shortage"
+        ],
+        "text": [
+            "DSP Name",
+            "USD/INR",
+            "Received In",
+            "Reason"
+        ]
+    },
+
+    "SSP (Vendors)": {
+        "dates": {
+            "Month": {"format": None, "write": "%b-%Y"},
+            "Due Date": {"dayfirst": True, "write": "%d/%m/%Y"},
+            "Payment Date": {"dayfirst": True, "write": "%d/%m/%Y"}
+        },
+        "money": [
+            "Payable $",
+            "Paid Amount $",
+            "Shortage"
+        ],
+        "text": [
+            "SSP Name",
+            "USD/INR",
+            "Paid From",
+            "Reason"
+        ]
+    },
+
+    # Month stays text here ("Apr-2025"); it is matched as a label
+    "Cost Centre": {
+        "money": [
+            "Amount USD",
+            "Amount INR"
+        ],
+        "numbers": [
+            "FX Rate"
+        ],
+        "text": [
+            "Category",
+            "Cost Name",
+            "Sub Cost",
+            "Financial Year",
+            "Month",
+            "Currency"
+        ]
+    }
+}
+
+# ===============================
+# NORMALIZATION
+# ===============================
+
+def money_columns(sheet_name):
+    return list(SCHEMAS.get(sheet_name, {}).get("money", []))
+
+
+def normalize_frame(sheet_name, df, parse_dates=None, compact=True):
+    """Return a typed copy of ``df`` following the sheet's schema.
+
+    ``parse_dates`` limits date parsing to the given columns, for views
+    that still need the sheet's own date strings (e.g. grid editors).
+    ``compact=False`` leaves category columns as plain strings.
+    """
+    schema = SCHEMAS.get(sheet_name)
+
+    if schema is None or df.empty:
+        return df
+
+    df = df.copy()
+    df.columns = [str(col).strip() for col in df.columns]
+
+    for col, options in schema.get("dates", {}).items():
+        if col not in df.columns:
+            continue
+        if parse_dates is not None and col not in parse_dates:
+            continue
+
+        # Blank cells must not steer pandas' format inference
+        values = df[col].mask(df[col].astype(str).str.strip() == "")
+
+        if options.get("dayfirst") and not pd.api.types.is_datetime64_any_dtype(values):
+            # Save paths write ISO dates, which must never read day-first
+            iso = values.astype(str).str.match(r"\d{4}-\d{2}-\d{2}")
+
+            parsed = pd.to_datetime(values.mask(iso), dayfirst=True, errors="coerce")
+
+            if iso.any():
+                parsed[iso] = pd.to_datetime(values[iso], format="ISO8601", errors="coerce")
+
+            df[col] = parsed
+            continue
+
+        df[col] = pd.to_datetime(
+            values,
+            format=options.get("format"),
+            dayfirst=options.get("dayfirst", False),
+            errors="coerce"
+        )
+
+    for col in schema.get("money", []) + schema.get("numbers", []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(float)
+
+    for col in schema.get("text", []):
+        if col in df.columns:
+            df[col] = df[col].fillna("").astype(str)
+
+    if compact:
+        for col in schema.get("categories", []):
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+
+    return df
@@ -0,0 +1,205 @@
+"""
+Quota-Aware Sheets Client
+Description:
+A gspread HTTP client that keeps every session of the app inside the
+Sheets API per-minute quota. Requests wait on a shared token bucket,
+429 / 5xx responses are retried with jittered exponential backoff, and
+identical reads already in flight are answered by the one request.
+Every remote call is reported to the Sheets telemetry.
+"""
+
+import os
+import random
+import threading
+import time
+from http import HTTPStatus
+
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+
+from profiling import span
+from sheets_telemetry import record_call
+
+# Sheets allows 60 read and 60 write requests per minute per user; the
+# whole app shares one service account, so the buckets are process-wide
+READS_PER_MINUTE = int(os.environ.get("SHEETS_READS_PER_MINUTE", "60"))
+WRITES_PER_MINUTE = int(os.environ.get("SHEETS_WRITES_PER_MINUTE", "60"))
+
+MAX_RETRIES = int(os.environ.get("SHEETS_MAX_RETRIES", "5"))
+BACKOFF_BASE = 1.0     # seconds, doubled on every retry
+BACKOFF_MAX = 64.0
+
+RETRY_CODES = {
+    HTTPStatus.REQUEST_TIMEOUT,
+    HTTPStatus.TOO_MANY_REQUESTS
+}
+
+# ===============================
+# TOKEN BUCKET
+# ===============================
+
+class TokenBucket:
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity or per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        # Block until a token is free; returns the seconds spent waiting
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                self._refill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+    def drain(self):
+        # The server says the quota is used up: spend what is left locally
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+read_bucket = TokenBucket(READS_PER_MINUTE)
+write_bucket = TokenBucket(WRITES_PER_MINUTE)
+
+# ===============================
+# HTTP CLIENT
+# ===============================
+
+class _InFlight:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+def _request_key(method, endpoint, params):
+    items = []
+
+    for key, value in sorted((params or {}).items()):
+        items.append((key, tuple(value) if isinstance(value, list) else value))
+
+    return method.upper(), endpoint, tuple(items)
+
+
+def backoff_delay(attempt, retry_after=None):
+    # Full jitter: a random wait up to the exponential cap, so sessions
+    # that failed together do not retry together
+    if retry_after:
+        return float(retry_after) + random.uniform(0, BACKOFF_BASE)
+
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class QuotaHTTPClient(HTTPClient):
+    """Pass as ``gspread.authorize(creds, http_client=QuotaHTTPClient)``."""
+
+    _in_flight = {}
+    _in_flight_lock = threading.Lock()
+
+    def request(self, method, endpoint, params=None, data=None, json=None,
+                files=None, headers=None):
+        # Each call, including waits and retries, is one profiling span
+        with span(f"sheets: {method.upper()}"):
+            return self._request(method, endpoint, params, data, json, files, headers)
+
+    def _request(self, method, endpoint, params, data, json, files, headers):
+
+        if method.upper() != "GET":
+            return self._send(write_bucket, method, endpoint, params, data, json, files, headers)
+
+        # Identical reads share one request and its response
+        key = _request_key(method, endpoint, params)
+
+        with self._in_flight_lock:
+            pending = self._in_flight.get(key)
+            leader = pending is None
+
+            if leader:
+                pending = self._in_flight[key] = _InFlight()
+
+        if not leader:
+            pending.done.wait()
+
+            if pending.error is not None:
+                raise pending.error
+            return pending.response
+
+        try:
+            pending.response = self._send(read_bucket, method, endpoint, params, data, json, files, headers)
+            return pending.response
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+            pending.done.set()
+
+    def _send(self, bucket, method, endpoint, params, data, json, files, headers):
+        attempt = 0
+        start = time.perf_counter()
+
+        while True:
+            bucket.acquire()
+
+            try:
+                response = super().request(
+                    method,
+                    endpoint,
+                    params=params,
+                    data=data,
+                    json=json,
+                    files=files,
+                    headers=headers
+                )
+            except APIError as err:
+                code = err.response.status_code
+
+                retry = (
+                    code in RETRY_CODES or
+                    code >= HTTPStatus.INTERNAL_SERVER_ERROR
+                )
+
+                if not retry or attempt >= MAX_RETRIES:
+                    record_call(
+                        method, endpoint, params, data, json,
+                        seconds=time.perf_counter() - start,
+                        retries=attempt,
+                        error=err
+                    )
+                    raise
+
+                if code == HTTPStatus.TOO_MANY_REQUESTS:
+                    bucket.drain()
+
+                time.sleep(backoff_delay(attempt, err.response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+
+            # One call, however many attempts it took
+            record_call(
+                method, endpoint, params, data, json,
+                response=response,
+                seconds=time.perf_counter() - start,
+                retries=attempt
+            )
+            return response
@@ -0,0 +1,231 @@
+"""
+Sheets API Telemetry
+Description:
+Counts every remote call the Sheets client makes, by worksheet, API
+method, bytes and latency, and attributes it to the session and tab
+that triggered it. A per-rerun budget logs a warning when one render
+makes more remote calls than it should.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import unquote, urlparse
+
+import pandas as pd
+
+from profiling import current_run
+
+# Remote calls one rerun may make before a warning is logged; 0 turns
+# the check off
+CALLS_PER_RERUN = int(os.environ.get("SHEETS_CALLS_PER_RERUN", "6"))
+
+# Calls kept per process; older ones fall off
+MAX_CALLS = 20000
+MAX_TRACKED_RUNS = 1000
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_calls = deque(maxlen=MAX_CALLS)
+_run_counts = OrderedDict()     # run id -> remote calls made so far
+_local = threading.local()      # session / tab of this script thread
+
+NO_SHEET = "(spreadsheet)"
+
+# ===============================
+# ATTRIBUTION
+# ===============================
+
+def set_call_context(session=None, tab=None):
+    # Calls made on this thread are attributed to this session and tab;
+    # pass only what changed
+    if session is not None:
+        _local.session = session
+    if tab is not None:
+        _local.tab = tab
+
+
+def call_context():
+    return getattr(_local, "session", ""), getattr(_local, "tab", "")
+
+# ===============================
+# REQUEST PARSING
+# ===============================
+
+# gspread call -> API method it sends:
+#   get_all_records / get_all_values / row_values / get -> values.get
+#   update -> values.update          append_row -> values.append
+#   clear -> values.clear            batch_update -> values.batchUpdate
+#   worksheet() / add_worksheet -> spreadsheets.get / spreadsheets.batchUpdate
+
+def _sheet_of_range(a1):
+    name = a1.rsplit("!", 1)[0] if "!" in a1 else a1
+
+    if len(name) > 1 and name.startswith("'") and name.endswith("'"):
+        name = name[1:-1].replace("''", "'")
+
+    return name
+
+
+def api_method(http_method, endpoint):
+    path = urlparse(endpoint).path
+    verb = http_method.upper()
+
+    for suffix in ("batchGet", "batchUpdate", "batchClear"):
+        if path.endswith("/values:" + suffix):
+            return "values." + suffix
+
+    if "/values/" in path:
+        for suffix in ("append", "clear"):
+            if path.endswith(":" + suffix):
+                return "values." + suffix
+        return "values.update" if verb == "PUT" else "values.get"
+
+    if "/drive/" in path or "/upload/" in path:
+        return "drive." + verb.lower()
+
+    if path.endswith(":batchUpdate"):
+        return "spreadsheets.batchUpdate"
+
+    return "spreadsheets.get" if verb == "GET" else "spreadsheets." + verb.lower()
+
+
+def request_sheets(endpoint, params=None, json_body=None):
+    # Worksheets a request touches, read from its A1 ranges
+    path = urlparse(endpoint).path
+    ranges = []
+
+    if "/values/" in path:
+        a1 = path.split("/values/", 1)[1]
+
+        for suffix in (":append", ":clear"):
+            if a1.endswith(suffix):
+                a1 = a1[:-len(suffix)]
+
+        ranges.append(unquote(a1))
+
+    ranges += list((params or {}).get("ranges", []) or [])
+
+    if isinstance(json_body, dict):
+        ranges += [item.get("range", "") for item in json_body.get("data", []) or []]
+        ranges += list(json_body.get("ranges", []) or [])
+
+    sheets = [_sheet_of_range(str(r)) for r in ranges if r]
+
+    return ", ".join(dict.fromkeys(sheets)) or NO_SHEET
+
+
+def body_size(data=None, json_body=None):
+    if data is not None:
+        return len(data) if isinstance(data, (bytes, bytearray, str)) else 0
+    if json_body is not None:
+        return len(json.dumps(json_body, default=str).encode("utf-8"))
+    return 0
+
+# ===============================
+# RECORDING
+# ===============================
+
+def record_call(http_method, endpoint, params=None, data=None, json_body=None,
+                response=None, seconds=0.0, retries=0, error=None):
+    session, tab = call_context()
+    run_id, _ = current_run()
+
+    call = {
+        "at": time.time(),
+        "run": run_id,
+        "session": session,
+        "tab": tab,
+        "worksheet": request_sheets(endpoint, params, json_body),
+        "method": api_method(http_method, endpoint),
+        "status": getattr(response, "status_code", None) if error is None
+                  else getattr(getattr(error, "response", None), "status_code", None),
+        "request_bytes": body_size(data, json_body),
+        "response_bytes": len(response.content) if response is not None else 0,
+        "seconds": seconds,
+        "retries": retries
+    }
+
+    with _lock:
+        _calls.append(call)
+
+        count = _run_counts.get(run_id, 0) + 1
+        _run_counts[run_id] = count
+
+        while len(_run_counts) > MAX_TRACKED_RUNS:
+            _run_counts.popitem(last=False)
+
+    # Run 0 is background work (snapshot refreshes, write-behind flushes)
+    if run_id and CALLS_PER_RERUN and count == CALLS_PER_RERUN + 1:
+        log.warning(
+            "Sheets call budget exceeded: rerun %s made more than %s remote calls "
+            "(session %s, tab %s, last call %s on %s)",
+            run_id, CALLS_PER_RERUN, session or "-", tab or "-",
+            call["method"], call["worksheet"]
+        )
+
+    return call
+
+
+def run_calls(run_id=None):
+    # Remote calls made so far by a rerun (this thread's by default)
+    if run_id is None:
+        run_id, _ = current_run()
+
+    with _lock:
+        return _run_counts.get(run_id, 0)
+
+# ===============================
+# SUMMARY
+# ===============================
+
+def call_stats(by=("worksheet", "method"), last_seconds=None):
+    """Remote calls grouped by ``by``, busiest first.
+
+    Columns: the ``by`` keys, Calls, Retries, KB sent, KB received,
+    p50 ms, p95 ms, Total ms.
+    """
+    with _lock:
+        calls = list(_calls)
+
+    by = list(by)
+    columns = by + ["Calls", "Retries", "KB sent", "KB received", "p50 ms", "p95 ms", "Total ms"]
+
+    if last_seconds is not None:
+        since = time.time() - last_seconds
+        calls = [call for call in calls if call["at"] >= since]
+
+    if not calls:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.DataFrame(calls)
+    df[["session", "tab"]] = df[["session", "tab"]].replace("", "-")
+    df["ms"] = df["seconds"] * 1000
+
+    grouped = df.groupby(by)
+
+    stats = pd.DataFrame({
+        "Calls": grouped.size(),
+        "Retries": grouped["retries"].sum(),
+        "KB sent": grouped["request_bytes"].sum() / 1024,
+        "KB received": grouped["response_bytes"].sum() / 1024,
+        "p50 ms": grouped["ms"].median(),
+        "p95 ms": grouped["ms"].quantile(0.95),
+        "Total ms": grouped["ms"].sum()
+    }).round(2)
+
+    return (
+        stats
+        .sort_values(["Calls", "Total ms"], ascending=False)
+        .reset_index()[columns]
+    )
+
+
+def clear():
+    with _lock:
+        _calls.clear()
+        _run_counts.clear()
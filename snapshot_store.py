@@ -0,0 +1,419 @@
+"""
+Local Snapshot Store
+Description:
+Keeps every Google Sheet tab as a local Parquet file (raw cell values)
+with a JSON sidecar holding its load time and schema. Reruns and new
+sessions read the local copy; the network pull only refreshes it.
+In delta mode a refresh hashes each raw row and only re-parses the rows
+whose content is new, patching them into the cached raw DataFrame;
+normalization and enrichment still run over the whole sheet.
+Pulls that cannot be batched run on a bounded thread pool.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = os.environ.get(
+    "TRACKER_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+)
+
+# Concurrent pulls allowed at once; keep well under the Sheets
+# per-minute read quota shared by every user of the service account
+MAX_WORKERS = int(os.environ.get("SHEET_LOAD_WORKERS", "4"))
+
+_lock = threading.Lock()
+_frames = {}          # sheet name -> (loaded_at, DataFrame, row hashes)
+_timings = {}         # sheet name -> timing of the last pull
+_refreshing = set()   # sheet names with a background pull running
+_pool = None          # shared executor for background refreshes
+_sheet_locks = {}     # sheet name -> lock held while it is pulled or written
+
+HASH_COLUMN = "_row_hash"
+
+# ===============================
+# PATHS & METADATA
+# ===============================
+
+def _slug(sheet_name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", sheet_name).strip("_").lower()
+
+
+def snapshot_paths(sheet_name):
+    base = os.path.join(SNAPSHOT_DIR, _slug(sheet_name))
+    return base + ".parquet", base + ".json"
+
+
+def snapshot_meta(sheet_name):
+    _, meta_path = snapshot_paths(sheet_name)
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _sheet_lock(sheet_name):
+    with _lock:
+        return _sheet_locks.setdefault(sheet_name, threading.RLock())
+
+
+def _temp_path(path):
+    # A temp file of its own per write, in the same directory so the
+    # final os.replace stays atomic
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+
+def _write_meta(sheet_name, meta):
+    _, meta_path = snapshot_paths(sheet_name)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_path = _temp_path(meta_path)
+
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        os.replace(tmp_path, meta_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def snapshot_needs_pull(sheet_name, max_age):
+    data_path, _ = snapshot_paths(sheet_name)
+    meta = snapshot_meta(sheet_name)
+
+    if meta is None or meta.get("stale") or not os.path.exists(data_path):
+        return True
+
+    return time.time() - meta["loaded_at"] > max_age
+
+
+def snapshot_age(sheet_name):
+    meta = snapshot_meta(sheet_name)
+
+    if meta is None or meta.get("stale"):
+        return None
+
+    return time.time() - meta["loaded_at"]
+
+# ===============================
+# RAW VALUES <-> FRAME
+# ===============================
+
+def values_to_frame(values):
+    # Same shape and typing as pd.DataFrame(worksheet.get_all_records())
+    from gspread.utils import numericise_all, to_records
+
+    if not values or len(values) < 2:
+        return pd.DataFrame()
+
+    width = max(len(row) for row in values)
+    header = list(values[0]) + [""] * (width - len(values[0]))
+
+    rows = [
+        numericise_all(list(row[:width]) + [""] * (width - len(row)))
+        for row in values[1:]
+    ]
+
+    return pd.DataFrame(to_records(header, rows))
+
+
+def _row_hashes(raw):
+    return pd.util.hash_pandas_object(raw, index=False).to_numpy(dtype="uint64")
+
+
+def _patch_frame(header, rows, hashes, previous):
+    # Reuse parsed rows whose raw content is unchanged, parse the rest
+    old_frame, old_hashes = previous
+
+    if old_frame.empty or list(old_frame.columns) != list(dict.fromkeys(header)):
+        return values_to_frame([header] + rows), np.arange(len(rows)), len(old_hashes)
+
+    old_positions = pd.Series(np.arange(len(old_hashes)), index=old_hashes)
+    old_positions = old_positions[~old_positions.index.duplicated()]
+
+    matched = old_positions.reindex(hashes).to_numpy()
+    is_new = np.isnan(matched)
+
+    changed = np.flatnonzero(is_new)
+    kept = np.flatnonzero(~is_new)
+    removed = int((~pd.Index(old_hashes).isin(hashes)).sum())
+
+    parts = [old_frame.iloc[matched[kept].astype(int)].set_axis(kept)]
+
+    if len(changed):
+        parsed = values_to_frame([header] + [rows[i] for i in changed])
+        parts.append(parsed.set_axis(changed))
+
+    frame = (
+        pd.concat(parts)
+        .sort_index()
+        .reset_index(drop=True)
+        .infer_objects()
+    )
+
+    return frame, changed, removed
+
+
+def write_snapshot(sheet_name, values, delta=False):
+    with _sheet_lock(sheet_name):
+        return _write_snapshot(sheet_name, values, delta)
+
+
+def _write_snapshot(sheet_name, values, delta):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+
+    data_path, _ = snapshot_paths(sheet_name)
+
+    # Batch responses trim trailing blanks; pad like get_all_values()
+    width = max((len(row) for row in values), default=0)
+    header = [str(h) for h in values[0]] + [""] * (width - len(values[0])) if values else []
+
+    rows = [
+        [str(v) for v in row[:width]] + [""] * (width - len(row))
+        for row in values[1:]
+    ]
+
+    # Positional column names: sheet headers can be blank or repeated
+    raw = pd.DataFrame(rows, columns=[f"c{i}" for i in range(width)], dtype="string")
+    hashes = _row_hashes(raw)
+
+    previous = None
+
+    if delta:
+        with _lock:
+            cached = _frames.get(sheet_name)
+
+        if cached is None and read_snapshot(sheet_name) is not None:
+            with _lock:
+                cached = _frames.get(sheet_name)
+
+        if cached is not None:
+            previous = (cached[1], cached[2])
+
+    if previous is not None:
+        frame, changed, removed = _patch_frame(header, rows, hashes, previous)
+    else:
+        frame = values_to_frame([header] + rows)
+        changed, removed = np.arange(len(rows)), 0
+
+    raw[HASH_COLUMN] = hashes
+
+    tmp_path = _temp_path(data_path)
+
+    try:
+        raw.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, data_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    loaded_at = time.time()
+
+    # Travels with the frame (and its copies) as a data version stamp
+    frame.attrs["loaded_at"] = loaded_at
+
+    _write_meta(sheet_name, {
+        "sheet": sheet_name,
+        "loaded_at": loaded_at,
+        "rows": len(rows),
+        "header": header,
+        "schema": {str(col): str(dtype) for col, dtype in frame.dtypes.items()},
+        "last_delta": {
+            "changed_rows": int(len(changed)),
+            "removed_rows": removed,
+            "full": previous is None
+        }
+    })
+
+    with _lock:
+        _frames[sheet_name] = (loaded_at, frame, hashes)
+
+    return frame
+
+
+def read_snapshot(sheet_name):
+    data_path, _ = snapshot_paths(sheet_name)
+    meta = snapshot_meta(sheet_name)
+
+    if meta is None or not os.path.exists(data_path):
+        return None
+
+    with _lock:
+        cached = _frames.get(sheet_name)
+
+    if cached is not None and cached[0] == meta["loaded_at"]:
+        return cached[1]
+
+    try:
+        raw = pd.read_parquet(data_path)
+    except Exception:
+        return None
+
+    if HASH_COLUMN in raw.columns:
+        hashes = raw.pop(HASH_COLUMN).to_numpy(dtype="uint64")
+    else:
+        hashes = _row_hashes(raw)
+
+    values = [meta["header"]] + raw.fillna("").astype(str).values.tolist()
+    frame = values_to_frame(values)
+    frame.attrs["loaded_at"] = meta["loaded_at"]
+
+    with _lock:
+        _frames[sheet_name] = (meta["loaded_at"], frame, hashes)
+
+    return frame
+
+
+def invalidate_snapshot(sheet_name):
+    # Force the next load to pull from the network (the old copy stays
+    # on disk as a fallback if that pull fails)
+    with _sheet_lock(sheet_name):
+        meta = snapshot_meta(sheet_name)
+
+        if meta is not None:
+            meta["stale"] = True
+            _write_meta(sheet_name, meta)
+
+# ===============================
+# LOAD / REFRESH
+# ===============================
+
+def _record_timing(sheet_name, mode, seconds):
+    with _lock:
+        _timings[sheet_name] = {
+            "mode": mode,
+            "seconds": round(seconds, 4),
+            "at": time.time()
+        }
+
+
+def load_timings():
+    # {sheet name: {"mode": "single" | "batch", "seconds": ..., "at": ...}}
+    with _lock:
+        return {name: dict(timing) for name, timing in _timings.items()}
+
+
+def _executor():
+    global _pool
+
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="sheet-load")
+        return _pool
+
+
+def refresh_snapshot(sheet_name, fetch_values, delta=False):
+    # One pull per sheet at a time. A caller that waited while another
+    # pull finished uses that copy instead of pulling again
+    requested_at = time.time()
+
+    with _sheet_lock(sheet_name):
+        meta = snapshot_meta(sheet_name)
+
+        if meta is not None and not meta.get("stale") and meta["loaded_at"] >= requested_at:
+            frame = read_snapshot(sheet_name)
+            if frame is not None:
+                return frame
+
+        start = time.perf_counter()
+        frame = write_snapshot(sheet_name, fetch_values(), delta=delta)
+        _record_timing(sheet_name, "single", time.perf_counter() - start)
+        return frame
+
+
+def pull_snapshots(fetchers, delta_sheets=(), max_workers=MAX_WORKERS):
+    # Refresh several tabs concurrently when they cannot share one batch
+    # request; fetchers is {sheet name: fetch_values}. Returns
+    # {sheet name: DataFrame or the exception raised by its pull}
+    results = {}
+
+    if not fetchers:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(fetchers)))) as pool:
+        futures = {
+            pool.submit(refresh_snapshot, name, fetch_values, name in delta_sheets): name
+            for name, fetch_values in fetchers.items()
+        }
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+
+    return results
+
+
+def prefetch_snapshots(max_ages, fetch_many, delta_sheets=()):
+    # Refresh every missing or expired tab from one fetch_many(names) call,
+    # which returns {sheet name: raw values}
+    due = [name for name, max_age in max_ages.items() if snapshot_needs_pull(name, max_age)]
+
+    if not due:
+        return []
+
+    start = time.perf_counter()
+    batch = fetch_many(due)
+    elapsed = time.perf_counter() - start
+
+    for name in due:
+        write_snapshot(name, batch.get(name, []), delta=name in delta_sheets)
+        _record_timing(name, "batch", elapsed)
+
+    return due
+
+
+def _background_refresh(sheet_name, fetch_values, delta):
+    try:
+        refresh_snapshot(sheet_name, fetch_values, delta=delta)
+    except Exception:
+        pass
+    finally:
+        with _lock:
+            _refreshing.discard(sheet_name)
+
+
+def load_snapshot_frame(sheet_name, fetch_values, max_age, delta=False):
+    """Return the local copy of a sheet, pulling it only when needed.
+
+    A missing or invalidated snapshot is pulled synchronously. A snapshot
+    older than ``max_age`` seconds is still served, while the shared
+    thread pool refreshes it for the next read. With ``delta`` set, refreshes
+    only re-parse rows whose raw content changed.
+    The returned frame is shared; copy it before mutating.
+    """
+    meta = snapshot_meta(sheet_name)
+    frame = read_snapshot(sheet_name)
+
+    if frame is None or meta.get("stale"):
+        try:
+            return refresh_snapshot(sheet_name, fetch_values, delta=delta)
+        except Exception:
+            if frame is not None:
+                return frame
+            raise
+
+    if time.time() - meta["loaded_at"] > max_age:
+        with _lock:
+            start = sheet_name not in _refreshing
+            _refreshing.add(sheet_name)
+
+        if start:
+            _executor().submit(_background_refresh, sheet_name, fetch_values, delta)
+
+    return frame
@@ -0,0 +1,387 @@
+"""
+Storage Backends
+Description:
+One interface for every read and write the tracker makes, with a
+Google Sheets implementation and an embedded SQL one (SQLite, or DuckDB
+when installed). Tables are exchanged as raw value grids (header row
+first), the same shape the snapshot store keeps.
+"""
+
+import json
+import threading
+from datetime import date, datetime
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+# ===============================
+# RANGE COALESCING
+# ===============================
+
+def coalesce_cells(cells, header):
+    """Group (sheet row, column name, value) edits into A1 rectangles.
+
+    Adjacent columns in a row become one run, and consecutive rows with
+    the same column run are stacked into one range.
+    """
+    from gspread.utils import rowcol_to_a1
+
+    positions = {name: i + 1 for i, name in enumerate(header)}
+
+    by_row = {}
+    for row_number, column, value in cells:
+        by_row.setdefault(row_number, {})[positions[column]] = _cell(value)
+
+    runs = []
+    for row_number in sorted(by_row):
+        row_cells = by_row[row_number]
+        start = prev = None
+
+        for col in sorted(row_cells):
+            if start is None:
+                start = prev = col
+            elif col == prev + 1:
+                prev = col
+            else:
+                runs.append((row_number, start, prev))
+                start = prev = col
+
+        runs.append((row_number, start, prev))
+
+    ranges = []
+    for row_number, first_col, last_col in runs:
+        values = [by_row[row_number][c] for c in range(first_col, last_col + 1)]
+
+        if ranges:
+            last = ranges[-1]
+            if (
+                last["first_col"] == first_col and
+                last["last_col"] == last_col and
+                last["last_row"] == row_number - 1
+            ):
+                last["values"].append(values)
+                last["last_row"] = row_number
+                continue
+
+        ranges.append({
+            "first_row": row_number,
+            "last_row": row_number,
+            "first_col": first_col,
+            "last_col": last_col,
+            "values": [values]
+        })
+
+    return [
+        {
+            "range": rowcol_to_a1(r["first_row"], r["first_col"]) + ":" +
+                     rowcol_to_a1(r["last_row"], r["last_col"]),
+            "values": r["values"]
+        }
+        for r in ranges
+    ]
+
+# ===============================
+# INTERFACE
+# ===============================
+
+class StorageBackend:
+
+    name = "base"
+
+    def read_values(self, table):
+        raise NotImplementedError
+
+    def read_many(self, tables):
+        return {table: self.read_values(table) for table in tables}
+
+    def header(self, table):
+        values = self.read_values(table)
+        return list(values[0]) if values else []
+
+    def set_header(self, table, header):
+        raise NotImplementedError
+
+    def replace_table(self, table, header, rows):
+        raise NotImplementedError
+
+    def update_cells(self, table, cells):
+        # cells: iterable of (sheet row number, column name, value);
+        # row 1 is the header, data starts at row 2
+        raise NotImplementedError
+
+    def append_row(self, table, row):
+        raise NotImplementedError
+
+    def append_record(self, table, record):
+        # Append a dict, adding any columns the table does not have yet
+        header = self.header(table)
+        missing = [key for key in record if key not in header]
+
+        if missing:
+            header = header + missing
+            self.set_header(table, header)
+
+        self.append_row(table, [record.get(col, "") for col in header])
+
+# ===============================
+# GOOGLE SHEETS
+# ===============================
+
+class GoogleSheetsBackend(StorageBackend):
+
+    name = "gsheets"
+
+    def __init__(self, spreadsheet, worksheets=None):
+        self.spreadsheet = spreadsheet
+        self.worksheets = dict(worksheets or {})
+        self._headers = {}
+
+    def worksheet(self, table, create=False):
+        if table not in self.worksheets:
+            import gspread
+
+            try:
+                self.worksheets[table] = self.spreadsheet.worksheet(table)
+            except gspread.WorksheetNotFound:
+                if not create:
+                    raise
+                self.worksheets[table] = self.spreadsheet.add_worksheet(table, rows=1000, cols=26)
+
+        return self.worksheets[table]
+
+    def read_values(self, table):
+        values = self.worksheet(table).get_all_values()
+        self._headers[table] = list(values[0]) if values else []
+        return values
+
+    def read_many(self, tables):
+        # One values:batchGet request for every table
+        from gspread.utils import absolute_range_name
+
+        response = self.spreadsheet.values_batch_get(
+            [absolute_range_name(table) for table in tables]
+        )
+
+        value_ranges = response.get("valueRanges", [])
+
+        batch = {
+            table: value_range.get("values", [])
+            for table, value_range in zip(tables, value_ranges)
+        }
+
+        for table, values in batch.items():
+            self._headers[table] = list(values[0]) if values else []
+
+        return batch
+
+    def header(self, table):
+        # Known from the last read or write of the table; every pull
+        # refreshes it, so only a table not touched yet costs a request
+        if table not in self._headers:
+            self._headers[table] = self.worksheet(table, create=True).row_values(1)
+
+        return list(self._headers[table])
+
+    def set_header(self, table, header):
+        from gspread.utils import rowcol_to_a1
+
+        self.worksheet(table, create=True).update(
+            [list(header)],
+            "A1:" + rowcol_to_a1(1, len(header))
+        )
+        self._headers[table] = list(header)
+
+    def replace_table(self, table, header, rows):
+        worksheet = self.worksheet(table, create=True)
+        worksheet.clear()
+        worksheet.update(
+            [list(header)] + [[_cell(v) for v in row] for row in rows],
+            value_input_option="USER_ENTERED"
+        )
+        self._headers[table] = list(header)
+
+    def update_cells(self, table, cells):
+        cells = list(cells)
+
+        if not cells:
+            return 0
+
+        batch = coalesce_cells(cells, self.header(table))
+
+        self.worksheet(table).batch_update(batch, value_input_option="USER_ENTERED")
+        return len(batch)
+
+    def append_row(self, table, row):
+        self.worksheet(table, create=True).append_row(
+            [_cell(v) for v in row],
+            value_input_option="USER_ENTERED"
+        )
+
+# ===============================
+# EMBEDDED SQL (SQLITE / DUCKDB)
+# ===============================
+
+def _quote(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+class SQLBackend(StorageBackend):
+    """Local store: one SQL table per sheet tab.
+
+    Cells are kept as text, as Sheets returns them, and the original
+    header row is stored in ``_tables`` so a read gives back the same grid.
+    """
+
+    def __init__(self, path, engine="sqlite"):
+        self.path = path
+        self.name = engine
+        self._lock = threading.RLock()
+
+        if engine == "duckdb":
+            import duckdb
+            self.conn = duckdb.connect(path)
+        else:
+            import sqlite3
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS _tables (name TEXT PRIMARY KEY, header TEXT)"
+        )
+        self._commit()
+
+    def _execute(self, sql, params=()):
+        return self.conn.execute(sql, params)
+
+    def _commit(self):
+        if self.name != "duckdb":
+            self.conn.commit()
+
+    @staticmethod
+    def _columns(header):
+        # Blank or repeated sheet headers still need unique SQL columns
+        columns, seen = [], set()
+
+        for i, name in enumerate(header):
+            column = str(name) or f"_col{i + 1}"
+            if column in seen or column == "_row":
+                column = f"{column}_{i + 1}"
+            seen.add(column)
+            columns.append(column)
+
+        return columns
+
+    def _stored_header(self, table):
+        row = self._execute(
+            "SELECT header FROM _tables WHERE name = ?", (table,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def read_values(self, table):
+        with self._lock:
+            header = self._stored_header(table)
+
+            if header is None:
+                return []
+
+            rows = self._execute(
+                f"SELECT * FROM {_quote(table)} ORDER BY _row"
+            ).fetchall()
+
+        return [list(header)] + [
+            ["" if v is None else str(v) for v in row[1:]]
+            for row in rows
+        ]
+
+    def header(self, table):
+        with self._lock:
+            return list(self._stored_header(table) or [])
+
+    def set_header(self, table, header):
+        with self._lock:
+            values = self.read_values(table)
+            rows = values[1:] if values else []
+            width = len(header)
+            self.replace_table(
+                table,
+                header,
+                [row[:width] + [""] * (width - len(row)) for row in rows]
+            )
+
+    def replace_table(self, table, header, rows):
+        header = [str(h) for h in header]
+        columns = self._columns(header)
+
+        with self._lock:
+            self._execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            self._execute(
+                f"CREATE TABLE {_quote(table)} (" +
+                ", ".join(["_row INTEGER"] + [f"{_quote(c)} TEXT" for c in columns]) + ")"
+            )
+
+            placeholders = ", ".join(["?"] * (len(columns) + 1))
+            self.conn.executemany(
+                f"INSERT INTO {_quote(table)} VALUES ({placeholders})",
+                [
+                    [i + 2] + [str(_cell(v)) for v in list(row)[:len(columns)]] +
+                    [""] * (len(columns) - len(row))
+                    for i, row in enumerate(rows)
+                ]
+            )
+
+            self._execute("DELETE FROM _tables WHERE name = ?", (table,))
+            self._execute(
+                "INSERT INTO _tables VALUES (?, ?)", (table, json.dumps(header))
+            )
+            self._commit()
+
+    def update_cells(self, table, cells):
+        cells = list(cells)
+
+        with self._lock:
+            header = self._stored_header(table) or []
+            columns = dict(zip(header, self._columns(header)))
+
+            for row_number, column, value in cells:
+                self._execute(
+                    f"UPDATE {_quote(table)} SET {_quote(columns[column])} = ? WHERE _row = ?",
+                    (str(_cell(value)), row_number)
+                )
+
+            self._commit()
+
+        return len(cells)
+
+    def append_row(self, table, row):
+        row = list(row)
+
+        with self._lock:
+            header = self._stored_header(table)
+
+            if header is None or len(row) > len(header):
+                header = (header or []) + [""] * (len(row) - len(header or []))
+                self.set_header(table, header)
+
+            next_row = self._execute(
+                f"SELECT COALESCE(MAX(_row), 1) + 1 FROM {_quote(table)}"
+            ).fetchone()[0]
+
+            values = [str(_cell(v)) for v in row] + [""] * (len(header) - len(row))
+            placeholders = ", ".join(["?"] * (len(values) + 1))
+
+            self._execute(
+                f"INSERT INTO {_quote(table)} VALUES ({placeholders})",
+                [next_row] + values
+            )
+            self._commit()
+
+
+def copy_tables(source, target, tables):
+    # Seed a local store from another backend, e.g. Sheets -> SQLite
+    for table, values in source.read_many(tables).items():
+        header = values[0] if values else []
+        target.replace_table(table, header, values[1:])
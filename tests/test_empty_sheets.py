@@ -0,0 +1,92 @@
+"""
+Empty DSP / SSP sheets
+Description:
+With no rows in the DSP (Customers) or SSP (Vendors) sheet yet, those
+tabs build their grid from Master Data instead. Runs the app against a
+local SQLite store seeded with synthetic data and both sheets empty.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEED = textwrap.dedent("""
+    import pandas as pd
+
+    from benchmarks.data import make_dataset, seed_fx_rates
+    from storage import SQLBackend
+
+    seed_fx_rates()
+    data = make_dataset(200)
+    store = SQLBackend({db!r})
+
+    def put(table, df, formats):
+        df = df.copy()
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.strftime(formats.get(col, "%d/%m/%Y")).fillna("")
+        store.replace_table(table, list(df.columns), df.astype(str).values.tolist())
+
+    put("Master Data", data["master"], {{"Month": "%b-%Y"}})
+    put("Partner List", data["partners"], {{}})
+    put("Cost Centre", data["cost"], {{}})
+
+    # Header only: the sheets exist but hold no rows yet
+    put("DSP (Customers)", data["dsp"].drop(columns="Outstanding $").iloc[:0], {{}})
+    put("SSP (Vendors)", data["ssp"].drop(columns="Outstanding $").iloc[:0], {{}})
+""")
+
+RUN = textwrap.dedent("""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file({app!r}, default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["role"] = "Admin"
+    at.session_state["user"] = "Admin"
+    at.session_state["main_tab"] = {tab!r}
+    at.run()
+
+    for exc in at.exception:
+        print("EXCEPTION:", exc.message)
+    print("HEADERS:", [h.value for h in at.header])
+""")
+
+
+@pytest.fixture(scope="module")
+def env(tmp_path_factory):
+    pytest.importorskip("streamlit.testing.v1")
+
+    tmp = tmp_path_factory.mktemp("empty-sheets")
+    env = dict(
+        os.environ,
+        TRACKER_STORAGE="sqlite",
+        TRACKER_STORAGE_PATH=str(tmp / "tracker.db"),
+        TRACKER_SNAPSHOT_DIR=str(tmp / "snapshots"),
+        FX_STORE_PATH=str(tmp / "fx.sqlite"),
+        PYTHONPATH=ROOT
+    )
+
+    subprocess.run(
+        [sys.executable, "-c", SEED.format(db=env["TRACKER_STORAGE_PATH"])],
+        cwd=ROOT, env=env, check=True
+    )
+
+    return env
+
+
+@pytest.mark.parametrize("tab", ["DSP (Customers)", "SSP (Vendors)"])
+def test_tab_renders_with_empty_sheet(env, tab):
+    # A fresh process per tab: the app keeps process-wide caches
+    result = subprocess.run(
+        [sys.executable, "-c", RUN.format(app=os.path.join(ROOT, "app.py"), tab=tab)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=300
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "EXCEPTION:" not in result.stdout, result.stdout
+    assert "📤 " + tab in result.stdout
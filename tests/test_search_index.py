@@ -0,0 +1,36 @@
+"""
+Search Index
+Description:
+Search words match anywhere inside a cell's tokens, and the cached index
+and the one-off scan return the same rows.
+"""
+
+import pandas as pd
+import pytest
+
+from search_index import SearchIndex, scan_mask
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "Month": pd.to_datetime(["2025-04-01", "2025-05-01", "2025-05-01"]),
+        "DSP Name": ["Acme Partner", "Beta Media", "Gamma-Partners"],
+        "Receivable $": [1200.0, 12.5, 70.0]
+    }, index=[4, 7, 9])
+
+
+@pytest.mark.parametrize("query, rows", [
+    ("artner", [4, 9]),
+    ("ARTNER may", [9]),
+    ("may-2025", [7, 9]),
+    ("200", [4]),
+    ("acmepartner", []),
+    ("", [4, 7, 9])
+])
+def test_index_and_scan_match_inside_tokens(frame, query, rows):
+    by_index = SearchIndex(frame).mask(query)
+    by_scan = scan_mask(frame, query)
+
+    assert by_index[by_index].index.tolist() == rows
+    assert by_scan.equals(by_index)
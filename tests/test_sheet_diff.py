@@ -0,0 +1,82 @@
+"""
+Sheet Diff
+Description:
+Saves write dates in the sheet's own format and land on the sheet row
+each grid row came from, even when repeated keys are partly hidden.
+"""
+
+import pandas as pd
+import pytest
+
+from sheet_diff import StaleSheetError, diff_cells
+from sheet_schema import normalize_frame
+from snapshot_store import values_to_frame
+
+SHEET = "DSP (Customers)"
+KEYS = ["Month", "DSP Name"]
+
+HEADER = [
+    "Month", "DSP Name", "Receivable $", "USD/INR", "Due Date", "Received Date",
+    "Received Amount $", "Received In", "Shortage", "Reason"
+]
+
+ROWS = [
+    ["Apr-2025", "Acme", "100", "USD", "31/05/2025", "", "0", "", "100", ""],
+    ["Apr-2025", "Acme", "50", "USD", "31/05/2025", "", "0", "", "50", ""],
+    ["May-2025", "Beta", "70", "USD", "30/06/2025", "05/06/2025", "70", "HDFC", "0", ""]
+]
+
+
+@pytest.fixture
+def sheet():
+    return normalize_frame(SHEET, values_to_frame([HEADER] + ROWS), parse_dates=["Month"])
+
+
+def grid_of(sheet):
+    # What the tab sends to the grid
+    grid = sheet.copy()
+    grid["Month"] = grid["Month"].dt.strftime("%b-%Y")
+    grid["_sheet_row"] = grid.index + 2
+    return grid
+
+
+def test_edit_lands_on_its_own_row_when_a_twin_is_hidden(sheet):
+    grid = grid_of(sheet).iloc[[1, 2]].copy()
+    grid.loc[1, "Received Date"] = "07/06/2025"
+    grid.loc[1, "Received Amount $"] = 50.0
+
+    cells, new_rows = diff_cells(SHEET, sheet, grid, KEYS, row_column="_sheet_row")
+
+    assert cells == [(3, "Received Amount $", 50.0), (3, "Received Date", "07/06/2025")]
+    assert new_rows == []
+
+
+def test_new_rows_keep_the_sheet_date_formats(sheet):
+    grid = pd.concat([
+        grid_of(sheet),
+        pd.DataFrame([{
+            "Month": pd.Timestamp("2025-06-01"),
+            "DSP Name": "Gamma",
+            "Receivable $": 5.0,
+            "Due Date": "31/07/2025",
+            "Received Amount $": 0.0,
+            "Shortage": 5.0
+        }])
+    ], ignore_index=True)
+
+    _, new_rows = diff_cells(SHEET, sheet, grid, KEYS, row_column="_sheet_row")
+
+    assert new_rows == [["Jun-2025", "Gamma", 5.0, "", "31/07/2025", "", 0.0, "", 5.0, ""]]
+
+
+def test_repeated_keys_are_rejected_without_row_numbers(sheet):
+    with pytest.raises(StaleSheetError):
+        diff_cells(SHEET, sheet, grid_of(sheet).drop(columns="_sheet_row"), KEYS)
+
+
+def test_moved_rows_are_rejected(sheet):
+    grid = grid_of(sheet)
+    moved = sheet.iloc[[0, 2, 1]].reset_index(drop=True)
+
+    with pytest.raises(StaleSheetError):
+        diff_cells(SHEET, moved, grid, KEYS, row_column="_sheet_row")
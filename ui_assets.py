@@ -0,0 +1,288 @@
+"""
+UI Assets
+Description:
+Page CSS and the base64 header logo. Built once per process when the
+module is imported, instead of on every rerun of the app script.
+"""
+
+import base64
+import functools
+import os
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ===============================
+# LOGO
+# ===============================
+
+@functools.lru_cache(maxsize=None)
+def logo_base64(file_name="peakads_logo.png"):
+    with open(os.path.join(ASSET_DIR, file_name), "rb") as img_file:
+        return base64.b64encode(img_file.read()).decode()
+
+# ===============================
+# PAGE CSS
+# ===============================
+
+# Injected once at the top of every run: layout, KPI cards, tabs,
+# logout button and header banner styles, in that order
+PAGE_CSS = """
+<style>
+
+/* REMOVE ALL STREAMLIT DEFAULT SPACING */
+html, body {
+    margin: 0 !important;
+    padding: 0 !important;
+}
+
+/* Remove top & bottom padding completely */
+.block-container {
+    padding-top: 0 !important;
+    padding-bottom: 0 !important;
+
+    /* Controlled left & right spacing */
+    padding-left: 15px !important;
+    padding-right: 15px !important;
+
+    margin: 0 !important;
+}
+
+/* Remove Streamlit header + footer */
+header { display: none !important; }
+footer { display: none !important; }
+
+/* Remove app container spacing */
+[data-testid="stAppViewContainer"] {
+    margin: 0 !important;
+    padding: 0 !important;
+}
+
+/* Remove vertical block spacing */
+[data-testid="stVerticalBlock"] {
+    gap: 0rem !important;
+}
+
+</style>
+
+<style>
+
+/* KPI Background Container */
+.kpi-container {
+    background: linear-gradient(135deg, #87CEFA, #e8eef7);
+    padding: 25px;
+    border-radius: 12px;
+    margin-bottom: 20px;
+    box-shadow: 0px 4px 10px rgba(0,0,0,0.08);
+}
+
+/* Make metrics inside look clean */
+div[data-testid="stMetric"] {
+    background-color: #00FFFF;
+    padding: 15px;
+    border-radius: 10px;
+    box-shadow: 0px 2px 6px rgba(0,0,0,0.05);
+}
+
+</style>
+
+<style>
+
+/* ---------- TAB CONTAINER ---------- */
+div[data-testid="stTabs"] {
+    overflow-x: auto;
+    white-space: nowrap;
+}
+
+/* ---------- FORCE BOLD TAB TEXT ---------- */
+div[data-testid="stTabs"] button {
+    font-weight: 800 !important;
+    font-size: 17px !important;
+    letter-spacing: 0.3px;
+}
+
+/* Ensure inner text is bold */
+div[data-testid="stTabs"] button p {
+    font-weight: 800 !important;
+}
+
+/* ---------- TAB BUTTON ---------- */
+div[data-testid="stTabs"] button {
+    font-weight: 700 !important;
+    font-size: 16px !important;
+    padding: 10px 20px !important;
+    border-radius: 8px 8px 0px 0px !important;
+    margin-right: 4px;
+    background: linear-gradient(#26F7FD, #f0f0f0, #d6d6d6);
+    color: white !important;
+    border: 1px solid #c0c0c0 !important;
+    box-shadow: 3px 3px 6px #b0b0b0, 
+                -2px -2px 5px #ffffff;
+    transition: all 0.25s ease-in-out;
+    position: relative;
+}
+
+/* ---------- HOVER EFFECT ---------- */
+div[data-testid="stTabs"] button:hover {
+    transform: translateY(-2px);
+    background: linear-gradient(145deg, #e6e6e6, #cccccc);
+}
+
+/* ---------- ACTIVE TAB ---------- */
+div[data-testid="stTabs"] button[aria-selected="true"] {
+    background: linear-gradient(145deg, #003366, #0059b3);
+    color: white !important;
+    box-shadow: inset 2px 2px 6px #002244,
+                inset -2px -2px 6px #0066cc;
+}
+
+/* ---------- SUBTLE ANIMATED BOTTOM BORDER ---------- */
+div[data-testid="stTabs"] button::after {
+    content: "";
+    position: absolute;
+    left: 0;
+    bottom: -3px;
+    width: 0%;
+    height: 3px;
+    background-color: #ff4b4b;
+    transition: width 0.3s ease-in-out;
+}
+
+div[data-testid="stTabs"] button[aria-selected="true"]::after {
+    width: 100%;
+}
+
+/* ---------- RESPONSIVE MOBILE ---------- */
+@media (max-width: 768px) {
+
+    div[data-testid="stTabs"] button {
+        font-size: 14px !important;
+        padding: 8px 14px !important;
+        margin-right: 2px;
+    }
+
+    div[data-testid="stTabs"] {
+        overflow-x: auto;
+        scrollbar-width: thin;
+    }
+}
+
+</style>
+
+<style>
+
+/* Target Streamlit Tabs */
+div[data-testid="stTabs"] button {
+    font-weight: 700 !important;
+    font-size: 16px !important;
+    padding: 10px 18px !important;
+    border-radius: 8px 8px 0px 0px !important;
+    background: linear-gradient(#188BC2, #2D5DA1);
+    border: 1px solid #c0c0c0 !important;
+    box-shadow: 3px 3px 6px #b0b0b0, 
+                -2px -2px 5px #ffffff;
+    transition: all 0.2s ease-in-out;
+}
+
+/* Hover effect */
+div[data-testid="stTabs"] button:hover {
+    background: linear-gradient(#9932CC, #9932CC, #9932CC);
+    transform: translateY(-2px);
+}
+
+/* Active Tab */
+div[data-testid="stTabs"] button[aria-selected="true"] {
+    background: linear-gradient(#FF5E0E, #FF8F00, #FF8F00);
+    color: white !important;
+    box-shadow: inset 2px 2px 6px #FF5E0E,
+                inset -2px -2px 6px #FF8F00;
+}
+
+</style>
+
+<style>
+
+/* ===== LOGOUT BUTTON STYLE ===== */
+
+/* Target the logout button container */
+div[data-testid="stHorizontalBlock"] div.stButton > button {
+
+    background-color: #d11a2a !important;   /* RED */
+    color: white !important;
+    font-weight: 1000 !important;
+    border-radius: 6px !important;
+    border: none !important;
+    box-shadow: 0 3px 8px rgba(0,0,0,0.25);
+}
+
+/* Hover */
+div[data-testid="stHorizontalBlock"] div.stButton > button:hover {
+
+    background-color: #65d778 !important;   /* YELLOW */
+    color: black !important;
+}
+
+</style>
+
+<style>
+
+/* ===== HEADER BANNER ===== */
+.header-banner {
+    background: linear-gradient(#475F94, #0076CE, #475F94);
+
+    /* Controlled internal spacing */
+    padding: 18px 40px;   /* 18px top/bottom, 40px left/right */
+
+    border-radius: 0px;   /* remove rounded corners for full-width look */
+    margin: 0px;          /* no outer margin */
+
+    box-shadow: 0 4px 10px rgba(0,0,0,0.08);
+}
+
+/* Layout */
+.header-container {
+    display: flex;
+    align-items: center;
+    margin-bottom: 13px;
+    gap: 20px;
+}
+
+/* Title */
+.header-title {
+    font-size: 48px;
+    font-weight: 800;
+    color: #FFFFFF;
+}
+
+/* Subtitle */
+.header-sub {
+    font-size: 30px;
+    font-weight: 800;
+    color: #FDFF00;
+    margin-left: 10px;
+}
+
+</style>
+
+<style>
+
+/* Company header row */
+.company-header {
+    display: flex;
+    align-items: center;
+    gap: 12px;
+    font-size: 60px;
+    font-weight: 700;
+    color: #2D5DA1;
+    margin-bottom: 5px;
+}
+
+/* Subtitle inline */
+.company-sub {
+    font-size: 40px;
+    font-weight: 600;
+    color: #FF5E0E;
+    margin-left: 5px;
+}
+
+</style>
+"""
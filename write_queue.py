@@ -0,0 +1,149 @@
+"""
+Write-Behind Queue
+Description:
+Collects grid edits per sheet row and writes them to storage in the
+background after a short quiet window. Repeat edits to the same row are
+merged, so a burst of changes becomes one batch update. The outcome of
+each flush is kept per session and read back on the next rerun. A failed
+flush keeps its edits and retries on its own with exponential backoff;
+whatever is still queued is flushed once more when the process exits.
+"""
+
+import atexit
+import threading
+import time
+
+
+class WriteBehindQueue:
+
+    def __init__(self, storage, table, delay=1.5, derived=None, on_flush=None,
+                 max_retry_delay=300.0):
+        self.storage = storage
+        self.table = table
+        self.delay = delay
+        self.derived = derived      # row values -> extra {column: value}
+        self.on_flush = on_flush    # called after every successful write
+        self.max_retry_delay = max_retry_delay
+
+        self._lock = threading.Lock()
+        self._pending = {}          # sheet row -> {column: value}
+        self._sessions = {}         # sheet row -> session ids with edits in it
+        self._results = {}          # session id -> [flush results]
+        self._timer = None
+        self._failures = 0          # failed flushes in a row
+        self._last_error = None
+        self._retry_at = None       # time of the scheduled retry, if any
+
+        atexit.register(self.flush)
+
+    def _schedule(self, delay):
+        # Caller holds the lock; replaces any timer already waiting
+        if self._timer is not None:
+            self._timer.cancel()
+
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    # ---------- EDITS ----------
+
+    def submit(self, session_id, row_edits):
+        # row_edits: {sheet row number: {column: value}}; a later edit to
+        # the same cell replaces the earlier one
+        if not row_edits:
+            return
+
+        with self._lock:
+            for row_number, values in row_edits.items():
+                self._pending.setdefault(row_number, {}).update(values)
+                self._sessions.setdefault(row_number, set()).add(session_id)
+
+            # Debounce: every new edit restarts the quiet window
+            self._schedule(self.delay)
+            self._retry_at = None
+
+    def pending_rows(self):
+        with self._lock:
+            return len(self._pending)
+
+    def status(self):
+        # {"pending_rows", "failures", "last_error", "retry_at"} for the UI
+        with self._lock:
+            return {
+                "pending_rows": len(self._pending),
+                "failures": self._failures,
+                "last_error": self._last_error,
+                "retry_at": self._retry_at
+            }
+
+    # ---------- FLUSH ----------
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            sessions, self._sessions = self._sessions, {}
+            self._timer = None
+            self._retry_at = None
+
+        if not pending:
+            return None
+
+        cells = []
+        for row_number in sorted(pending):
+            values = dict(pending[row_number])
+
+            if self.derived is not None:
+                values.update(self.derived(values))
+
+            cells += [(row_number, col, value) for col, value in values.items()]
+
+        result = {"rows": len(pending), "cells": len(cells), "at": time.time()}
+
+        try:
+            self.storage.update_cells(self.table, cells)
+            result["ok"] = True
+
+            with self._lock:
+                self._failures = 0
+                self._last_error = None
+
+            if self.on_flush is not None:
+                self.on_flush(self.table)
+
+        except Exception as e:
+            result["ok"] = False
+            result["error"] = str(e)
+
+            # Keep the edits so the retry writes them, unless newer values
+            # for the same cells arrived meanwhile
+            with self._lock:
+                for row_number, values in pending.items():
+                    merged = dict(values)
+                    merged.update(self._pending.get(row_number, {}))
+                    self._pending[row_number] = merged
+                    self._sessions.setdefault(row_number, set()).update(sessions[row_number])
+
+                self._failures += 1
+                self._last_error = str(e)
+
+                # Retry on our own, backing off; a newer edit's timer
+                # already covers it
+                if self._timer is None:
+                    wait = min(self.max_retry_delay, self.delay * 2 ** self._failures)
+                    self._schedule(wait)
+                    self._retry_at = time.time() + wait
+
+                result["retry_in"] = (
+                    None if self._retry_at is None
+                    else max(0.0, self._retry_at - time.time())
+                )
+
+        with self._lock:
+            for session_id in set().union(*sessions.values()):
+                self._results.setdefault(session_id, []).append(result)
+
+        return result
+
+    def pop_results(self, session_id):
+        with self._lock:
+            return self._results.pop(session_id, [])